@@ -1,5 +1,4 @@
 
-import json
 import logging
 from pathlib import Path
 from datetime import datetime, date, timezone
@@ -7,6 +6,7 @@ from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 
 from src.shared.infrastructure.redis_client import get_redis_client
+from src.shared.json_utils import loads, read_json_mmap
 from src.shared.infrastructure.database import get_db, PortfolioModel, PositionModel, PortfolioHistoryModel
 
 logger = logging.getLogger(__name__)
@@ -48,7 +48,7 @@ class DataService:
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
                 
-            data = json.loads(data_json)
+            data = loads(data_json)
             # If key exists, system is running (TTL ensures it dies if writer stops)
             return data
         except Exception as e:
@@ -66,11 +66,10 @@ class DataService:
                 # Fallback to file for safety during migration
                 f = self.data_dir / "active_universe.json"
                 if f.exists():
-                     with open(f, 'r') as file:
-                        return json.load(file)
+                    return read_json_mmap(f)
                 return {"active_symbols": [], "status": "No Data"}
                 
-            return json.loads(data_json)
+            return loads(data_json)
         except Exception as e:
             logger.error(f"Error reading universe from Redis: {e}")
             return {}
@@ -81,8 +80,7 @@ class DataService:
             return {"signals": []}
             
         try:
-            with open(self.signals_file, 'r') as f:
-                return json.load(f)
+            return read_json_mmap(self.signals_file)
         except Exception as e:
             logger.error(f"Error reading signals: {e}")
             return {"signals": []}
@@ -137,9 +135,8 @@ class DataService:
             return {"total_cost_usd": 0.0, "total_tokens": 0, "total_searches": 0}
             
         try:
-            with open(cost_file, 'r') as f:
-                data = json.load(f)
-                return data.get("summary", {})
+            data = read_json_mmap(cost_file)
+            return data.get("summary", {})
 
         except Exception as e:
             logger.error(f"Error reading costs: {e}")
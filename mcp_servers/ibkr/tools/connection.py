@@ -44,6 +44,28 @@ class IBKRConnection:
         self.ib: Optional[IB] = None
         self._connected = False
     
+    async def _port_listening(self, probe_timeout: float = 0.5) -> bool:
+        """
+        Cheap TCP probe of the TWS/Gateway port.
+        
+        Lets connect() fail immediately when nothing is listening instead
+        of waiting for the full ib_insync handshake timeout.
+        """
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                timeout=probe_timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+    
     async def connect(self) -> IB:
         """
         Connect to IBKR TWS/Gateway.
@@ -57,6 +79,12 @@ class IBKRConnection:
         if self._connected and self.ib:
             return self.ib
         
+        if not await self._port_listening():
+            raise ConnectionError(
+                f"IBKR TWS/Gateway not listening on {self.host}:{self.port}. "
+                "Is TWS/Gateway running?"
+            )
+        
         try:
             self.ib = IB()
             
@@ -20,6 +20,21 @@ sys.path.insert(0, str(mcp_servers_root))
 
 from technical.tools.regime import get_regime_tool
 
+# Seeded generator shared by all fixtures: reproducible data across runs
+RNG = np.random.default_rng(42)
+
+
+def make_daily_index(periods: int) -> pd.DatetimeIndex:
+    """
+    Daily UTC index of `periods` bars ending now.
+    
+    Equivalent to pd.date_range(end=now, periods=periods, freq='D') but
+    built with numpy arithmetic instead of stepping a DateOffset per bar.
+    """
+    end = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 'ns')
+    values = end - np.arange(periods - 1, -1, -1) * np.timedelta64(1, 'D')
+    return pd.DatetimeIndex(values, copy=False).tz_localize('UTC')
+
 
 @pytest.mark.asyncio
 async def test_regime_data_ordering_with_mock():
@@ -30,7 +45,7 @@ async def test_regime_data_ordering_with_mock():
     and verifies that the tool correctly reorders it before calculations.
     """
     # Create test data: ascending close prices
-    dates = pd.date_range(end=datetime.now(timezone.utc), periods=250, freq='D')
+    dates = make_daily_index(250)
     test_data = pd.DataFrame({
         'time': dates,
         'close': np.linspace(100, 150, 250)  # Linearly increasing prices
@@ -72,10 +87,10 @@ async def test_regime_insufficient_data_validation():
     """Test that regime tool validates minimum data requirements."""
     
     # Create insufficient data (only 150 rows, need 200+)
-    dates = pd.date_range(end=datetime.now(timezone.utc), periods=150, freq='D')
+    dates = make_daily_index(150)
     insufficient_data = pd.DataFrame({
         'time': dates,
-        'close': np.random.rand(150) * 100 + 100
+        'close': RNG.random(150) * 100 + 100
     })
     
     mock_engine = MagicMock()
@@ -95,7 +110,7 @@ async def test_regime_current_price_is_latest():
     """Verify that current_price reflects the most recent data point."""
     
     # Create data where most recent price is clearly identifiable
-    dates = pd.date_range(end=datetime.now(timezone.utc), periods=250, freq='D')
+    dates = make_daily_index(250)
     test_data = pd.DataFrame({
         'time': dates,
         'close': [100.0] * 249 + [999.99]  # Last price is 999.99
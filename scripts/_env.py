@@ -0,0 +1,41 @@
+"""
+Nexus Trading - Shared environment loading for scripts.
+
+Loads the project ``.env`` exactly once per process and exposes cached
+accessors for the environment variables read by the verify scripts.
+"""
+
+import os
+from functools import lru_cache
+from typing import Optional
+
+from _init import PROJECT_ROOT
+
+# Load environment variables
+try:
+    from dotenv import load_dotenv
+    load_dotenv(PROJECT_ROOT / ".env")
+except ImportError:
+    print("Warning: python-dotenv not installed. Using existing environment variables.")
+
+
+@lru_cache(maxsize=None)
+def getenv(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Cached equivalent of ``os.getenv`` (environment is read once per key)."""
+    return os.getenv(name, default)
+
+
+def anthropic_api_key() -> Optional[str]:
+    return getenv("ANTHROPIC_API_KEY")
+
+
+def brave_search_api_key() -> Optional[str]:
+    return getenv("BRAVE_SEARCH_API_KEY")
+
+
+def ibkr_host() -> Optional[str]:
+    return getenv("IBKR_HOST")
+
+
+def ibkr_port() -> Optional[str]:
+    return getenv("IBKR_PORT")
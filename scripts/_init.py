@@ -0,0 +1,18 @@
+"""
+Nexus Trading - Script bootstrap.
+
+Import first from any script under ``scripts/`` to make the project
+packages (``src``, ``mcp_servers``) importable. The project root is
+computed once and only added to ``sys.path`` if it is not already there
+(e.g. when PYTHONPATH is set or the project is installed in editable mode).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_root = str(PROJECT_ROOT)
+if _root not in sys.path:
+    sys.path.insert(0, _root)
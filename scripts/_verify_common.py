@@ -0,0 +1,134 @@
+"""
+Nexus Trading - Shared helpers for verify scripts.
+
+Terminal colors, check printers and result tracking used by the
+``scripts/verify_*.py`` entry points.
+"""
+
+import atexit
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+# Colors for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    CYAN = '\033[96m'
+    BOLD = '\033[1m'
+    END = '\033[0m'
+
+# JSON output mode: check messages are collected instead of printed and a
+# single summary document is written at the end (see TestResults.summary)
+_json_mode = False
+_current_section: Optional[str] = None
+EVENTS: List[Dict[str, Any]] = []
+
+def set_json_mode(enabled: bool = True):
+    global _json_mode
+    _json_mode = enabled
+
+# Text output is buffered and written once per section instead of one
+# print() (one write on a TTY) per check
+_out: List[str] = []
+
+def _write(line: str):
+    _out.append(line + "\n")
+
+def flush_output():
+    if _out:
+        sys.stdout.write("".join(_out))
+        sys.stdout.flush()
+        _out.clear()
+
+# Don't lose the last section if a script exits early
+atexit.register(flush_output)
+
+def _emit(level: str, mark: str, msg: str):
+    if _json_mode:
+        EVENTS.append({"section": _current_section, "level": level, "message": msg.strip()})
+    else:
+        _write(f"  {mark} {msg}")
+
+def ok(msg: str):
+    _emit("ok", f"{Colors.GREEN}✓{Colors.END}", msg)
+
+def fail(msg: str):
+    _emit("fail", f"{Colors.RED}✗{Colors.END}", msg)
+
+def warn(msg: str):
+    _emit("warn", f"{Colors.YELLOW}⚠{Colors.END}", msg)
+
+def info(msg: str):
+    _emit("info", f"{Colors.BLUE}ℹ{Colors.END}", msg)
+
+def section(title: str):
+    global _current_section
+    _current_section = title
+    if not _json_mode:
+        flush_output()
+        _write(f"\n{Colors.BOLD}{Colors.CYAN}[{title}]{Colors.END}")
+
+def subsection(title: str):
+    if not _json_mode:
+        _write(f"\n  {Colors.BOLD}{title}{Colors.END}")
+
+# ============================================================================
+# Test Results Tracking
+# ============================================================================
+
+class TestResults:
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.warnings = 0
+        self.errors: List[str] = []
+    
+    def record_pass(self):
+        self.passed += 1
+    
+    def record_fail(self, error: str):
+        self.failed += 1
+        self.errors.append(error)
+    
+    def record_warning(self):
+        self.warnings += 1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.passed + self.failed,
+            "passed": self.passed,
+            "failed": self.failed,
+            "warnings": self.warnings,
+            "errors": self.errors,
+            "events": EVENTS,
+        }
+    
+    def summary(self):
+        if _json_mode:
+            json.dump(self.to_dict(), sys.stdout, ensure_ascii=False)
+            sys.stdout.write("\n")
+            return self.failed == 0
+        
+        total = self.passed + self.failed
+        _write(f"\n{'='*60}")
+        _write(f"{Colors.BOLD}VERIFICATION SUMMARY{Colors.END}")
+        _write(f"{'='*60}")
+        _write(f"  Total Tests: {total}")
+        _write(f"  {Colors.GREEN}Passed: {self.passed}{Colors.END}")
+        _write(f"  {Colors.RED}Failed: {self.failed}{Colors.END}")
+        _write(f"  {Colors.YELLOW}Warnings: {self.warnings}{Colors.END}")
+        
+        if self.errors:
+            _write(f"\n{Colors.RED}Errors:{Colors.END}")
+            for err in self.errors:
+                _write(f"  - {err}")
+        
+        if self.failed == 0:
+            _write(f"\n{Colors.GREEN}{Colors.BOLD}✓ ALL CHECKS PASSED - System ready for testing{Colors.END}")
+        else:
+            _write(f"\n{Colors.RED}{Colors.BOLD}✗ {self.failed} CHECKS FAILED - Please fix before running{Colors.END}")
+        flush_output()
+        return self.failed == 0
@@ -17,8 +17,11 @@ import socket
 import subprocess
 import shutil
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import _init  # noqa: F401  (makes ``src`` importable)
+
 # Colors
 class Colors:
     GREEN = '\033[92m'
@@ -56,16 +59,55 @@ def is_docker_running():
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
-def wait_for_service(name, host, port, max_retries=30, delay=1):
-    """Wait for a service to become available."""
-    print(f"Waiting for {name} ({host}:{port})... ", end="", flush=True)
+def poll_port(host, port, max_retries=30, delay=1):
+    """Poll a TCP port until it opens or retries are exhausted."""
     for _ in range(max_retries):
         if check_port(host, port):
-            print(f"{Colors.GREEN}UP{Colors.END}")
             return True
         time.sleep(delay)
-        print(".", end="", flush=True)
-    print(f"{Colors.RED}TIMEOUT{Colors.END}")
+    return False
+
+def wait_for_services(services, max_retries=30, delay=1):
+    """
+    Wait for several independent services concurrently.
+    
+    Each port is polled in its own thread, so the total wait is bounded by
+    the slowest service instead of the sum of all of them. Results are
+    printed afterwards in the order given.
+    """
+    names = ", ".join(name for name, _, _ in services)
+    log(f"Waiting for {names}...")
+    with ThreadPoolExecutor(max_workers=max(len(services), 1)) as executor:
+        futures = [
+            executor.submit(poll_port, host, port, max_retries, delay)
+            for _, host, port in services
+        ]
+        ready = {name: f.result() for (name, _, _), f in zip(services, futures)}
+    
+    for name, host, port in services:
+        status = f"{Colors.GREEN}UP{Colors.END}" if ready[name] else f"{Colors.RED}TIMEOUT{Colors.END}"
+        print(f"  {name} ({host}:{port}): {status}")
+    return ready
+
+def check_redis_health():
+    """
+    Confirm Redis actually answers, not just that its port is open.
+    
+    Uses RedisClient.health_check (PING + INFO in one round trip, 1s
+    timeouts). Returns True when Redis replied.
+    """
+    try:
+        from src.shared.infrastructure.redis_client import RedisClient
+    except ImportError as e:
+        log(f"Skipping Redis health check ({e}).", "WARN")
+        return False
+    
+    health = RedisClient().health_check()
+    if health["redis_connected"]:
+        log(f"Redis {health.get('redis_version')} is answering "
+            f"(uptime {health.get('uptime_seconds')}s).", "OK")
+        return True
+    log(f"Redis port is open but the server did not answer: {health.get('error', 'no PONG')}", "WARN")
     return False
 
 def open_new_terminal(command, title="Nexus Service"):
@@ -133,8 +175,11 @@ def main():
         # simplistically we assume if DBs are up, MCPs will follow shortly)
     ]
     
-    for name, host, port in services:
-        if not wait_for_service(name, host, port):
+    ready = wait_for_services(services)
+    if ready["Redis"]:
+        ready["Redis"] = check_redis_health()
+    for name, _, _ in services:
+        if not ready[name]:
             log(f"Service {name} failed to start.", "ERR")
             if input("  Continue anyway? (y/n): ").lower() != 'y':
                 sys.exit(1)
@@ -11,12 +11,10 @@ import sys
 import yaml
 import asyncio
 import argparse
-from pathlib import Path
 from collections import Counter
 
 # Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+from _init import PROJECT_ROOT as project_root
 
 SYMBOLS_FILE = project_root / "config" / "symbols.yaml"
 
@@ -5,101 +5,141 @@ Nexus Trading - System Verification Script
 Verifica que todos los componentes del sistema están correctamente
 configurados e implementados antes de ejecutar el Strategy Lab.
 
-Ejecutar: python scripts/verify_system.py
+Ejecutar: python scripts/verify_system.py [--json]
 """
 
-import sys
 import os
-import json
+import sys
+import argparse
 import asyncio
 import importlib
+import re
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime, timezone, date
+from functools import lru_cache
 from typing import Tuple, List, Optional
 
 # Add project root to path
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+from _init import PROJECT_ROOT
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    load_dotenv(PROJECT_ROOT / ".env")
-except ImportError:
-    print("Warning: python-dotenv not installed. Using existing environment variables.")
+# Load environment variables (once, cached accessors)
+import _env
 
-# Colors for terminal output
-class Colors:
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    CYAN = '\033[96m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
+from src.shared.json_utils import atomic_write_json, read_json, read_json_mmap, write_json
 
-def ok(msg: str):
-    print(f"  {Colors.GREEN}✓{Colors.END} {msg}")
+from _verify_common import (
+    Colors, TestResults, ok, fail, warn, info, section, subsection,
+    set_json_mode,
+)
 
-def fail(msg: str):
-    print(f"  {Colors.RED}✗{Colors.END} {msg}")
+results = TestResults()
 
-def warn(msg: str):
-    print(f"  {Colors.YELLOW}⚠{Colors.END} {msg}")
+# Single event loop shared by every async verification step
+_loop: Optional[asyncio.AbstractEventLoop] = None
 
-def info(msg: str):
-    print(f"  {Colors.BLUE}ℹ{Colors.END} {msg}")
+def run_async(coro):
+    """Run ``coro`` to completion on the shared event loop."""
+    global _loop
+    if _loop is None:
+        if sys.platform == "win32":
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
 
-def section(title: str):
-    print(f"\n{Colors.BOLD}{Colors.CYAN}[{title}]{Colors.END}")
+def close_loop():
+    global _loop
+    if _loop is not None:
+        _loop.close()
+        _loop = None
 
-def subsection(title: str):
-    print(f"\n  {Colors.BOLD}{title}{Colors.END}")
+def missing_members(cls: type, names: List[str]) -> List[str]:
+    """Return the ``names`` not defined on ``cls`` (one dir() walk for all)."""
+    members = set(dir(cls))
+    return [name for name in names if name not in members]
+
+def existing_paths(rel_paths: List[str]) -> set:
+    """
+    Return the subset of ``rel_paths`` (relative to PROJECT_ROOT) that exist.
+    
+    Paths are grouped by parent directory and each parent is listed once
+    with os.scandir, instead of issuing one stat() per path.
+    """
+    by_parent = defaultdict(list)
+    for rel_path in rel_paths:
+        full_path = PROJECT_ROOT / rel_path
+        by_parent[full_path.parent].append((rel_path, full_path.name))
+    
+    found = set()
+    for parent, entries in by_parent.items():
+        try:
+            with os.scandir(parent) as it:
+                names = {entry.name for entry in it}
+        except OSError:
+            continue
+        found.update(rel_path for rel_path, name in entries if name in names)
+    return found
 
 # ============================================================================
-# Test Results Tracking
+# Verification Cache
 # ============================================================================
 
-class TestResults:
-    def __init__(self):
-        self.passed = 0
-        self.failed = 0
-        self.warnings = 0
-        self.errors: List[str] = []
-    
-    def record_pass(self):
-        self.passed += 1
+# Files already verified, keyed by path relative to PROJECT_ROOT:
+# {path: {"fingerprint": [mtime_ns, size], "sha1": hex, ...check-specific data}}
+VERIFY_CACHE_FILE = PROJECT_ROOT / "data" / ".verify_cache.json"
+_verify_cache: Optional[dict] = None
+
+def verify_cache() -> dict:
+    """Load the verification cache (once per run)."""
+    global _verify_cache
+    if _verify_cache is None:
+        try:
+            _verify_cache = read_json(VERIFY_CACHE_FILE)
+        except (OSError, ValueError):
+            _verify_cache = {}
+    return _verify_cache
+
+def save_verify_cache():
+    """Persist the cache atomically (write temp file, then os.replace)."""
+    try:
+        atomic_write_json(VERIFY_CACHE_FILE, verify_cache())
+    except OSError:
+        pass  # Cache is an optimization only
+
+def file_fingerprint(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+def file_sha1(path: Path) -> str:
+    import hashlib
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha1").hexdigest()
+
+def new_cache_entry(path: Path) -> dict:
+    return {"fingerprint": file_fingerprint(path), "sha1": file_sha1(path)}
+
+def cached_entry(rel_path: str, path: Path) -> Optional[dict]:
+    """
+    Return the cache entry for ``rel_path`` if the file is unchanged.
     
-    def record_fail(self, error: str):
-        self.failed += 1
-        self.errors.append(error)
+    A matching (mtime, size) fingerprint is a hit. If only the fingerprint
+    moved (checkout, touch), the content digest decides: hashing is far
+    cheaper than re-parsing or re-compiling.
+    """
+    entry = verify_cache().get(rel_path)
+    if not isinstance(entry, dict):
+        return None
     
-    def record_warning(self):
-        self.warnings += 1
+    fingerprint = file_fingerprint(path)
+    if entry.get("fingerprint") == fingerprint:
+        return entry
     
-    def summary(self):
-        total = self.passed + self.failed
-        print(f"\n{'='*60}")
-        print(f"{Colors.BOLD}VERIFICATION SUMMARY{Colors.END}")
-        print(f"{'='*60}")
-        print(f"  Total Tests: {total}")
-        print(f"  {Colors.GREEN}Passed: {self.passed}{Colors.END}")
-        print(f"  {Colors.RED}Failed: {self.failed}{Colors.END}")
-        print(f"  {Colors.YELLOW}Warnings: {self.warnings}{Colors.END}")
-        
-        if self.errors:
-            print(f"\n{Colors.RED}Errors:{Colors.END}")
-            for err in self.errors:
-                print(f"  - {err}")
-        
-        if self.failed == 0:
-            print(f"\n{Colors.GREEN}{Colors.BOLD}✓ ALL CHECKS PASSED - System ready for testing{Colors.END}")
-            return True
-        else:
-            print(f"\n{Colors.RED}{Colors.BOLD}✗ {self.failed} CHECKS FAILED - Please fix before running{Colors.END}")
-            return False
-
-results = TestResults()
+    if entry.get("sha1") and entry["sha1"] == file_sha1(path):
+        entry["fingerprint"] = fingerprint
+        save_verify_cache()
+        return entry
+    return None
 
 # ============================================================================
 # 1. Directory Structure Verification
@@ -124,9 +164,9 @@ def verify_directory_structure():
         "dashboard/templates/components",
     ]
     
+    existing = existing_paths(required_dirs)
     for dir_path in required_dirs:
-        full_path = PROJECT_ROOT / dir_path
-        if full_path.exists():
+        if dir_path in existing:
             ok(f"Directory exists: {dir_path}")
             results.record_pass()
         else:
@@ -137,29 +177,99 @@ def verify_directory_structure():
 # 2. Configuration Files Verification
 # ============================================================================
 
+# Parsed YAML keyed by (path, size, mtime_ns): each config is read and
+# parsed once even when several checks need its contents
+_yaml_cache: dict = {}
+
+@lru_cache(maxsize=None)
+def _get_yaml():
+    """Import yaml (and pick its loader) on first use only."""
+    import yaml
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    return yaml, Loader
+
+def load_yaml(path: Path):
+    st = path.stat()
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    if key not in _yaml_cache:
+        yaml, Loader = _get_yaml()
+        _yaml_cache[key] = yaml.load(path.read_bytes(), Loader=Loader)
+    return _yaml_cache[key]
+
+def check_yaml_syntax(path: Path):
+    """
+    Validate YAML documents without building Python objects.
+    
+    Documents are composed into node graphs (C parser when available), which
+    catches syntax errors, undefined aliases and duplicate anchors; every
+    node tag must also be one the safe loader can construct. Construction,
+    the bulk of the load cost, is skipped. Raises yaml.YAMLError on invalid
+    documents.
+    """
+    yaml, Loader = _get_yaml()
+    constructors = Loader.yaml_constructors
+    for root in yaml.compose_all(path.read_bytes(), Loader=Loader):
+        stack, seen = [root], set()
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if node.tag not in constructors:
+                raise yaml.constructor.ConstructorError(
+                    None, None, f"could not determine a constructor for the tag {node.tag!r}",
+                    node.start_mark
+                )
+            if isinstance(node, yaml.SequenceNode):
+                stack.extend(node.value)
+            elif isinstance(node, yaml.MappingNode):
+                for key, value in node.value:
+                    stack.extend((key, value))
+
+SYMBOLS_CONFIG = "config/symbols.yaml"
+
 def verify_config_files():
     section("2. Configuration Files")
     
     required_configs = [
-        ("config/symbols.yaml", "symbols"),
+        (SYMBOLS_CONFIG, "symbols"),
         ("config/strategies.yaml", "strategies"),
         ("config/agents.yaml", "agents (LLM config)"),
         ("config/paper_trading.yaml", "paper trading"),
     ]
     
+    existing = existing_paths([config_path for config_path, _ in required_configs])
+    cache_dirty = False
     for config_path, desc in required_configs:
         full_path = PROJECT_ROOT / config_path
-        if full_path.exists():
+        if config_path in existing:
             ok(f"Config exists: {desc} ({config_path})")
             results.record_pass()
             
-            # Verify YAML is valid
+            # Verify YAML is valid (skipped if unchanged since last good run)
+            if cached_entry(config_path, full_path):
+                ok(f"  └─ Valid YAML syntax (unchanged since last verification)")
+                results.record_pass()
+                continue
+            
             try:
-                import yaml
-                with open(full_path) as f:
-                    yaml.safe_load(f)
+                # Only symbols.yaml is inspected; the rest just need a syntax check
+                if config_path == SYMBOLS_CONFIG:
+                    data = load_yaml(full_path)
+                else:
+                    check_yaml_syntax(full_path)
+                    data = None
                 ok(f"  └─ Valid YAML syntax")
                 results.record_pass()
+                
+                entry = new_cache_entry(full_path)
+                if isinstance(data, dict):
+                    entry["symbol_count"] = len(data.get("symbols", []))
+                verify_cache()[config_path] = entry
+                cache_dirty = True
             except Exception as e:
                 fail(f"  └─ Invalid YAML: {e}")
                 results.record_fail(f"Invalid YAML in {config_path}")
@@ -167,15 +277,19 @@ def verify_config_files():
             fail(f"Missing config: {desc} ({config_path})")
             results.record_fail(f"Missing config: {config_path}")
     
+    if cache_dirty:
+        save_verify_cache()
+    
     # Verify symbols count
     subsection("Symbol Universe")
     try:
-        import yaml
-        with open(PROJECT_ROOT / "config/symbols.yaml") as f:
-            data = yaml.safe_load(f)
-        
-        symbols = data.get("symbols", [])
-        count = len(symbols)
+        symbols_path = PROJECT_ROOT / SYMBOLS_CONFIG
+        entry = cached_entry(SYMBOLS_CONFIG, symbols_path) or {}
+        count = entry.get("symbol_count")
+        if count is None:
+            data = load_yaml(symbols_path)
+            symbols = data.get("symbols", [])
+            count = len(symbols)
         
         if count >= 100:
             ok(f"Universe has {count} symbols (target: 150)")
@@ -195,6 +309,17 @@ def verify_config_files():
 # 3. Module Imports Verification
 # ============================================================================
 
+def cached_import(module_path: str, attr: str):
+    """
+    Return ``attr`` from ``module_path``, importing the module only if it
+    is not already fully loaded in ``sys.modules`` (as Django does).
+    """
+    module = sys.modules.get(module_path)
+    spec = getattr(module, "__spec__", None)
+    if module is None or (spec is not None and getattr(spec, "_initializing", False)):
+        module = importlib.import_module(module_path)
+    return getattr(module, attr)
+
 def verify_imports():
     section("3. Module Imports")
     
@@ -212,10 +337,11 @@ def verify_imports():
         ("src.data.symbols", "SymbolRegistry", "DOC-04"),
     ]
     
+    # Imports run serially: they are serialized by the import lock anyway,
+    # and a thread pool only adds cross-thread import-cycle failures
     for module_name, class_name, doc_ref in modules_to_check:
         try:
-            module = importlib.import_module(module_name)
-            cls = getattr(module, class_name)
+            cached_import(module_name, class_name)
             ok(f"{class_name} from {module_name} ({doc_ref})")
             results.record_pass()
         except ImportError as e:
@@ -243,8 +369,7 @@ def verify_imports():
     
     for module_name, class_name in dashboard_modules:
         try:
-            module = importlib.import_module(module_name)
-            cls = getattr(module, class_name)
+            cached_import(module_name, class_name)
             ok(f"{class_name} from {module_name}")
             results.record_pass()
         except Exception as e:
@@ -270,10 +395,10 @@ def verify_status_writer():
         writer = StatusWriter(output_file=str(test_file), interval_seconds=1)
         
         # Test setters exist
-        assert hasattr(writer, 'set_regime'), "Missing set_regime method"
-        assert hasattr(writer, 'set_next_execution'), "Missing set_next_execution method"
-        assert hasattr(writer, 'set_active_symbols_count'), "Missing set_active_symbols_count"
-        assert hasattr(writer, 'record_execution'), "Missing record_execution method"
+        missing = missing_members(StatusWriter, [
+            'set_regime', 'set_next_execution', 'set_active_symbols_count', 'record_execution',
+        ])
+        assert not missing, f"Missing methods: {', '.join(missing)}"
         ok("All required methods present")
         results.record_pass()
         
@@ -284,11 +409,10 @@ def verify_status_writer():
         writer._active_symbols_count = 35
         
         # Sync write for testing
-        asyncio.get_event_loop().run_until_complete(writer._write_status())
+        run_async(writer._write_status())
         
         if test_file.exists():
-            with open(test_file) as f:
-                data = json.load(f)
+            data = read_json_mmap(test_file)
             
             assert data.get("is_running") == True
             assert data.get("regime", {}).get("current") == "BULL"
@@ -350,8 +474,7 @@ def verify_cost_tracker():
         cost_file = test_dir / f"{today}.json"
         
         if cost_file.exists():
-            with open(cost_file) as f:
-                data = json.load(f)
+            data = read_json(cost_file)
             
             assert "summary" in data
             assert "records" in data
@@ -384,7 +507,7 @@ def verify_web_search():
         client = WebSearchClient()
         
         # Check API key
-        api_key = os.getenv("BRAVE_SEARCH_API_KEY")
+        api_key = _env.brave_search_api_key()
         if api_key:
             ok("BRAVE_SEARCH_API_KEY is set")
             results.record_pass()
@@ -441,18 +564,24 @@ def verify_dashboard_data_service():
             fail("DataService still has memory injection parameters!")
             results.record_fail("DOC-07 fix not applied: DataService has memory params")
         
-        # Test reading non-existent files (should return defaults, not crash)
-        status = service.get_system_status()
+        # Test reading non-existent files (should return defaults, not crash).
+        # The reads are independent, so they run concurrently in worker threads.
+        async def read_all():
+            return await asyncio.gather(
+                asyncio.to_thread(service.get_system_status),
+                asyncio.to_thread(service.get_active_universe),
+                asyncio.to_thread(service.get_recent_signals),
+            )
+        status, universe, signals = run_async(read_all())
+        
         assert "is_running" in status or "status" in status
         ok("get_system_status() handles missing file gracefully")
         results.record_pass()
         
-        universe = service.get_active_universe()
         assert "active_symbols" in universe or "status" in universe
         ok("get_active_universe() handles missing file gracefully")
         results.record_pass()
         
-        signals = service.get_recent_signals()
         assert "signals" in signals
         ok("get_recent_signals() handles missing file gracefully")
         results.record_pass()
@@ -465,8 +594,7 @@ def verify_dashboard_data_service():
             "regime": {"current": "BULL", "confidence": 0.8},
             "active_symbols_count": 42
         }
-        with open(test_status_file, 'w') as f:
-            json.dump(test_status, f)
+        write_json(test_status_file, test_status)
         
         read_status = service.get_system_status()
         assert read_status.get("is_running") == True
@@ -482,6 +610,28 @@ def verify_dashboard_data_service():
         fail(f"DataService test failed: {e}")
         results.record_fail(f"DataService error: {e}")
 
+# ============================================================================
+# Source Inspection Helpers
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def module_source(module_name: str) -> str:
+    """Read a module's source file once (no inspect/tokenizer pass)."""
+    return Path(sys.modules[module_name].__file__).read_text(encoding="utf-8")
+
+def find_patterns(source: str, patterns: List[str]) -> set:
+    """
+    Return which literal ``patterns`` occur in ``source`` in a single scan.
+    
+    The alternation sits in a lookahead so matches may overlap; patterns
+    contained in a longer hit (e.g. ``MAX_SEARCHES`` in
+    ``MAX_SEARCHES = 3``) are counted as found as well.
+    """
+    ordered = sorted(set(patterns), key=len, reverse=True)
+    rx = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    hits = set(rx.findall(source))
+    return {p for p in patterns if any(p in hit for hit in hits)}
+
 # ============================================================================
 # 8. UniverseManager.save_state() Test
 # ============================================================================
@@ -493,22 +643,24 @@ def verify_universe_manager():
         from src.universe.manager import UniverseManager
         
         # Check save_state method exists
-        assert hasattr(UniverseManager, 'save_state'), "Missing save_state method"
+        assert not missing_members(UniverseManager, ['save_state']), "Missing save_state method"
         ok("UniverseManager has save_state() method")
         results.record_pass()
         
         # Check it's async
         import inspect
-        if inspect.iscoroutinefunction(UniverseManager.save_state):
+        save_state = UniverseManager.save_state
+        if inspect.iscoroutinefunction(save_state):
             ok("save_state() is async (correct)")
             results.record_pass()
         else:
             warn("save_state() is not async - may need adjustment")
             results.record_warning()
         
-        # Check state_file attribute is set in __init__
-        source = inspect.getsource(UniverseManager.__init__)
-        if "state_file" in source and "active_universe.json" in source:
+        # Check state_file attribute is configured
+        source = module_source(UniverseManager.__module__)
+        found = find_patterns(source, ["state_file", "active_universe.json"])
+        if len(found) == 2:
             ok("UniverseManager writes to data/active_universe.json")
             results.record_pass()
         else:
@@ -528,10 +680,9 @@ def verify_claude_agent():
     
     try:
         from src.agents.llm.agents.claude_agent import ClaudeAgent
-        import inspect
         
         # Check for web search tool definition
-        source = inspect.getsource(ClaudeAgent)
+        source = module_source(ClaudeAgent.__module__)
         
         checks = [
             ("WEB_SEARCH_TOOL", "Web search tool definition"),
@@ -542,8 +693,9 @@ def verify_claude_agent():
             ("search_client", "Search client integration"),
         ]
         
+        found = find_patterns(source, [p for p, _ in checks] + ["MAX_SEARCHES = 3"])
         for pattern, desc in checks:
-            if pattern in source:
+            if pattern in found:
                 ok(f"{desc} present")
                 results.record_pass()
             else:
@@ -551,7 +703,7 @@ def verify_claude_agent():
                 results.record_fail(f"ClaudeAgent missing: {desc}")
         
         # Check MAX_SEARCHES value
-        if "MAX_SEARCHES = 3" in source:
+        if "MAX_SEARCHES = 3" in found:
             ok("MAX_SEARCHES correctly set to 3 (per DOC-07)")
             results.record_pass()
         else:
@@ -566,6 +718,9 @@ def verify_claude_agent():
 # 10. Integration Point: run_strategy_lab.py
 # ============================================================================
 
+# Constructor call of the MCP adapter (arguments in group 1)
+_ADAPTER_RX = re.compile(r'MCPDataProviderAdapter\s*\((.*?)\)', re.DOTALL)
+
 def verify_main_entry_point():
     section("10. Main Entry Point Integration")
     
@@ -577,8 +732,7 @@ def verify_main_entry_point():
             results.record_fail("Missing entry point")
             return
         
-        with open(entry_point) as f:
-            source = f.read()
+        source = entry_point.read_text(encoding="utf-8")
         
         # Check critical integrations
         integrations = [
@@ -589,8 +743,10 @@ def verify_main_entry_point():
             ("MCPDataProviderAdapter", "MCP adapter import"),
         ]
         
+        # One scan of the source for every integration pattern
+        found = find_patterns(source, [pattern for pattern, _ in integrations])
         for pattern, desc in integrations:
-            if pattern in source:
+            if pattern in found:
                 ok(f"{desc}")
                 results.record_pass()
             else:
@@ -600,10 +756,9 @@ def verify_main_entry_point():
         # Check for the bug we identified - MCPDataProviderAdapter constructor
         # Check if servers_config is passed to MCPDataProviderAdapter
         adapter_instantiation = False
-        if "MCPDataProviderAdapter" in source:
-             import re
+        if "MCPDataProviderAdapter" in found:
              # Find the call pattern
-             match = re.search(r'MCPDataProviderAdapter\s*\((.*?)\)', source, re.DOTALL)
+             match = _ADAPTER_RX.search(source)
              if match:
                  args = match.group(1)
                  if "servers_config" in args or "self.mcp_servers" in args:
@@ -628,6 +783,18 @@ def verify_main_entry_point():
 # 11. Data Directory Permissions
 # ============================================================================
 
+def is_writable_dir(path: Path) -> bool:
+    """
+    Permission check without touching the filesystem contents.
+    
+    On Windows os.access() ignores ACLs (it only sees the read-only
+    attribute), so it is never trusted there and callers fall back to a
+    write probe.
+    """
+    if sys.platform == "win32":
+        return False
+    return os.access(path, os.W_OK | os.X_OK)
+
 def verify_data_directories():
     section("11. Data Directories & Permissions")
     
@@ -637,13 +804,16 @@ def verify_data_directories():
         "reports",
     ]
     
+    existing = existing_paths(data_dirs)
     for dir_path in data_dirs:
         full_path = PROJECT_ROOT / dir_path
+        exists = dir_path in existing
         
-        if not full_path.exists():
+        if not exists:
             # Try to create
             try:
                 full_path.mkdir(parents=True, exist_ok=True)
+                exists = True
                 ok(f"Created directory: {dir_path}")
                 results.record_pass()
             except Exception as e:
@@ -654,7 +824,13 @@ def verify_data_directories():
             results.record_pass()
         
         # Check writable
-        if full_path.exists():
+        if exists:
+            if is_writable_dir(full_path):
+                ok(f"  └─ Writable")
+                results.record_pass()
+                continue
+            
+            # Inconclusive (or denied): confirm with a real write
             test_file = full_path / ".write_test"
             try:
                 test_file.write_text("test")
@@ -683,7 +859,7 @@ def verify_environment():
     ]
     
     for var, required, desc in required_vars:
-        value = os.getenv(var)
+        value = _env.getenv(var)
         if value:
             # Mask the key
             masked = value[:8] + "..." + value[-4:] if len(value) > 12 else "***"
@@ -694,7 +870,7 @@ def verify_environment():
             results.record_fail(f"Missing env var: {var}")
     
     for var, desc in optional_vars:
-        value = os.getenv(var)
+        value = _env.getenv(var)
         if value:
             ok(f"{var} is set - {desc}")
             results.record_pass()
@@ -706,104 +882,156 @@ def verify_environment():
 # 13. JSON File Structure Test
 # ============================================================================
 
+# Sample Dashboard files, keyed by path: (timestamp field, static content).
+# The timestamp is filled in on each run.
+_JSON_FIXTURES = {
+    "data/system_status.json": ("timestamp", {
+        "is_running": True,
+        "uptime_seconds": 3600,
+        "regime": {
+            "current": "BULL",
+            "confidence": 0.75,
+            "probabilities": {"BULL": 0.75, "BEAR": 0.1, "SIDEWAYS": 0.1, "VOLATILE": 0.05},
+            "days_in_regime": 3
+        },
+        "scheduler": {
+            "next_hmm_rules": "2024-12-12T10:00:00Z",
+            "next_ai_agent": "2024-12-11T14:00:00Z",
+            "last_execution": None
+        },
+        "active_symbols_count": 35,
+        "errors_last_hour": 0
+    }),
+    "data/active_universe.json": ("screening_timestamp", {
+        "regime_used": "BULL",
+        "master_universe_count": 150,
+        "filters_applied": {
+            "liquidity_passed": 120,
+            "trend_passed": 85,
+            "volatility_passed": 35,
+            "final_count": 35
+        },
+        "active_symbols": [
+            {"ticker": "SPY", "name": "SPDR S&P 500", "sector": "broad_market", "liquidity_tier": 1},
+            {"ticker": "QQQ", "name": "Invesco NASDAQ-100", "sector": "technology", "liquidity_tier": 1},
+        ]
+    }),
+    "data/signals_cache.json": ("timestamp", {
+        "count": 1,
+        "signals": [
+            {
+                "strategy_id": "ai_agent_swing",
+                "symbol": "NVDA",
+                "direction": "LONG",
+                "confidence": 0.85,
+                "entry_price": 875.50,
+                "stop_loss": 850.00,
+                "take_profit": 925.00,
+                "reasoning": "Strong momentum"
+            }
+        ]
+    }),
+}
+
 def verify_json_structures():
     section("13. JSON File Structure Validation")
     
     # Create sample files and verify Dashboard can read them
+    now = datetime.now(timezone.utc).isoformat()
     test_files = {
-        "data/system_status.json": {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "is_running": True,
-            "uptime_seconds": 3600,
-            "regime": {
-                "current": "BULL",
-                "confidence": 0.75,
-                "probabilities": {"BULL": 0.75, "BEAR": 0.1, "SIDEWAYS": 0.1, "VOLATILE": 0.05},
-                "days_in_regime": 3
-            },
-            "scheduler": {
-                "next_hmm_rules": "2024-12-12T10:00:00Z",
-                "next_ai_agent": "2024-12-11T14:00:00Z",
-                "last_execution": None
-            },
-            "active_symbols_count": 35,
-            "errors_last_hour": 0
-        },
-        "data/active_universe.json": {
-            "screening_timestamp": datetime.now(timezone.utc).isoformat(),
-            "regime_used": "BULL",
-            "master_universe_count": 150,
-            "filters_applied": {
-                "liquidity_passed": 120,
-                "trend_passed": 85,
-                "volatility_passed": 35,
-                "final_count": 35
-            },
-            "active_symbols": [
-                {"ticker": "SPY", "name": "SPDR S&P 500", "sector": "broad_market", "liquidity_tier": 1},
-                {"ticker": "QQQ", "name": "Invesco NASDAQ-100", "sector": "technology", "liquidity_tier": 1},
-            ]
-        },
-        "data/signals_cache.json": {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "count": 1,
-            "signals": [
-                {
-                    "strategy_id": "ai_agent_swing",
-                    "symbol": "NVDA",
-                    "direction": "LONG",
-                    "confidence": 0.85,
-                    "entry_price": 875.50,
-                    "stop_loss": 850.00,
-                    "take_profit": 925.00,
-                    "reasoning": "Strong momentum"
-                }
-            ]
-        }
+        file_path: {ts_key: now, **content}
+        for file_path, (ts_key, content) in _JSON_FIXTURES.items()
     }
     
-    for file_path, content in test_files.items():
+    def write_and_verify(file_path: str, content: dict):
         full_path = PROJECT_ROOT / file_path
         
-        try:
-            # Write test file
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(full_path, 'w') as f:
-                json.dump(content, f, indent=2)
-            
-            # Read back and verify
-            with open(full_path) as f:
-                read_back = json.load(f)
-            
-            # Basic structure check
-            if file_path.endswith("system_status.json"):
-                assert "is_running" in read_back
-                assert "regime" in read_back
-            elif file_path.endswith("active_universe.json"):
-                assert "active_symbols" in read_back
-                assert "filters_applied" in read_back
-            elif file_path.endswith("signals_cache.json"):
-                assert "signals" in read_back
-            
+        # Write test file
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(full_path, content, indent=True)
+        
+        # Read back and verify
+        read_back = read_json_mmap(full_path)
+        
+        # Basic structure check
+        if file_path.endswith("system_status.json"):
+            assert "is_running" in read_back
+            assert "regime" in read_back
+        elif file_path.endswith("active_universe.json"):
+            assert "active_symbols" in read_back
+            assert "filters_applied" in read_back
+        elif file_path.endswith("signals_cache.json"):
+            assert "signals" in read_back
+    
+    # The files are independent: write/read them concurrently in worker
+    # threads and report in the original order
+    async def write_all():
+        return await asyncio.gather(
+            *(asyncio.to_thread(write_and_verify, p, c) for p, c in test_files.items()),
+            return_exceptions=True,
+        )
+    
+    for file_path, error in zip(test_files, run_async(write_all())):
+        if error is None:
             ok(f"Created and validated: {file_path}")
             results.record_pass()
-            
-        except Exception as e:
-            fail(f"Error with {file_path}: {e}")
+        else:
+            fail(f"Error with {file_path}: {error}")
             results.record_fail(f"JSON structure error: {file_path}")
     
     info("Test JSON files created in data/ - Dashboard should be able to read them")
 
+# ============================================================================
+# 14. ML Models MCP Server Compile Check
+# ============================================================================
+
+def verify_ml_server():
+    import py_compile
+    
+    section("14. ML Models MCP Server")
+    
+    server_path = PROJECT_ROOT / "mcp_servers" / "ml_models" / "server.py"
+    rel_path = str(server_path.relative_to(PROJECT_ROOT))
+    
+    if not server_path.exists():
+        fail(f"Missing {rel_path}")
+        results.record_fail(f"Missing file: {rel_path}")
+        return
+    
+    # Skip the compile when the file is unchanged since the last good run
+    if cached_entry(rel_path, server_path):
+        ok(f"{rel_path} compiles (unchanged since last verification)")
+        results.record_pass()
+        return
+    
+    try:
+        py_compile.compile(str(server_path), doraise=True)
+        ok(f"{rel_path} compiles")
+        results.record_pass()
+        verify_cache()[rel_path] = new_cache_entry(server_path)
+        save_verify_cache()
+    except py_compile.PyCompileError as e:
+        fail(f"{rel_path} does not compile: {e.msg}")
+        results.record_fail(f"Syntax error: {rel_path}")
+
 # ============================================================================
 # Main
 # ============================================================================
 
 def main():
-    print(f"\n{'='*60}")
-    print(f"{Colors.BOLD}{Colors.CYAN}NEXUS TRADING - SYSTEM VERIFICATION{Colors.END}")
-    print(f"{'='*60}")
-    print(f"Project Root: {PROJECT_ROOT}")
-    print(f"Timestamp: {datetime.now().isoformat()}")
+    parser = argparse.ArgumentParser(description="Nexus Trading system verification")
+    parser.add_argument("--json", action="store_true",
+                        help="Emit a single JSON summary instead of streaming output")
+    args = parser.parse_args()
+    
+    if args.json:
+        set_json_mode()
+    else:
+        print(f"\n{'='*60}")
+        print(f"{Colors.BOLD}{Colors.CYAN}NEXUS TRADING - SYSTEM VERIFICATION{Colors.END}")
+        print(f"{'='*60}")
+        print(f"Project Root: {PROJECT_ROOT}")
+        print(f"Timestamp: {datetime.now().isoformat()}")
     
     # Run all verifications
     verify_directory_structure()
@@ -819,11 +1047,12 @@ def main():
     verify_data_directories()
     verify_environment()
     verify_json_structures()
+    verify_ml_server()
     
     # Summary
     success = results.summary()
     
-    if success:
+    if success and not args.json:
         print(f"\n{Colors.GREEN}Next Steps:{Colors.END}")
         print("  1. Start MCP servers (if using)")
         print("  2. Run: python scripts/run_strategy_lab.py")
@@ -833,4 +1062,8 @@ def main():
     return 0 if success else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        exit_code = main()
+    finally:
+        close_loop()
+    sys.exit(exit_code)
@@ -10,7 +10,7 @@ This package contains the autonomous agent system for the trading bot:
 
 __version__ = "0.1.0"
 
-from .base import BaseAgent
+from .base import BaseAgent, run_agents
 from .messaging import MessageBus
 from .schemas import (
     TradingSignal,
@@ -34,6 +34,7 @@ __all__ = [
     # Base classes
     "BaseAgent",
     "MessageBus",
+    "run_agents",
     
     # Schemas
     "TradingSignal",
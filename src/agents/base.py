@@ -7,13 +7,35 @@ error handling, health checks, and heartbeat monitoring.
 
 import asyncio
 import logging
+import random
+import time
 import redis
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
 
 from .messaging import MessageBus
 
+# Import helpers/constants - try relative first, then absolute
+try:
+    from ..shared.json_utils import dumps
+    from ..core.constants import REDIS_KEY_HEARTBEATS, REDIS_KEY_HEARTBEATS_TS, HEARTBEAT_TTL_SECONDS
+except ImportError:
+    from shared.json_utils import dumps
+    from core.constants import REDIS_KEY_HEARTBEATS, REDIS_KEY_HEARTBEATS_TS, HEARTBEAT_TTL_SECONDS
+
+# Shared by all agents; each instance logs through an adapter carrying its name
+_LOG = logging.getLogger("agents")
+_LOG.setLevel(logging.INFO)
+
+# Placeholder for the timestamp in the pre-serialized heartbeat payload
+_HEARTBEAT_TS_SLOT = "__timestamp__"
+_HEARTBEAT_TS_SLOT_JSON = b'"__timestamp__"'
+
+# A process() call shorter than this did not really wait on anything
+BUSY_PROCESS_SECONDS = 0.001
+BUSY_LOOP_PAUSE_SECONDS = 0.1
+
 
 class BaseAgent(ABC):
     """
@@ -21,12 +43,16 @@ class BaseAgent(ABC):
     
     Provides:
     - Lifecycle management (start, stop, run loop)
-    - Error handling with exponential backoff
+    - Error handling with jittered (decorrelated) backoff
     - Health checks
     - Redis-based heartbeat for monitoring
     - Structured logging
     """
     
+    # (epoch second, ISO string) shared by all agents; heartbeats only need
+    # second resolution, so the timestamp is formatted once per second
+    _iso_cache: Tuple[int, str] = (0, "")
+    
     def __init__(
         self,
         name: str,
@@ -48,19 +74,30 @@ class BaseAgent(ABC):
         self.bus = message_bus
         self.redis = redis_client
         self.running = False
-        self._last_activity: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        # Activity is tracked as a monotonic float (cheap per iteration) and
+        # converted to wall-clock time against this reference only on demand
+        self._last_activity_mono: Optional[float] = None
+        self._start_wall = datetime.now(timezone.utc)
+        self._start_mono = time.monotonic()
         self._error_count = 0
 
         self._max_consecutive_errors = config.get("max_consecutive_errors", 5)
+        # Heartbeat age after which monitoring treats the agent as dead (get_stale_agents)
         self._heartbeat_ttl = config.get("heartbeat_ttl_seconds", 60)
+        # Minimum time between heartbeat writes (the loop may iterate much faster)
+        self._heartbeat_interval = config.get("heartbeat_interval_seconds", 1.0)
+        self._last_heartbeat = float("-inf")  # time.monotonic() of last write
+        self._heartbeat_template: Tuple[Optional[tuple], bytes] = (None, b"")
+        self._warned_busy_loop = False
         
         # Backoff configuration (configurable for testing)
-        self._backoff_base = config.get("backoff_base", 2)  # Base for exponential backoff
+        self._backoff_base = config.get("backoff_base", 2)  # Min backoff in seconds
         self._backoff_max = config.get("backoff_max", 60)   # Max backoff in seconds
+        self._backoff = self._backoff_base  # Last backoff (grows while errors persist)
         
-        # Setup logging
-        self.logger = logging.getLogger(f"agents.{name}")
-        self.logger.setLevel(logging.INFO)
+        # Setup logging (agent name available to formatters as %(agent)s)
+        self.logger = logging.LoggerAdapter(_LOG, {"agent": name})
     
     @abstractmethod
     async def setup(self):
@@ -78,12 +115,24 @@ class BaseAgent(ABC):
         Main agent logic executed in a loop.
         
         This method is called repeatedly while the agent is running.
-        Add sleep() calls to control loop frequency.
+        It MUST await something (typically asyncio.sleep) to control loop
+        frequency; the base loop only yields to the event loop between calls.
         """
         pass
     
-    async def start(self):
-        """Start the agent lifecycle."""
+    async def start(self, task_group: Optional[asyncio.TaskGroup] = None):
+        """
+        Start the agent lifecycle.
+        
+        Args:
+            task_group: If given, the run loop is created in this TaskGroup so
+                the agent's lifetime is bound to the group's scope (see
+                run_agents). Otherwise a standalone task is created.
+        """
+        if self.running:
+            self.logger.warning(f"Agent '{self.name}' is already running")
+            return
+        
         self.logger.info(f"Starting agent '{self.name}'...")
         
         try:
@@ -92,10 +141,12 @@ class BaseAgent(ABC):
             self.logger.info(f"Agent '{self.name}' started successfully")
             
             # Start main loop
-            self._task = asyncio.create_task(self._run_loop())
+            spawn = task_group.create_task if task_group else asyncio.create_task
+            self._task = spawn(self._run_loop(), name=f"agent.{self.name}")
             
         except Exception as e:
             self.logger.error(f"Failed to start agent '{self.name}': {e}", exc_info=True)
+            self.running = False
             raise
     
     async def stop(self):
@@ -103,7 +154,7 @@ class BaseAgent(ABC):
         self.logger.info(f"Stopping agent '{self.name}'...")
         self.running = False
         
-        if hasattr(self, '_task') and self._task:
+        if self._task:
             self._task.cancel()
             try:
                 await self._task
@@ -114,10 +165,20 @@ class BaseAgent(ABC):
         # Remove heartbeat
         if self.redis:
             try:
-                self.redis.delete(f"agent:heartbeat:{self.name}")
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hdel(REDIS_KEY_HEARTBEATS, self.name)
+                pipe.zrem(REDIS_KEY_HEARTBEATS_TS, self.name)
+                pipe.execute()
             except Exception as e:
                 self.logger.warning(f"Could not remove heartbeat: {e}")
     
+    @property
+    def _last_activity(self) -> Optional[datetime]:
+        """Wall-clock (UTC) time of the last successful process() call."""
+        if self._last_activity_mono is None:
+            return None
+        return self._start_wall + timedelta(seconds=self._last_activity_mono - self._start_mono)
+    
     def health(self) -> Dict[str, Any]:
         """
         Get agent health status.
@@ -125,38 +186,62 @@ class BaseAgent(ABC):
         Returns:
             Dictionary with status, last_activity, name
         """
+        last_activity = self._last_activity
         return {
             "status": "healthy" if self.running else "stopped",
-            "last_activity": self._last_activity.isoformat() if self._last_activity else None,
+            "last_activity": last_activity.isoformat() if last_activity else None,
             "name": self.name,
             "error_count": self._error_count
         }
     
+    @staticmethod
+    def _utc_now_iso() -> str:
+        """Current UTC time as ISO 8601, truncated to the second."""
+        sec = int(time.time())
+        if sec != BaseAgent._iso_cache[0]:
+            BaseAgent._iso_cache = (sec, datetime.fromtimestamp(sec, timezone.utc).isoformat())
+        return BaseAgent._iso_cache[1]
+    
     def _publish_heartbeat(self):
         """
         Publish heartbeat to Redis.
         
-        Sets a key with TTL so monitoring can detect dead agents.
-        Key expires after heartbeat_ttl seconds if not refreshed.
+        All agents share one hash (payload per agent) and one sorted set
+        scored by heartbeat time, so monitoring reads every agent with a
+        single lookup and finds dead ones with a range query (see
+        prune_stale_agents) instead of scanning per-agent keys.
+        
+        Writes are throttled to one every heartbeat_interval seconds, so a
+        fast process loop does not pay a Redis round trip per iteration.
         """
         if not self.redis:
             return
         
+        now = time.monotonic()
+        if now - self._last_heartbeat < self._heartbeat_interval:
+            return
+        self._last_heartbeat = now
+        
         try:
-            heartbeat_key = f"agent:heartbeat:{self.name}"
-            heartbeat_data = {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "status": "running" if self.running else "stopped",
-                "error_count": self._error_count
-            }
-            
-            # Use SETEX to set key with TTL in one atomic operation
-            self.redis.setex(
-                heartbeat_key,
-                self._heartbeat_ttl,
-                str(heartbeat_data)  # Redis stores as string
+            # Status and error count rarely change: serialize the payload once
+            # per state and only splice the timestamp in on each heartbeat
+            state = (self.running, self._error_count)
+            if self._heartbeat_template[0] != state:
+                self._heartbeat_template = (state, dumps({
+                    "timestamp": _HEARTBEAT_TS_SLOT,
+                    "status": "running" if self.running else "stopped",
+                    "error_count": self._error_count
+                }))
+            payload = self._heartbeat_template[1].replace(
+                _HEARTBEAT_TS_SLOT_JSON, b'"' + self._utc_now_iso().encode() + b'"'
             )
             
+            # Both writes in one round trip
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(REDIS_KEY_HEARTBEATS, self.name, payload)
+            pipe.zadd(REDIS_KEY_HEARTBEATS_TS, {self.name: time.time()})
+            pipe.execute()
+            
         except Exception as e:
             self.logger.warning(f"Failed to publish heartbeat: {e}")
     
@@ -165,20 +250,25 @@ class BaseAgent(ABC):
         Internal main loop with error handling.
         
         Continuously calls process() while running=True.
-        Implements exponential backoff on errors.
+        Implements decorrelated-jitter backoff on errors, so agents that fail
+        together (e.g. a Redis blip) do not all retry at the same instants.
         """
         self.logger.info(f"Agent '{self.name}' entering main loop")
         
         while self.running:
+            busy = False
             try:
                 # Execute agent logic
+                started = time.perf_counter()
                 await self.process()
+                busy = time.perf_counter() - started < BUSY_PROCESS_SECONDS
                 
                 # Update activity timestamp
-                self._last_activity = datetime.now(timezone.utc)
+                self._last_activity_mono = time.monotonic()
                 
                 # Reset error count on success
                 self._error_count = 0
+                self._backoff = self._backoff_base
                 
                 # Publish heartbeat
                 self._publish_heartbeat()
@@ -204,16 +294,67 @@ class BaseAgent(ABC):
                     self.running = False
                     break
                 
-                # Backoff before retry (exponential with configurable max)
-                backoff_seconds = min(self._backoff_base ** self._error_count, self._backoff_max)
-                self.logger.info(f"Backing off for {backoff_seconds}s before retry")
-                await asyncio.sleep(backoff_seconds)
+                # Backoff before retry (decorrelated jitter with configurable max)
+                self._backoff = min(
+                    self._backoff_max,
+                    random.uniform(self._backoff_base, self._backoff * 3)
+                )
+                self.logger.info(f"Backing off for {self._backoff:.2f}s before retry")
+                await asyncio.sleep(self._backoff)
             
-            # Small yield to event loop
-            await asyncio.sleep(0.1)
+            if busy:
+                # process() returned without waiting: throttle so it cannot spin
+                if not self._warned_busy_loop:
+                    self.logger.warning(
+                        f"Agent '{self.name}' process() returned without awaiting; "
+                        f"add a sleep to control loop frequency"
+                    )
+                    self._warned_busy_loop = True
+                await asyncio.sleep(BUSY_LOOP_PAUSE_SECONDS)
+            else:
+                # Pure yield to event loop (process() sets its own cadence)
+                await asyncio.sleep(0)
         
         self.logger.info(f"Agent '{self.name}' process loop exited")
     
     def __repr__(self) -> str:
         """String representation of agent."""
         return f"{self.__class__.__name__}(name='{self.name}', running={self.running})"
+
+
+async def run_agents(agents: List[BaseAgent]):
+    """
+    Start ``agents`` concurrently and run them until all loops exit.
+    
+    Startup and loops share one TaskGroup: cancelling the caller cancels
+    every agent, and an agent that fails to start (or an error escaping a
+    loop) cancels the rest and is raised in an ExceptionGroup.
+    """
+    async with asyncio.TaskGroup() as tg:
+        for agent in agents:
+            tg.create_task(agent.start(tg), name=f"agent.{agent.name}.start")
+
+
+def prune_stale_agents(redis_client: redis.Redis, max_age_seconds: float = HEARTBEAT_TTL_SECONDS) -> List[str]:
+    """
+    Remove agents whose last heartbeat is older than ``max_age_seconds``.
+    
+    Heartbeats carry no per-key TTL, so an agent that dies without stop()
+    would stay in the heartbeat hash and sorted set forever. The
+    orchestrator's maintenance loop calls this to drop them.
+    
+    Args:
+        redis_client: Redis client
+        max_age_seconds: Heartbeat age after which an agent is considered dead
+        
+    Returns:
+        List of pruned agent names
+    """
+    cutoff = f"({time.time() - max_age_seconds}"
+    stale = list(redis_client.zrangebyscore(REDIS_KEY_HEARTBEATS_TS, "-inf", cutoff))
+    if stale:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zremrangebyscore(REDIS_KEY_HEARTBEATS_TS, "-inf", cutoff)
+        pipe.hdel(REDIS_KEY_HEARTBEATS, *stale)
+        pipe.execute()
+    return [name.decode() if isinstance(name, bytes) else name for name in stale]
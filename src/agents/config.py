@@ -5,14 +5,25 @@ Provides utilities for loading and validating agent configuration from
 YAML files with environment variable overrides.
 """
 
+import copy
+import re
 import yaml
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when available (much faster than the pure Python one)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# ${VAR_NAME} references, anywhere inside a string
+_ENV_RE = re.compile(r"\$\{([^}]+)\}")
+
+# Parsed YAML (before env substitution) keyed by path -> ((mtime_ns, size), config)
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """
@@ -36,17 +47,27 @@ def load_config(config_path: str) -> Dict[str, Any]:
     """
     config_file = Path(config_path)
     
-    if not config_file.exists():
-        raise FileNotFoundError(f"Config file not found: {config_path}")
+    try:
+        st = config_file.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_path}") from None
     
     logger.info(f"Loading configuration from: {config_path}")
     
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        # Reuse the parsed tree while the file is unchanged
+        key = str(config_file)
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        cached = _CONFIG_CACHE.get(key)
+        if cached and cached[0] == fingerprint:
+            parsed = cached[1]
+        else:
+            with open(config_file, 'rb') as f:
+                parsed = yaml.load(f, Loader=_YAML_LOADER)
+            _CONFIG_CACHE[key] = (fingerprint, parsed)
         
-        if config is None:
-            config = {}
+        # Callers get their own copy (substitution below edits it in place)
+        config = copy.deepcopy(parsed) if parsed is not None else {}
         
         # Process environment variable substitutions
         config = _substitute_env_vars(config)
@@ -61,7 +82,12 @@ def load_config(config_path: str) -> Dict[str, Any]:
 
 def _substitute_env_vars(config: Any) -> Any:
     """
-    Recursively substitute ${VAR_NAME} with environment variables.
+    Substitute ${VAR_NAME} references with environment variables.
+    
+    Walks the tree iteratively and replaces matching strings in place, so
+    no containers are copied and nesting depth does not grow the stack.
+    The config passed in comes straight from yaml.safe_load and is owned
+    by the caller.
     
     Args:
         config: Configuration value (dict, list, or scalar)
@@ -69,31 +95,50 @@ def _substitute_env_vars(config: Any) -> Any:
     Returns:
         Configuration with environment variables substituted
     """
-    if isinstance(config, dict):
-        return {k: _substitute_env_vars(v) for k, v in config.items()}
-    
-    elif isinstance(config, list):
-        return [_substitute_env_vars(item) for item in config]
-    
-    elif isinstance(config, str):
-        # Check for ${VAR_NAME} pattern
-        if config.startswith('${') and config.endswith('}'):
-            var_name = config[2:-1]
-            value = os.getenv(var_name)
-            
-            if value is None:
-                logger.warning(
-                    f"Environment variable '{var_name}' not set, "
-                    f"using literal value '{config}'"
-                )
-                return config
-            
-            return value
-        
-        return config
+    if isinstance(config, str):
+        return _resolve_env_var(config)
     
-    else:
+    if not isinstance(config, (dict, list)):
         return config
+    
+    stack = [config]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                stack.append(value)
+            elif isinstance(value, str) and "${" in value:
+                # Replacing a value does not resize the container, safe mid-iteration
+                container[key] = _resolve_env_var(value)
+    
+    return config
+
+
+def _resolve_env_var(value: str) -> str:
+    """
+    Expand every ${VAR_NAME} reference in ``value``.
+    
+    References may be embedded (e.g. "redis://${REDIS_HOST}:6379").
+    Unset variables are left as the literal reference.
+    """
+    if "${" not in value:
+        return value
+    return _ENV_RE.sub(_env_replacement, value)
+
+
+def _env_replacement(match: re.Match) -> str:
+    var_name = match.group(1)
+    env_value = os.getenv(var_name)
+    
+    if env_value is None:
+        logger.warning(
+            f"Environment variable '{var_name}' not set, "
+            f"using literal value '{match.group(0)}'"
+        )
+        return match.group(0)
+    
+    return env_value
 
 
 def get_agent_config(
@@ -104,6 +149,11 @@ def get_agent_config(
     """
     Get configuration for a specific agent with defaults.
     
+    Always builds a new dict from the current contents of ``config``: the
+    caller may modify it freely, and later changes to ``config`` are seen
+    by the next call. The merge is a shallow copy, cheap enough that it is
+    not cached.
+    
     Args:
         config: Full configuration dictionary
         agent_name: Name of agent to get config for
@@ -120,15 +170,10 @@ def get_agent_config(
         ...     defaults={"interval_seconds": 300}
         ... )
     """
-    agent_config = config.get(agent_name, {})
-    
-    if defaults:
-        # Merge with defaults (config overrides defaults)
-        merged = defaults.copy()
-        merged.update(agent_config)
-        return merged
-    
-    return agent_config
+    # Config overrides defaults
+    merged = dict(defaults) if defaults else {}
+    merged.update(config.get(agent_name, {}))
+    return merged
 
 
 def validate_required_keys(config: Dict[str, Any], required_keys: list[str]):
@@ -1,13 +1,32 @@
-"""Agentes LLM disponibles."""
-
-from .claude_agent import ClaudeAgent
-from .claude_cli_agent import ClaudeCliAgent
-from .claude_cli_agent_v2 import ClaudeCliAgent as ClaudeCliAgentV2
-from .competition_agent import CompetitionClaudeAgent
-
-__all__ = [
-    'ClaudeAgent',
-    'ClaudeCliAgent',
-    'ClaudeCliAgentV2',
-    'CompetitionClaudeAgent',
-]
+"""
+Agentes LLM disponibles.
+
+Las clases se importan bajo demanda: importar un agente concreto (p.ej.
+ClaudeAgent y el SDK de anthropic) no arrastra la carga de los demás.
+"""
+
+from importlib import import_module
+
+# nombre exportado -> (submódulo, atributo)
+_EXPORTS = {
+    'ClaudeAgent': ('.claude_agent', 'ClaudeAgent'),
+    'ClaudeCliAgent': ('.claude_cli_agent', 'ClaudeCliAgent'),
+    'ClaudeCliAgentV2': ('.claude_cli_agent_v2', 'ClaudeCliAgent'),
+    'CompetitionClaudeAgent': ('.competition_agent', 'CompetitionClaudeAgent'),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,16 +4,27 @@ Implementación del agente usando Claude (Anthropic).
 
 import os
 import json
+import asyncio
+import dataclasses
+import hashlib
 import logging
+import re
 import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Optional, Any
+from importlib.util import find_spec
+from typing import Optional, Any, List
 
 try:
     import anthropic
+    import httpx
 except ImportError:
     anthropic = None
 
+# HTTP/2 (multiplexa las vueltas del tool loop en una conexión) requiere h2
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
 from src.agents.llm.interfaces import (
     LLMAgent,
     AgentContext,
@@ -25,15 +36,105 @@ from src.strategies.interfaces import Signal, SignalDirection, MarketRegime
 from src.agents.llm.prompts import CONSERVATIVE_PROMPT, MODERATE_PROMPT
 from src.agents.llm.web_search import WebSearchClient
 from src.agents.llm.cost_tracker import get_cost_tracker
+from src.shared.json_utils import loads, find_json_span, JSONDecodeError
 
 logger = logging.getLogger(__name__)
 
+# Prompt por nivel de autonomía (experimental usa moderate por ahora)
+SYSTEM_PROMPTS = {
+    AutonomyLevel.CONSERVATIVE: CONSERVATIVE_PROMPT,
+    AutonomyLevel.MODERATE: MODERATE_PROMPT,
+    AutonomyLevel.EXPERIMENTAL: MODERATE_PROMPT,
+}
+
+# Mismos prompts como bloques de system listos para enviar. Prompt caching:
+# el breakpoint al final del system prompt cachea el prefijo estático
+# (tools + system) entre llamadas y vueltas del tool loop
+_SYSTEM_BLOCKS = {
+    level: [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
+    for level, prompt in SYSTEM_PROMPTS.items()
+}
+
+VOLATILE_SKIP_REASONING = "Market regime is VOLATILE. Trading skipped for safety."
+
+# Bloque ```json ... ``` en la respuesta del modelo
+_JSON_BLOCK_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+
+def _clock_now() -> tuple:
+    """Una única lectura del reloj: (segundos epoch, datetime UTC)."""
+    now_ns = time.time_ns()
+    now_s = now_ns // 1_000_000_000
+    return now_s, datetime.fromtimestamp(now_ns / 1e9, timezone.utc)
+
+
+DECISION_TOOL_NAME = "submit_decision"
+FORCE_DECISION_TOOL = {"type": "tool", "name": DECISION_TOOL_NAME}
+SUBMIT_DECISION_REMINDER = f"Submit your final decision now using the {DECISION_TOOL_NAME} tool."
+
+# Claves que identifican el JSON de decisión (frente a otros objetos que el
+# modelo pueda escribir en su razonamiento)
+_DECISION_KEYS = ("market_view", "signals")
+
+# Lookups valor -> miembro de los enums (evita Enum.__call__ por señal)
+_DIRECTION_MAP = SignalDirection._value2member_map_
+_REGIME_MAP = MarketRegime._value2member_map_
+_MV_MAP = MarketView._value2member_map_
+
+
+class _JsonObjectScanner:
+    """
+    Detecta objetos JSON de primer nivel completos en un texto que llega
+    por fragmentos (streaming), siguiendo la profundidad de llaves y
+    teniendo en cuenta strings y escapes.
+    """
+    
+    def __init__(self):
+        self._buf: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, chunk: str) -> List[str]:
+        """Consume ``chunk`` y devuelve los objetos que se han cerrado en él."""
+        completed = []
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._buf = [ch]
+                continue
+            
+            self._buf.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.append("".join(self._buf))
+        return completed
+
 
 class ClaudeAgent(LLMAgent):
     """
     Agente que usa modelos Claude de Anthropic.
     """
     
+    # Campos constantes de las decisiones de error
+    _ERROR_BASE = {"market_view": MarketView.UNCERTAIN, "confidence": 0.0}
+    
+    # Token bucket para los logs de error (ráfaga de 5, luego 1 cada 10s)
+    ERROR_LOG_BURST = 5
+    ERROR_LOG_INTERVAL_SECONDS = 10.0
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -42,6 +143,8 @@ class ClaudeAgent(LLMAgent):
         temperature: float = 0.0,
         default_autonomy: AutonomyLevel = AutonomyLevel.CONSERVATIVE,
         timeout_seconds: float = 60.0,
+        decision_cache_ttl: float = 30.0,
+        decision_cache_size: int = 256,
     ):
         """
         Inicializar ClaudeAgent.
@@ -53,6 +156,9 @@ class ClaudeAgent(LLMAgent):
             temperature: Creatividad (0.0 para trading)
             default_autonomy: Nivel de autonomía por defecto
             timeout_seconds: Timeout para llamadas a API
+            decision_cache_ttl: Segundos que se reutiliza una decisión para un
+                contexto idéntico (0 desactiva la caché)
+            decision_cache_size: Máximo de decisiones cacheadas (LRU)
         """
         if not anthropic:
             raise ImportError("anthropic package not installed. Run 'pip install anthropic'")
@@ -61,13 +167,35 @@ class ClaudeAgent(LLMAgent):
         if not self._api_key:
             raise ValueError("ANTHROPIC_API_KEY not found")
             
-        self.client = anthropic.AsyncAnthropic(api_key=self._api_key)
+        # Cliente HTTP con keep-alive: llamadas consecutivas reutilizan la
+        # conexión TLS en lugar de repetir el handshake
+        http_client = anthropic.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=90.0,
+            ),
+            http2=HTTP2_AVAILABLE,
+        )
+        self.client = anthropic.AsyncAnthropic(api_key=self._api_key, http_client=http_client)
         self._model = model
         self._max_tokens = max_tokens
         self._temperature = temperature
         self._default_autonomy = default_autonomy
         self._timeout = timeout_seconds
         
+        # Caché de decisiones: hash del contexto -> (expira_en, decisión)
+        self._decision_cache_ttl = decision_cache_ttl
+        self._decision_cache_size = decision_cache_size
+        self._decision_cache: "OrderedDict[str, tuple[float, AgentDecision]]" = OrderedDict()
+        # Decisiones en curso por clave de contexto (single-flight)
+        self._inflight: dict[str, asyncio.Future] = {}
+        
+        # Estado del rate limit de logs de error
+        self._error_log_tokens = float(self.ERROR_LOG_BURST)
+        self._error_log_refill_at = time.monotonic()
+        self._suppressed_errors = 0
+        
         # Tools initialization
         self.search_client = WebSearchClient()
         self.cost_tracker = get_cost_tracker()
@@ -92,6 +220,52 @@ class ClaudeAgent(LLMAgent):
             }
         }
         
+        # Tool de salida: la decisión llega como tool_use.input ya estructurado
+        self.DECISION_TOOL = {
+            "name": DECISION_TOOL_NAME,
+            "description": "Submit your final trading decision. Call this exactly once, when your analysis is complete.",
+            "input_schema": {
+                "type": "object",
+                "properties": {
+                    "market_view": {
+                        "type": "string",
+                        "enum": [mv.value for mv in MarketView]
+                    },
+                    "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+                    "reasoning": {"type": "string"},
+                    "signals": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "symbol": {"type": "string"},
+                                "direction": {
+                                    "type": "string",
+                                    "enum": [d.value for d in SignalDirection]
+                                },
+                                "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+                                "entry_price": {"type": "number"},
+                                "stop_loss": {"type": "number"},
+                                "take_profit": {"type": "number"},
+                                "size_suggestion": {"type": "number"},
+                                "reasoning": {"type": "string"}
+                            },
+                            "required": ["symbol", "direction", "confidence"]
+                        }
+                    }
+                },
+                "required": ["market_view", "confidence", "reasoning", "signals"]
+            }
+        }
+        
+        # Listas de tools precalculadas (no se reconstruyen en cada vuelta)
+        self._tools_active = [self.WEB_SEARCH_TOOL, self.DECISION_TOOL]
+        self._tools_final = [self.DECISION_TOOL]
+        
+    async def close(self):
+        """Cierra el cliente HTTP (libera las conexiones del pool)."""
+        await self.client.close()
+    
     @property
     def agent_id(self) -> str:
         return f"claude_agent_{self._model}"
@@ -104,94 +278,188 @@ class ClaudeAgent(LLMAgent):
         """
         Toma una decisión usando Claude.
         """
-        start_time = time.time()
-        
         # 0. Chequeo de seguridad: No operar en régimen VOLATILE a menos que EXPERIMENTAL
+        #    (antes de cualquier otro trabajo; una sola lectura de reloj)
         if context.regime.regime == "VOLATILE" and context.autonomy_level != AutonomyLevel.EXPERIMENTAL:
             logger.info("Skipping Claude call due to VOLATILE regime")
+            now_s, now_dt = _clock_now()
             return AgentDecision(
-                decision_id=f"dec_skip_{int(time.time())}",
-                timestamp=datetime.now(timezone.utc),
+                decision_id=f"dec_skip_{now_s}",
+                timestamp=now_dt,
                 market_view=MarketView.UNCERTAIN,
                 confidence=0.0,
-                reasoning="Market regime is VOLATILE. Trading skipped for safety.",
+                reasoning=VOLATILE_SKIP_REASONING,
                 signals=[],
                 model_used=self._model,
                 tokens_used=0,
                 execution_time_ms=0
             )
         
-        # 1. Seleccionar Prompt según autonomía
-        system_prompt = self._get_system_prompt(context.autonomy_level)
+        user_text = context.to_prompt_text()
+        
+        # Contexto idéntico a uno reciente: reutilizar la decisión sin llamar a la API
+        cache_key = self._decision_cache_key(user_text)
+        cached = self._get_cached_decision(cache_key)
+        if cached is not None:
+            logger.info("Reusing cached Claude decision for identical context")
+            return cached
+        
+        # Single-flight: llamadas concurrentes con el mismo contexto esperan
+        # a la misma petición en curso en lugar de lanzar otra
+        # shield: cancelar a un llamante no cancela la petición compartida
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._decide_and_cache(context, user_text, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+            return await asyncio.shield(task)
+        
+        # Quien se une recibe una copia con ids nuevos, como en la caché
+        logger.info("Joining in-flight Claude decision for identical context")
+        return self._clone_decision(await asyncio.shield(task))
+    
+    async def _decide_and_cache(self, context: AgentContext, user_text: str, cache_key: str) -> AgentDecision:
+        """Ejecuta la decisión y la guarda en caché si no es un error."""
+        decision = await self._decide_uncached(context, user_text)
+        if not decision.decision_id.startswith("error_"):
+            self._store_decision(cache_key, decision)
+        return decision
+    
+    async def _decide_uncached(self, context: AgentContext, user_text: str) -> AgentDecision:
+        """Tool loop completo contra la API para un contexto."""
+        start_time = time.perf_counter()
+        
+        # 1. Seleccionar Prompt según autonomía (bloques ya preparados)
+        system_blocks = self._get_system_blocks(context.autonomy_level)
         
         # 2. Preparar historial de mensajes
         messages = [
-            {"role": "user", "content": context.to_prompt_text()}
+            {"role": "user", "content": user_text}
         ]
         
         search_count = 0
         MAX_SEARCHES = 3  # DOC-07 limit
+        MAX_LOOPS = 5     # Tope de llamadas a la API por decisión
+        force_decision = False
+        # Tokens acumulados de todas las llamadas del tool loop
+        total_tokens = 0
         
         try:
-            while True:
-                # 3. Llamada a la API
-                logger.info(f"Calling Claude ({self._model}) [Loop {search_count}]")
-                logger.debug(f"FULL PROMPT:\n{json.dumps(messages, indent=2, default=str)}")
+            for loop_i in range(MAX_LOOPS):
+                # 3. Llamada a la API (la última vuelta fuerza la decisión)
+                if loop_i == MAX_LOOPS - 1:
+                    force_decision = True
+                logger.info(f"Calling Claude ({self._model}) [Loop {loop_i}, searches {search_count}]")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("FULL PROMPT:\n%s", json.dumps(messages, indent=2, default=str))
                 
-                # Check if we should disable tools (reached limit)
-                tools = [self.WEB_SEARCH_TOOL] if search_count < MAX_SEARCHES else []
+                # Al alcanzar el límite de búsquedas solo queda la tool de
+                # decisión, y se fuerza su uso en este último turno
+                if search_count >= MAX_SEARCHES:
+                    force_decision = True
+                if force_decision:
+                    tools = self._tools_final
+                    tool_choice = FORCE_DECISION_TOOL
+                else:
+                    tools = self._tools_active
+                    tool_choice = None
                 
-                response = await self.client.messages.create(
-                    model=self._model,
-                    max_tokens=self._max_tokens,
-                    temperature=self._temperature,
-                    system=system_prompt,
-                    messages=messages,
-                    tools=tools,
-                    timeout=self._timeout
+                response, early_json = await self._stream_response(
+                    system_blocks, messages, tools, tool_choice
                 )
                 
                 # Track Cost
-                input_tokens = response.usage.input_tokens
-                output_tokens = response.usage.output_tokens
+                usage = response.usage
+                input_tokens, output_tokens = usage.input_tokens, usage.output_tokens
+                total_tokens += input_tokens + output_tokens
                 self.cost_tracker.track_llm_call(
                     self.agent_id, self._model, input_tokens, output_tokens, 
                     context=f"Loop {search_count}"
                 )
                 
+                # Decisión completa recibida antes de terminar el stream
+                if early_json is not None:
+                    execution_time = int((time.perf_counter() - start_time) * 1000)
+                    return self._create_decision(
+                        early_json,
+                        context,
+                        execution_time,
+                        total_tokens
+                    )
+                
                 # Process response
                 stop_reason = response.stop_reason
                 content_blocks = response.content
-                logger.debug(f"CLAUDE RESPONSE:\n{content_blocks}")
+                # %r diferido: el repr de los bloques solo se construye si se emite
+                logger.debug("CLAUDE RESPONSE:\n%r", content_blocks)
                 
                 # Add assistant response to history
-                # Convert blocks to simple list of dicts for message history
-                # We reuse the raw 'content' list from the response object which is compatible
-                messages.append({"role": "assistant", "content": content_blocks})
+                # Convertidos una vez a dicts planos: las siguientes vueltas
+                # re-envían el historial sin volver a serializar objetos del SDK
+                messages.append({"role": "assistant", "content": self._content_to_params(content_blocks)})
                 
                 # Check for Tool Use
                 tool_uses = [b for b in content_blocks if b.type == "tool_use"]
                 
+                # Decisión estructurada vía submit_decision: sin parseo de texto
+                decision_use = next((tu for tu in tool_uses if tu.name == DECISION_TOOL_NAME), None)
+                if decision_use is not None:
+                    execution_time = int((time.perf_counter() - start_time) * 1000)
+                    return self._create_decision(
+                        decision_use.input,
+                        context,
+                        execution_time,
+                        total_tokens
+                    )
+                
                 if tool_uses:
                     if search_count >= MAX_SEARCHES:
-                         # Should ideally not happen if we passed empty tools, but safety check
-                        logger.warning("Max searches reached, forcing stop.")
-                        break
+                        # No debería ocurrir (solo se ofrece submit_decision), pero
+                        # cada tool_use necesita su tool_result: rechazarlos y
+                        # forzar la decisión en la siguiente vuelta
+                        logger.warning("Max searches reached, forcing decision.")
+                        messages.append({"role": "user", "content": [
+                            {
+                                "type": "tool_result",
+                                "tool_use_id": tu.id,
+                                "content": "Search limit reached. Submit your decision now.",
+                                "is_error": True
+                            }
+                            for tu in tool_uses
+                        ]})
+                        force_decision = True
+                        continue
                         
-                    # Execute tools
+                    # Execute tools: las búsquedas del mismo turno van en paralelo
+                    search_uses = [tu for tu in tool_uses if tu.name == "web_search"]
                     tool_results = []
-                    for tool_use in tool_uses:
-                        if tool_use.name == "web_search":
-                            query = tool_use.input.get("query")
-                            logger.info(f"Executing Web Search: {query}")
-                            
-                            # Track search cost
-                            self.cost_tracker.track_search(self.agent_id, 1, context=query)
-                            
-                            # Execute search
-                            results = await self.search_client.search(query)
-                            
+                    if search_uses:
+                        queries = [tu.input.get("query") for tu in search_uses]
+                        logger.info(f"Executing {len(queries)} Web Search(es): {queries}")
+                        
+                        # Track search cost (un único registro por turno)
+                        self.cost_tracker.track_search(
+                            self.agent_id, len(queries), context="; ".join(map(str, queries))
+                        )
+                        
+                        # Execute searches
+                        results_list = await asyncio.gather(
+                            *(self.search_client.search(q) for q in queries),
+                            return_exceptions=True
+                        )
+                        
+                        for tool_use, results in zip(search_uses, results_list):
                             # Format result
+                            if isinstance(results, Exception):
+                                logger.warning(f"Web search failed for {tool_use.input.get('query')}: {results}")
+                                tool_results.append({
+                                    "type": "tool_result",
+                                    "tool_use_id": tool_use.id,
+                                    "content": f"Search failed: {results}",
+                                    "is_error": True
+                                })
+                                continue
+                            
                             result_text = "No results found."
                             if results:
                                 result_text = "\n".join([r.to_string() for r in results])
@@ -201,7 +469,7 @@ class ClaudeAgent(LLMAgent):
                                 "tool_use_id": tool_use.id,
                                 "content": result_text
                             })
-                            search_count += 1
+                        search_count += len(queries)
                             
                     # Add tool results to history
                     if tool_results:
@@ -222,10 +490,7 @@ class ClaudeAgent(LLMAgent):
                     try:
                         parsed_json = self._extract_json(text_content)
                         if parsed_json:
-                            execution_time = int((time.time() - start_time) * 1000)
-                            # We estimate total tokens loosely as sum of last call (accurate enough for now)
-                            total_tokens = response.usage.input_tokens + response.usage.output_tokens
-                            
+                            execution_time = int((time.perf_counter() - start_time) * 1000)
                             return self._create_decision(
                                 parsed_json, 
                                 context, 
@@ -236,48 +501,220 @@ class ClaudeAgent(LLMAgent):
                          # If we can't parse JSON but stopped, maybe it just chatted?
                          pass
                 
-                # If we are here, we might need to prompt it to finalize?
-                # Or maybe it outputted text without JSON.
+                # Texto sin JSON válido: pedir la decisión por la tool
+                # (una sola vez) antes de recurrir al parseo forzado
+                if stop_reason == "end_turn" and not tool_uses and not force_decision:
+                    logger.info("No decision JSON in response, requesting submit_decision")
+                    messages.append({"role": "user", "content": SUBMIT_DECISION_REMINDER})
+                    force_decision = True
+                    continue
+                
                 if stop_reason == "end_turn" and not tool_uses:
                      # Force JSON extraction from what we have
                      parsed_json = self._extract_json(text_content)
-                     execution_time = int((time.time() - start_time) * 1000)
+                     execution_time = int((time.perf_counter() - start_time) * 1000)
                      return self._create_decision(
                         parsed_json, 
                         context, 
                         execution_time,
-                        response.usage.output_tokens + response.usage.input_tokens
+                        total_tokens
                     )
             
+            # Sin decisión tras MAX_LOOPS llamadas: mismo camino que un error
+            raise RuntimeError(f"No decision after {MAX_LOOPS} Claude calls")
+            
         except Exception as e:
-            logger.error(f"Error in ClaudeAgent.decide: {e}")
+            self._log_decide_error(e)
+            now_s, now_dt = _clock_now()
             # Retornar decisión vacía/error
             return AgentDecision(
-                decision_id=f"error_{int(time.time())}",
-                timestamp=datetime.now(timezone.utc),
-                market_view=MarketView.UNCERTAIN,
-                confidence=0.0,
+                decision_id=f"error_{now_s}",
+                timestamp=now_dt,
                 reasoning=f"ERROR: {str(e)}",
                 signals=[],
                 model_used=self._model,
-                tokens_used=0,
-                execution_time_ms=int((time.time() - start_time) * 1000)
+                tokens_used=total_tokens,
+                execution_time_ms=int((time.perf_counter() - start_time) * 1000),
+                **self._ERROR_BASE
+            )
+    
+    def _log_decide_error(self, error: Exception):
+        """
+        Loguea un error de decide() con rate limit (token bucket), para que
+        una caída de la API no inunde los logs. Los errores descartados se
+        cuentan y se reportan en el siguiente log emitido.
+        """
+        now = time.monotonic()
+        self._error_log_tokens = min(
+            float(self.ERROR_LOG_BURST),
+            self._error_log_tokens + (now - self._error_log_refill_at) / self.ERROR_LOG_INTERVAL_SECONDS
+        )
+        self._error_log_refill_at = now
+        
+        if self._error_log_tokens < 1.0:
+            self._suppressed_errors += 1
+            return
+        
+        self._error_log_tokens -= 1.0
+        if self._suppressed_errors:
+            logger.error(
+                "Error in ClaudeAgent.decide: %s (%d similar errors suppressed)",
+                error, self._suppressed_errors
+            )
+            self._suppressed_errors = 0
+        else:
+            logger.error("Error in ClaudeAgent.decide: %s", error)
+    
+    def _decision_cache_key(self, user_text: str) -> str:
+        """
+        Hash del prompt de usuario. La primera línea (fecha y hora) se excluye
+        para que polls consecutivos con el mismo estado compartan entrada.
+        """
+        body = user_text.partition("\n")[2]
+        return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _get_cached_decision(self, key: str) -> Optional[AgentDecision]:
+        """
+        Copia de la decisión cacheada (ver _clone_decision) o None.
+        """
+        if self._decision_cache_ttl <= 0:
+            return None
+        entry = self._decision_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, decision = entry
+        if time.monotonic() >= expires_at:
+            del self._decision_cache[key]
+            return None
+        self._decision_cache.move_to_end(key)
+        return self._clone_decision(decision)
+    
+    @staticmethod
+    def _clone_decision(decision: AgentDecision) -> AgentDecision:
+        """
+        Copia de una decisión ya emitida, para reutilizarla.
+        
+        La copia lleva id y timestamp nuevos, y también sus señales: cada una
+        con signal_id y created_at nuevos (y expires_at desplazado para
+        conservar su vigencia), para que no se reemitan ids duplicados ni
+        timestamps viejos. El id conserva el prefijo del original (dec_, error_).
+        """
+        now_s, now_dt = _clock_now()
+        signals = [
+            dataclasses.replace(
+                sig,
+                signal_id=str(uuid.uuid4()),
+                created_at=now_dt,
+                expires_at=now_dt + (sig.expires_at - sig.created_at) if sig.expires_at else None,
             )
+            for sig in decision.signals
+        ]
+        prefix = decision.decision_id.split("_", 1)[0]
+        return dataclasses.replace(
+            decision,
+            decision_id=f"{prefix}_{now_s}_{uuid.uuid4().hex[:8]}",
+            timestamp=now_dt,
+            signals=signals,
+            tokens_used=0,
+            execution_time_ms=0
+        )
+    
+    def _store_decision(self, key: str, decision: AgentDecision):
+        """Guarda una decisión en la caché LRU con su TTL."""
+        if self._decision_cache_ttl <= 0:
+            return
+        self._decision_cache[key] = (time.monotonic() + self._decision_cache_ttl, decision)
+        self._decision_cache.move_to_end(key)
+        while len(self._decision_cache) > self._decision_cache_size:
+            self._decision_cache.popitem(last=False)
+    
+    async def _stream_response(
+        self,
+        system: list,
+        messages: list,
+        tools: list,
+        tool_choice: Optional[dict] = None
+    ):
+        """
+        Llama a Claude en streaming.
+        
+        Devuelve (mensaje, decision_json). En cuanto el texto emitido contiene
+        un objeto JSON de decisión completo (con market_view y signals, y sin
+        ningún bloque tool_use empezado) se corta el stream, sin esperar al
+        resto de la generación:
+        decision_json es el dict parseado y mensaje el snapshot parcial. Si
+        no, se espera al mensaje final y decision_json es None.
+        """
+        scanner = _JsonObjectScanner()
+        tool_started = False
+        emitted_chars = 0
+        
+        async with self.client.messages.stream(
+            model=self._model,
+            max_tokens=self._max_tokens,
+            temperature=self._temperature,
+            system=system,
+            messages=messages,
+            tools=tools,
+            tool_choice=tool_choice if tool_choice is not None else anthropic.NOT_GIVEN,
+            timeout=self._timeout
+        ) as stream:
+            async for event in stream:
+                if event.type == "content_block_start" and event.content_block.type == "tool_use":
+                    tool_started = True
+                elif event.type == "text" and not tool_started:
+                    emitted_chars += len(event.text)
+                    for candidate in scanner.feed(event.text):
+                        try:
+                            parsed = self._extract_json(candidate)
+                        except ValueError:
+                            continue
+                        # Otros objetos (p.ej. {"symbol": ...} en el razonamiento)
+                        # no son la decisión: seguir leyendo
+                        if not isinstance(parsed, dict) or not all(k in parsed for k in _DECISION_KEYS):
+                            continue
+                        message = stream.current_message_snapshot
+                        # El uso de salida solo se reporta al final del stream:
+                        # estimarlo (~4 caracteres/token) para el cost tracker
+                        message.usage.output_tokens = max(
+                            message.usage.output_tokens, emitted_chars // 4
+                        )
+                        return message, parsed
+            
+            return await stream.get_final_message(), None
+    
+    @staticmethod
+    def _content_to_params(content_blocks: list) -> list:
+        """Bloques de respuesta del SDK -> dicts de parámetros para el historial."""
+        params = []
+        for block in content_blocks:
+            if block.type == "text":
+                params.append({"type": "text", "text": block.text})
+            elif block.type == "tool_use":
+                params.append({"type": "tool_use", "id": block.id, "name": block.name, "input": block.input})
+            else:
+                params.append(block.model_dump(exclude_none=True))
+        return params
     
     def _get_system_prompt(self, autonomy: AutonomyLevel) -> str:
         """Selecciona el prompt adecuado."""
-        if autonomy == AutonomyLevel.CONSERVATIVE:
-            return CONSERVATIVE_PROMPT
-        elif autonomy == AutonomyLevel.MODERATE:
-            return MODERATE_PROMPT
-        # Fallback to moderate for experimental for now
-        return MODERATE_PROMPT
+        return SYSTEM_PROMPTS.get(autonomy, MODERATE_PROMPT)
+    
+    def _get_system_blocks(self, autonomy: AutonomyLevel) -> list:
+        """System prompt en formato de bloques, con breakpoint de caché."""
+        return _SYSTEM_BLOCKS.get(autonomy, _SYSTEM_BLOCKS[AutonomyLevel.MODERATE])
     
     def _extract_json(self, text: str) -> dict:
         """Extrae y parsea JSON de la respuesta."""
         text = text.strip()
         
         def try_parse(s):
+            try:
+                return loads(s)
+            except JSONDecodeError:
+                pass
+            # Fallback no estricto: el modelo a veces incluye saltos de línea
+            # literales dentro de strings, que orjson rechaza
             try:
                 return json.loads(s, strict=False)
             except json.JSONDecodeError:
@@ -287,19 +724,23 @@ class ClaudeAgent(LLMAgent):
         res = try_parse(text)
         if res: return res
 
-        # 2. Buscar bloque json ```json ... ```
-        import re
-        match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
-        if match:
-            res = try_parse(match.group(1))
-            if res: return res
+        # 2. Buscar bloque json ```json ... ``` (innecesario si ya empieza por {)
+        if not text.startswith("{"):
+            match = _JSON_BLOCK_RE.search(text)
+            if match:
+                res = try_parse(match.group(1))
+                if res: return res
 
-        # 3. Buscar primer { y último }
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1:
-            res = try_parse(text[start:end+1])
+        # 3. Objetos {...} balanceados, de izquierda a derecha
+        pos = 0
+        while True:
+            span = find_json_span(text, pos)
+            if span is None:
+                break
+            start, end = span
+            res = try_parse(text[start:end + 1])
             if res: return res
+            pos = start + 1
             
         raise ValueError(f"No valid JSON found in response. Content start: {text[:50]}...")
             
@@ -312,20 +753,25 @@ class ClaudeAgent(LLMAgent):
     ) -> AgentDecision:
         """Crea objeto AgentDecision desde dict."""
         
+        # Un único lookup del régimen por decisión
+        regime_enum = _REGIME_MAP.get(context.regime.regime)
+        
         signals = []
         for sig_data in data.get("signals", []):
             try:
+                if regime_enum is None:
+                    raise ValueError(f"unknown regime {context.regime.regime!r}")
                 # Mapear a objeto Signal
                 signal = Signal(
                     strategy_id=self.agent_id,
                     symbol=sig_data.get("symbol"),
-                    direction=SignalDirection(sig_data.get("direction")),
+                    direction=_DIRECTION_MAP[sig_data.get("direction")],
                     confidence=sig_data.get("confidence", 0.0),
                     entry_price=sig_data.get("entry_price"),
                     stop_loss=sig_data.get("stop_loss"),
                     take_profit=sig_data.get("take_profit"),
                     size_suggestion=sig_data.get("size_suggestion"),
-                    regime_at_signal=MarketRegime(context.regime.regime),
+                    regime_at_signal=regime_enum,
                     regime_confidence=context.regime.confidence,
                     reasoning=sig_data.get("reasoning", ""),
                     metadata={"autonomy": context.autonomy_level.value}
@@ -334,10 +780,11 @@ class ClaudeAgent(LLMAgent):
             except Exception as e:
                 logger.warning(f"Skipping invalid signal data: {sig_data} - {e}")
         
+        now_s, now_dt = _clock_now()
         return AgentDecision(
-            decision_id=f"dec_{int(time.time())}",
-            timestamp=datetime.now(timezone.utc),
-            market_view=MarketView(data.get("market_view", "uncertain")),
+            decision_id=f"dec_{now_s}",
+            timestamp=now_dt,
+            market_view=_MV_MAP.get(data.get("market_view", "uncertain"), MarketView.UNCERTAIN),
             confidence=data.get("confidence", 0.0),
             reasoning=data.get("reasoning", ""),
             signals=signals,
@@ -10,8 +10,10 @@ import os
 import shutil
 import time
 import platform
+import re
+from collections import deque
 from datetime import datetime, timezone
-from typing import Optional, Any, List
+from typing import Optional, List, Awaitable, Callable
 
 from src.agents.llm.interfaces import (
     LLMAgent,
@@ -22,9 +24,248 @@ from src.agents.llm.interfaces import (
 )
 from src.strategies.interfaces import Signal, SignalDirection, MarketRegime
 from src.agents.llm.prompts import CONSERVATIVE_PROMPT, MODERATE_PROMPT
+from src.shared.json_utils import loads, dumps, find_json_span, JSONDecodeError
 
 logger = logging.getLogger(__name__)
 
+# Límite del buffer de lectura de stdout (una línea JSONL completa).
+# Se mantiene el StreamReader por defecto: los transportes de pipes de
+# subprocess de asyncio solo entregan bytes vía data_received (no usan
+# BufferedProtocol.get_buffer), y el reader ya acumula en un único bytearray.
+STDOUT_LIMIT_BYTES = 1 << 20
+
+
+def _loads_lenient(text):
+    """
+    Parsea con orjson (vía json_utils) y, si falla, con json no estricto:
+    el modelo a veces incluye saltos de línea literales dentro de strings.
+    """
+    try:
+        return loads(text)
+    except JSONDecodeError:
+        return json.loads(text, strict=False)
+
+
+# Lookups valor -> miembro de los enums de señal
+_DIR_MAP = {m.value: m for m in SignalDirection}
+_REGIME_MAP = {m.value: m for m in MarketRegime}
+
+# Ejecutable y argumentos del CLI, resueltos una vez al importar (sin
+# recorrer el PATH en cada arranque de proceso)
+_CLAUDE_BIN = shutil.which("claude.cmd" if platform.system() == "Windows" else "claude") or "claude"
+_CLAUDE_ARGV = (
+    _CLAUDE_BIN,
+    "--print",
+    "--input-format", "stream-json",
+    "--output-format", "stream-json",
+    "--permission-mode", "bypassPermissions",  # Importante para no bloquear
+    "--verbose",  # Required for stream-json
+)
+_CLAUDE_CMDLINE = " ".join(_CLAUDE_ARGV)
+
+# Bloque ```json ... ``` en la respuesta del modelo
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+
+CLI_INSTRUCTIONS = "INSTRUCCIONES: Tienes acceso a herramientas (como búsqueda web). ÚSALAS si necesitas información actualizada (ej: precios, noticias). NO inventes datos. Una vez tengas la información, Responde SOLAMENTE con el objeto JSON de decisión final."
+
+# System prompt por nivel de autonomía
+SYSTEM_PROMPTS = {
+    level: CONSERVATIVE_PROMPT if level == AutonomyLevel.CONSERVATIVE else MODERATE_PROMPT
+    for level in AutonomyLevel
+}
+
+# Línea stream-json de entrada precalculada por nivel: la cabecera del mensaje
+# y el prompt fijo ya van serializados (JSON escapado, UTF-8) y por llamada
+# solo se serializa el contexto. Escapar por trozos es válido porque el
+# escape JSON es carácter a carácter.
+_MESSAGE_HEAD = b'{"type":"user","message":{"role":"user","content":'
+_MESSAGE_PREFIXES = {
+    level: _MESSAGE_HEAD + dumps(f"{prompt}\n\nCONTEXTO ACTUAL:\n")[:-1]
+    for level, prompt in SYSTEM_PROMPTS.items()
+}
+_MESSAGE_SUFFIX = dumps(f"\n\n{CLI_INSTRUCTIONS}")[1:] + b"}}\n"
+
+# Caracteres fijos del mensaje (para la estimación de tokens)
+_FIXED_PROMPT_CHARS = {
+    level: len(f"{prompt}\n\nCONTEXTO ACTUAL:\n") + len(f"\n\n{CLI_INSTRUCTIONS}")
+    for level, prompt in SYSTEM_PROMPTS.items()
+}
+
+# Mensaje de control que limpia el contexto de la sesión (reutilización)
+_CLEAR_MESSAGE = dumps({"type": "user", "message": {"role": "user", "content": "/clear"}}) + b"\n"
+
+# Inicio de los eventos de delta en la salida stream-json
+_DELTA_EVENT_PREFIX = b'{"type":"content_block_delta"'
+
+# Eventos que _send_and_wait descarta: se reconocen por prefijo, sin parsear
+# (los mensajes 'user' traen los resultados de tools, a veces grandes)
+_IGNORE_EVENT_PREFIXES = (
+    b'{"type":"ping"',
+    b'{"type":"message_start"',
+    b'{"type":"message_delta"',
+    b'{"type":"content_block_start"',
+    b'{"type":"content_block_stop"',
+    b'{"type":"system"',
+    b'{"type":"user"',
+)
+
+# Fin de turno en la salida stream-json
+_RESULT_EVENT_PREFIX = b'{"type":"result"'
+
+# Tiempo máximo para que el CLI confirme un /clear
+RESET_TIMEOUT_SECONDS = 10.0
+
+
+class ClaudeCliProcessPool:
+    """
+    Pool de procesos 'claude' CLI ya arrancados.
+    
+    El arranque del CLI (runtime Node.js incluido) queda fuera del camino
+    crítico: decide() toma un proceso caliente y, al terminar, ese proceso
+    se retira (release) y se arranca su reemplazo en segundo plano, o bien
+    se recicla (recycle): se limpia su sesión y vuelve al pool.
+    Si el pool está vacío se arranca uno en línea, de modo que los errores
+    de arranque llegan al llamante.
+    """
+    
+    def __init__(
+        self,
+        spawn: Callable[[], Awaitable[asyncio.subprocess.Process]],
+        stop: Callable[[asyncio.subprocess.Process], Awaitable[None]],
+        size: int = 2,
+        health_check_seconds: float = 30.0,
+        reuse: bool = False
+    ):
+        self._spawn = spawn
+        self._stop = stop
+        self.size = size
+        # Con reutilización, los procesos en uso cuentan para el tamaño del
+        # pool (volverán a él), así que no se arrancan reemplazos al tomarlos
+        self._reuse = reuse
+        self._in_use = 0
+        self._health_check_seconds = health_check_seconds
+        self._idle: deque = deque()
+        self._pending: set = set()
+        self._health_task: Optional[asyncio.Task] = None
+        self._closed = False
+    
+    async def acquire(self) -> asyncio.subprocess.Process:
+        """Devuelve un proceso vivo (del pool o recién arrancado)."""
+        self._ensure_health_task()
+        while self._idle:
+            proc = self._idle.popleft()
+            if proc.returncode is None:
+                self._in_use += 1
+                self._fill()
+                return proc
+            self._discard(proc)
+        self._fill()
+        proc = await self._spawn()
+        self._in_use += 1
+        return proc
+    
+    def release(self, proc: asyncio.subprocess.Process):
+        """Retira un proceso usado (parada en segundo plano) y repone el pool."""
+        self._in_use -= 1
+        self._discard(proc)
+        self._fill()
+    
+    def recycle(
+        self,
+        proc: asyncio.subprocess.Process,
+        reset: Callable[[asyncio.subprocess.Process], Awaitable[bool]]
+    ):
+        """
+        Devuelve un proceso usado al pool tras ``reset`` (en segundo plano).
+        Si el reset falla, el proceso murió o el pool ya está completo, se para.
+        """
+        self._in_use -= 1
+        self._track(asyncio.create_task(self._recycle(proc, reset), name="cli_pool.recycle"))
+    
+    async def _recycle(self, proc, reset):
+        ok = False
+        try:
+            ok = await reset(proc)
+        except Exception as e:
+            logger.warning(f"CLI session reset failed: {e}")
+        if ok and not self._closed and proc.returncode is None and len(self._idle) < self.size:
+            self._idle.append(proc)
+        else:
+            await self._stop(proc)
+            # Este reciclaje ya no aporta un proceso: que _fill no lo cuente
+            self._pending.discard(asyncio.current_task())
+            self._fill()
+    
+    async def warmup(self):
+        """Arranca los procesos del pool por adelantado."""
+        self._fill()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+    
+    async def close(self):
+        """Para los procesos en reposo y las tareas de fondo."""
+        self._closed = True
+        if self._health_task:
+            self._health_task.cancel()
+        # Los arranques pendientes se cancelan; las paradas en curso se esperan
+        stopping = []
+        for task in list(self._pending):
+            if task.get_name() == "cli_pool.spawn":
+                task.cancel()
+            else:
+                stopping.append(task)
+        while self._idle:
+            await self._stop(self._idle.popleft())
+        if stopping:
+            await asyncio.gather(*stopping, return_exceptions=True)
+    
+    def _fill(self):
+        """Programa arranques hasta completar ``size`` procesos en reposo."""
+        if self._closed:
+            return
+        # Los procesos en reciclaje también volverán al pool
+        incoming = sum(1 for t in self._pending if t.get_name() in ("cli_pool.spawn", "cli_pool.recycle"))
+        if self._reuse:
+            incoming += self._in_use
+        for _ in range(self.size - len(self._idle) - incoming):
+            self._track(asyncio.create_task(self._spawn_idle(), name="cli_pool.spawn"))
+    
+    async def _spawn_idle(self):
+        try:
+            proc = await self._spawn()
+        except Exception as e:
+            logger.error(f"Error starting pooled CLI process: {e}")
+            return
+        if self._closed:
+            await self._stop(proc)
+        else:
+            self._idle.append(proc)
+    
+    def _discard(self, proc: asyncio.subprocess.Process):
+        """Para un proceso en segundo plano (libera sus pipes y su estado)."""
+        self._track(asyncio.create_task(self._stop(proc)))
+    
+    def _track(self, task: asyncio.Task):
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+    
+    def _ensure_health_task(self):
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop())
+    
+    async def _health_loop(self):
+        """Descarta procesos en reposo que hayan muerto y repone el pool."""
+        while not self._closed:
+            await asyncio.sleep(self._health_check_seconds)
+            dead = [p for p in self._idle if p.returncode is not None]
+            if dead:
+                logger.warning(f"Respawning {len(dead)} dead CLI process(es)")
+                for proc in dead:
+                    self._idle.remove(proc)
+                    self._discard(proc)
+            self._fill()
+
+
 class ClaudeCliAgent(LLMAgent):
     """
     Agente que usa la herramienta CLI 'claude' (Claude Code) localmente.
@@ -35,13 +276,46 @@ class ClaudeCliAgent(LLMAgent):
         self,
         model: str = "claude-sonnet-4-5", # CLI usually defaults to best, but we can pass it if supported
         timeout_seconds: float = 120.0,
-        cwd: str = None
+        cwd: str = None,
+        pool_size: int = 2,
+        max_uses_per_process: int = 1,
+        max_response_chars: int = 512 * 1024
     ):
+        """
+        Args:
+            model: ID del modelo
+            timeout_seconds: Timeout por decisión
+            cwd: Directorio de trabajo del CLI
+            pool_size: Procesos CLI arrancados por adelantado
+            max_uses_per_process: Decisiones por proceso. 1 = proceso limpio
+                por decisión; >1 reutiliza la sesión enviando /clear entre
+                decisiones y lo renueva tras ese número de usos
+            max_response_chars: Tamaño máximo de la respuesta; si se supera
+                se mata el proceso y la decisión falla
+        """
         self._model = model
         self._timeout = timeout_seconds
         self._cwd = cwd or os.getcwd()
-        self._proc = None
-        self._running = False
+        # Entorno del CLI: se construye una vez por agente, no por proceso
+        self._env = {**os.environ, "CLAUDE_CODE_MAX_OUTPUT_TOKENS": "100000"}
+        self._pool = ClaudeCliProcessPool(
+            self._start_process, self._stop_process, size=pool_size,
+            reuse=max_uses_per_process > 1
+        )
+        # Lectores de stderr por proceso (evitan que el CLI se bloquee con el pipe lleno)
+        self._stderr_tasks: dict = {}
+        # Reutilización de sesión: usos por proceso
+        self._max_uses = max(1, max_uses_per_process)
+        self._max_response_chars = max_response_chars
+        self._proc_uses: dict = {}
+    
+    async def warmup(self):
+        """Arranca por adelantado los procesos CLI del pool."""
+        await self._pool.warmup()
+    
+    async def close(self):
+        """Para los procesos CLI del pool."""
+        await self._pool.close()
         
     @property
     def agent_id(self) -> str:
@@ -55,42 +329,40 @@ class ClaudeCliAgent(LLMAgent):
         """
         Toma una decisión lanzando una sesión de Claude CLI.
         
-        Nota: Para evitar contaminación de contexto entre decisiones,
-        lanzamos un proceso efímero o gestionamos la sesión cuidadosamente.
-        Por simplicidad incial: Lanzamos proceso fresh por cada decisión.
+        Nota: Para evitar contaminación de contexto entre decisiones, cada
+        decisión usa un proceso limpio, o una sesión reutilizada tras /clear
+        si max_uses_per_process > 1. Los procesos se arrancan por adelantado
+        en un pool, así el arranque del CLI no cuenta en la latencia.
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # 1. Preparar Prompt
-        system_prompt = self._get_system_prompt(context.autonomy_level)
-        user_prompt = context.to_prompt_text()
+        # Pedir el proceso antes de construir el prompt: si el pool está vacío
+        # el arranque del CLI se solapa con la preparación del mensaje
+        acquire_task = asyncio.create_task(self._pool.acquire())
         
-        # Combinamos para el CLI
-        full_message = f"{system_prompt}\n\nCONTEXTO ACTUAL:\n{user_prompt}\n\nINSTRUCCIONES: Tienes acceso a herramientas (como búsqueda web). ÚSALAS si necesitas información actualizada (ej: precios, noticias). NO inventes datos. Una vez tengas la información, Responde SOLAMENTE con el objeto JSON de decisión final."
-
         response_text = ""
-        tokens_est = len(full_message) // 4
-        
+        proc = None
+        # None: el turno no terminó bien y el proceso no se puede reutilizar
+        turn_finished = None
         try:
-            # 2. Iniciar Proceso (si no existe o si queremos uno nuevo)
-            # Para 'decide' atómico, es mejor fresh process para asegurar limpieza del context window
-            # Aunque Claude Code inicia rápido, el overhead puede ser notable.
-            # TODO: Evaluar modo persistente real si la latencia es alta.
-            await self._start_process()
+            # 1. Preparar Prompt (system + instrucciones ya serializados por nivel)
+            user_prompt = context.to_prompt_text()
+            message = self._build_message(context.autonomy_level, user_prompt)
+            tokens_est = (_FIXED_PROMPT_CHARS[context.autonomy_level] + len(user_prompt)) // 4
+            
+            # 2. Tomar el proceso (del pool o recién arrancado)
+            proc = await acquire_task
             
             # 3. Enviar mensaje
-            response_text = await self._send_and_wait(full_message)
+            response_text, turn_finished = await self._send_and_wait(proc, message)
             
             # 4. Parsear respuesta
             parsed_json = self._extract_json(response_text)
             
-            # 5. Parar proceso (clean up)
-            await self._stop_process()
-            
-            logger.debug(f"FULL RAW RESPONSE:\n{response_text}")
+            logger.debug("FULL RAW RESPONSE:\n%s", response_text)
             
             if parsed_json:
-                execution_time = int((time.time() - start_time) * 1000)
+                execution_time = int((time.perf_counter() - start_time) * 1000)
                 return self._create_decision(
                     parsed_json, context, execution_time, tokens_est
                 )
@@ -99,117 +371,216 @@ class ClaudeCliAgent(LLMAgent):
 
         except Exception as e:
             logger.error(f"Error in ClaudeCliAgent.decide: {e}")
-            await self._stop_process()
+            now = datetime.now(timezone.utc)
             
             return AgentDecision(
-                decision_id=f"err_{int(time.time())}",
-                timestamp=datetime.now(timezone.utc),
+                decision_id=f"err_{int(now.timestamp())}",
+                timestamp=now,
                 market_view=MarketView.UNCERTAIN,
                 confidence=0.0,
                 reasoning=f"Error executing Claude CLI: {str(e)}",
                 signals=[],
                 model_used=self._model,
                 tokens_used=0,
-                execution_time_ms=int((time.time() - start_time) * 1000)
+                execution_time_ms=int((time.perf_counter() - start_time) * 1000)
             )
+        
+        finally:
+            # 5. Reciclar o retirar el proceso usado (en segundo plano)
+            if proc is not None:
+                self._release_process(proc, turn_finished)
+            elif not acquire_task.done():
+                # Fallo antes de usarlo: retirar el proceso cuando llegue
+                acquire_task.add_done_callback(self._discard_acquired)
+            elif not acquire_task.cancelled() and acquire_task.exception() is None:
+                self._release_process(acquire_task.result(), None)
 
-    async def _start_process(self):
-        """Inicia el proceso claude CLI."""
-        cmd = [
-            "claude", 
-            "--print", 
-            "--input-format", "stream-json", 
-            "--output-format", "stream-json",
-            "--permission-mode", "bypassPermissions", # Importante para no bloquear
-            "--verbose" # Required for stream-json
-        ]
+    def _discard_acquired(self, task: asyncio.Task):
+        """Retira un proceso adquirido que ya no se va a usar."""
+        if not task.cancelled() and task.exception() is None:
+            self._release_process(task.result(), None)
+
+    def _release_process(self, proc: asyncio.subprocess.Process, turn_finished: Optional[bool]):
+        """Devuelve el proceso al pool (tras /clear) o lo retira."""
+        uses = self._proc_uses.get(proc, 0) + 1
+        if turn_finished is not None and uses < self._max_uses:
+            self._proc_uses[proc] = uses
+            pending_results = 0 if turn_finished else 1
+            self._pool.recycle(proc, lambda p: self._reset_session(p, pending_results))
+        else:
+            self._proc_uses.pop(proc, None)
+            self._pool.release(proc)
+
+    async def _reset_session(self, proc: asyncio.subprocess.Process, pending_results: int) -> bool:
+        """
+        Limpia el contexto de la sesión con /clear. Antes consume el 'result'
+        pendiente del turno anterior, si lo hay, y luego el del propio /clear.
+        """
+        proc.stdin.write(_CLEAR_MESSAGE)
+        await proc.stdin.drain()
         
-        if platform.system() == "Windows":
-             cmd[0] = "claude.cmd"
-            
-        env = os.environ.copy()
-        env["CLAUDE_CODE_MAX_OUTPUT_TOKENS"] = "100000"
+        async def wait_results(needed: int) -> bool:
+            async for line in self._iter_lines(proc):
+                if line.startswith(_RESULT_EVENT_PREFIX):
+                    needed -= 1
+                    if not needed:
+                        return True
+            return False
         
-        logger.info(f"Starting process: {' '.join(cmd)}")
+        try:
+            return await asyncio.wait_for(wait_results(pending_results + 1), RESET_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            return False
+
+    @property
+    def default_batch_concurrency(self) -> int:
+        """decide_batch() usa por defecto tantas decisiones en vuelo como procesos tiene el pool."""
+        return self._pool.size
+
+    async def _start_process(self) -> asyncio.subprocess.Process:
+        """Inicia un proceso claude CLI."""
+        logger.info("Starting process: %s", _CLAUDE_CMDLINE)
         
-        self._proc = await asyncio.create_subprocess_exec(
-            *cmd,
+        proc = await asyncio.create_subprocess_exec(
+            *_CLAUDE_ARGV,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=self._cwd,
-            env=env
+            env=self._env,
+            # Líneas stream-json grandes (bloques tool_use) sin LimitOverrunError
+            limit=STDOUT_LIMIT_BYTES
         )
-        self._running = True
+        self._stderr_tasks[proc] = asyncio.create_task(self._drain_stderr(proc))
+        return proc
+
+    @staticmethod
+    async def _drain_stderr(proc: asyncio.subprocess.Process):
+        """Lee stderr de forma continua mientras vive el proceso y lo loguea."""
+        while True:
+            line = await proc.stderr.readline()
+            if not line:
+                break
+            logger.error("CLI STDERR: %s", line.decode(errors="replace").rstrip())
 
-    async def _stop_process(self):
-        """Detiene el proceso y loguea stderr final de forma segura."""
-        if self._proc:
+    async def _stop_process(self, proc: asyncio.subprocess.Process):
+        """Detiene el proceso (stderr ya se va logueando en segundo plano)."""
+        try:
+            # Close stdin to signal EOF
+            if proc.stdin:
+                proc.stdin.close()
+            
+            # Wait for termination with timeout
             try:
-                # Close stdin to signal EOF
-                if self._proc.stdin:
-                    self._proc.stdin.close()
-                
-                # Wait for termination with timeout
+                # Give it a moment to flush stderr/stdout. stdout se vacía a la
+                # vez (eventos posteriores a message_stop, p.ej. 'result') para
+                # que el CLI no se bloquee con el pipe lleno
+                await asyncio.wait_for(
+                    asyncio.gather(proc.wait(), self._drain_stdout(proc)), timeout=2.0
+                )
+            except asyncio.TimeoutError:
+                proc.terminate()
+                await proc.wait()
+            
+            self._proc_uses.pop(proc, None)
+            
+            # El lector de stderr termina al llegar EOF tras la salida del proceso
+            stderr_task = self._stderr_tasks.pop(proc, None)
+            if stderr_task:
                 try:
-                    # Give it a moment to flush stderr/stdout
-                    await asyncio.wait_for(self._proc.wait(), timeout=2.0)
+                    await asyncio.wait_for(stderr_task, timeout=1.0)
                 except asyncio.TimeoutError:
-                    self._proc.terminate()
-                    await self._proc.wait()
-                
-                # Try to read stderr if available (now that process is done)
-                # But don't block forever
-                if self._proc.stderr:
-                   # Since process is done, read() should return immediately
-                   stderr_output = await self._proc.stderr.read()
-                   if stderr_output:
-                       logger.error(f"CLI STDERR: {stderr_output.decode(errors='replace')}")
+                    pass
 
-            except Exception as e:
-                logger.error(f"Error stopping process: {e}")
-                
-        self._proc = None
-        self._running = False
+        except Exception as e:
+            logger.error(f"Error stopping process: {e}")
+
+    @staticmethod
+    async def _drain_stdout(proc: asyncio.subprocess.Process):
+        """Lee hasta EOF la salida que quede tras la respuesta (solo debug)."""
+        if not proc.stdout:
+            return
+        leftover = await proc.stdout.read()
+        if leftover:
+            logger.debug("CLI OUTPUT after response: %d bytes", len(leftover))
+
+    @staticmethod
+    def _build_message(autonomy: AutonomyLevel, user_prompt: str) -> tuple:
+        """
+        Línea stream-json de entrada ({"type": "user", "message": {...}})
+        con el contenido: system prompt + contexto + instrucciones.
+        
+        Se devuelve en trozos (sin concatenar): prefijo y sufijo precalculados
+        y una vista sin comillas del contexto serializado, sin copias.
+        """
+        payload = memoryview(dumps(user_prompt))[1:-1]
+        return _MESSAGE_PREFIXES[autonomy], payload, _MESSAGE_SUFFIX
+
+    @staticmethod
+    async def _iter_lines(proc: asyncio.subprocess.Process):
+        """
+        Líneas JSONL no vacías de stdout (bytes, con su salto de línea) hasta EOF.
+        
+        No hace falta un productor aparte que lea por adelantado: el transporte
+        del pipe ya vuelca en el buffer del StreamReader todo lo que llega
+        mientras se procesa la línea anterior, así que readuntil() solo
+        espera cuando de verdad no hay datos.
+        """
+        stdout = proc.stdout
+        while True:
+            try:
+                line = await stdout.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                # EOF: último fragmento sin salto de línea
+                if e.partial.strip():
+                    yield e.partial
+                return
+            if line != b"\n":
+                yield line
 
-    async def _send_and_wait(self, text: str) -> str:
-        """Envía mensaje y espera respuesta completa."""
-        if not self._proc or not self._proc.stdin:
+    async def _send_and_wait(self, proc: asyncio.subprocess.Process, message: tuple) -> tuple:
+        """
+        Envía la línea de mensaje ya serializada y espera respuesta completa.
+        
+        Devuelve (texto, turno_terminado): turno_terminado es True si ya se
+        leyó el evento 'result' del turno y False si se cortó en message_stop.
+        """
+        if proc.returncode is not None or not proc.stdin:
             raise RuntimeError("Process not running")
             
-        # Formato stream-json input
-        msg_json = {
-            "type": "user",
-            "message": {
-                "role": "user",
-                "content": text
-            }
-        }
-        
-        line_to_send = json.dumps(msg_json) + "\n"
-        self._proc.stdin.write(line_to_send.encode('utf-8'))
-        await self._proc.stdin.drain()
+        proc.stdin.writelines(message)
+        await proc.stdin.drain()
         
-        # Leer respuesta hasta que termine
-        accumulated_text = ""
+        # Leer respuesta hasta el fin del turno (message_stop / result).
+        # No se espera más: el cierre del proceso (stdin EOF y drenado de
+        # stdout) lo hace el pool en segundo plano al liberarlo.
+        # Trozos de texto: se unen una sola vez al final (sin str += por delta)
+        text_chunks: List[str] = []
+        text_len = 0
+        # Tras un evento 'assistant' (mensaje completo) los deltas sobran
+        have_final = False
+        # Nivel consultado una vez por respuesta, no por evento
+        debug = logger.isEnabledFor(logging.DEBUG)
+        turn_finished = False
         
-        while True:
-            line = await self._proc.stdout.readline()
-            if not line:
-                break
-                
-            line_str = line.decode().strip()
-            if not line_str: continue
+        async for line in self._iter_lines(proc):
+            if line.startswith(_IGNORE_EVENT_PREFIXES):
+                continue
+            if have_final and line.startswith(_DELTA_EVENT_PREFIX):
+                continue
             
-            logger.debug(f"CLI OUTPUT: {line_str[:500]}")
+            if debug:
+                logger.debug("CLI OUTPUT: %s", line[:500])
             
             try:
-                data = json.loads(line_str)
+                # Parseo directo de bytes: sin decode()/strip() por evento
+                data = loads(line)
                 event_type = data.get("type")
                 
                 if event_type == "content_block_delta":
                     delta = data.get("delta", {}).get("text", "")
-                    accumulated_text += delta
+                    text_chunks.append(delta)
+                    text_len += len(delta)
                     # print(delta, end="", flush=True) # DEBUG UI
                     
                 elif event_type == "assistant":
@@ -218,82 +589,128 @@ class ClaudeCliAgent(LLMAgent):
                     if isinstance(content, list):
                         for block in content:
                             if block.get("type") == "text":
-                                accumulated_text = block.get("text", "") # Reemplaza o append? Normalmente Assistant trae todo
+                                text_chunks = [block.get("text", "")] # Reemplaza o append? Normalmente Assistant trae todo
                     elif isinstance(content, str):
-                        accumulated_text = content
+                        text_chunks = [content]
+                    text_len = sum(map(len, text_chunks))
+                    have_final = True
                         
-                elif event_type == "message_stop":
+                if text_len > self._max_response_chars:
+                    # Respuesta desbocada: cortar antes de agotar memoria
+                    proc.kill()
+                    raise RuntimeError(
+                        f"CLI response too large (> {self._max_response_chars} chars)"
+                    )
+                    
+                if event_type == "message_stop":
                     # Fin del turno
                     break
                     
-                elif event_type == "result" and data.get("subtype") == "success":
-                     # CLI interaction finished
+                elif event_type == "result":
+                     # CLI interaction finished (un result de error también
+                     # cierra el turno: no se espera a un EOF que no llegará)
+                     turn_finished = True
                      break
 
                     
                 # Ignoramos message_start, ping, etc
                 
-            except json.JSONDecodeError:
+            except JSONDecodeError:
                 pass
                 
-        return accumulated_text
+        return "".join(text_chunks), turn_finished
 
-    def _extract_json(self, text: str) -> dict:
-        """Reutiliza lógica de extracción JSON."""
-        # Simple extraction similar to ClaudeAgent
+    def _extract_json(self, text: str) -> Optional[dict]:
+        """Extrae y parsea el JSON de decisión de la respuesta (None si no hay)."""
         text = text.strip()
-        try:
-            return json.loads(text, strict=False)
-        except:
-             # Try regex
-            import re
-            match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
-            if match:
-                try:
-                    return json.loads(match.group(1), strict=False)
-                except: pass
-            
-            # Brackets
-            start = text.find("{")
-            end = text.rfind("}")
-            if start != -1 and end != -1:
-                try:
-                    return json.loads(text[start:end+1], strict=False)
-                except: pass
-                
-        return None
+        
+        def try_parse(candidate):
+            try:
+                return _loads_lenient(candidate)
+            except ValueError:
+                return None
+        
+        # 1. Respuesta completa
+        res = try_parse(text)
+        if res is not None:
+            return res
+        
+        # 2. Bloque ```json ... ```
+        match = _JSON_FENCE_RE.search(text)
+        if match:
+            res = try_parse(match.group(1))
+            if res is not None:
+                return res
+        
+        # 3. Objetos {...} balanceados, de izquierda a derecha (las llaves
+        #    sueltas del razonamiento posterior no estropean el candidato)
+        pos = 0
+        while True:
+            span = find_json_span(text, pos)
+            if span is None:
+                return None
+            start, end = span
+            res = try_parse(text[start:end + 1])
+            if res is not None:
+                return res
+            pos = start + 1
 
     def _get_system_prompt(self, autonomy: AutonomyLevel) -> str:
-        if autonomy == AutonomyLevel.CONSERVATIVE:
-            return CONSERVATIVE_PROMPT
-        return MODERATE_PROMPT
+        return SYSTEM_PROMPTS[autonomy]
 
-    def _create_decision(self, data: dict, context: AgentContext, exec_time: int, tokens: int) -> AgentDecision:
-        # Reutilizar lógica de mapeo (duplicada de ClaudeAgent por ahora, ideal refactor a Base)
+    def _map_signals(self, raw_signals: list, context: AgentContext) -> List[Signal]:
+        """
+        Convierte las señales del JSON en objetos Signal.
+        
+        Régimen, confianza y metadata son comunes a todas las señales de la
+        decisión y se resuelven una vez. Las direcciones se buscan en un
+        dict; las inválidas se descartan sin lanzar excepciones.
+        """
+        regime_enum = _REGIME_MAP.get(context.regime.regime)
+        if regime_enum is None:
+            if raw_signals:
+                logger.warning(f"Skipping {len(raw_signals)} signal(s): unknown regime {context.regime.regime!r}")
+            return []
+        
+        regime_confidence = context.regime.confidence
+        metadata = {"autonomy": context.autonomy_level.value, "provider": "claude_cli"}
+        strategy_id = self.agent_id
+        
         signals = []
-        for sig_data in data.get("signals", []):
+        for sig_data in raw_signals:
+            direction_raw = sig_data.get("direction") if isinstance(sig_data, dict) else None
+            direction = _DIR_MAP.get(direction_raw) if isinstance(direction_raw, str) else None
+            if direction is None:
+                logger.warning(f"Skipping invalid signal data: {sig_data} - invalid direction")
+                continue
             try:
-                signal = Signal(
-                    strategy_id=self.agent_id,
+                signals.append(Signal(
+                    strategy_id=strategy_id,
                     symbol=sig_data.get("symbol"),
-                    direction=SignalDirection(sig_data.get("direction")),
+                    direction=direction,
                     confidence=sig_data.get("confidence", 0.0),
                     entry_price=sig_data.get("entry_price"),
                     stop_loss=sig_data.get("stop_loss"),
                     take_profit=sig_data.get("take_profit"),
                     size_suggestion=sig_data.get("size_suggestion"),
-                    regime_at_signal=MarketRegime(context.regime.regime),
-                    regime_confidence=context.regime.confidence,
+                    regime_at_signal=regime_enum,
+                    regime_confidence=regime_confidence,
                     reasoning=sig_data.get("reasoning", ""),
-                    metadata={"autonomy": context.autonomy_level.value, "provider": "claude_cli"}
-                )
-                signals.append(signal)
+                    metadata=metadata
+                ))
             except Exception as e:
+                # Validaciones propias de Signal (precios, confianza...)
                 logger.warning(f"Skipping invalid signal data: {sig_data} - {e}")
+        return signals
+
+    def _create_decision(self, data: dict, context: AgentContext, exec_time: int, tokens: int) -> AgentDecision:
+        # Reutilizar lógica de mapeo (duplicada de ClaudeAgent por ahora, ideal refactor a Base)
+        signals = self._map_signals(data.get("signals", []), context)
         
+        now = datetime.now(timezone.utc)
         return AgentDecision(
-            decision_id=f"dec_{int(time.time())}",
-            timestamp=datetime.now(timezone.utc),
+            decision_id=f"dec_{int(now.timestamp())}",
+            timestamp=now,
             market_view=MarketView(data.get("market_view", "uncertain")),
             confidence=data.get("confidence", 0.0),
             reasoning=data.get("reasoning", ""),
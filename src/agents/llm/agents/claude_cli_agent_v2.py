@@ -6,17 +6,25 @@ Mejoras respecto a la versión anterior:
 2. Implementa timeout correctamente
 3. Mejor manejo de errores y limpieza de procesos
 4. Soporte para modo de revisión de portfolio
+5. Sesión del CLI opcionalmente reutilizada entre decisiones
+6. Transporte alternativo por API (SDK de Anthropic) sin subproceso
 """
 
 import asyncio
-import json
 import logging
 import os
 import re
 import time
 import platform
 from datetime import datetime, timezone
-from typing import Optional, Any, List
+from importlib.util import find_spec
+from typing import Optional, Any, Dict, List, Sequence, Tuple
+
+try:
+    import anthropic
+    import httpx
+except ImportError:
+    anthropic = None
 
 from src.agents.llm.interfaces import (
     LLMAgent,
@@ -31,9 +39,59 @@ from src.agents.llm.prompts.competition import (
     build_review_prompt,
     COMPETITION_SYSTEM_PROMPT,
 )
+from src.shared.json_utils import loads, dumps, find_json_spans, JSONDecodeError
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 para el transporte por API requiere h2
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Transportes: el CLI local o la API directa (sin fork/exec ni arranque de Node)
+TRANSPORT_CLI = "cli"
+TRANSPORT_SDK = "sdk"
+TRANSPORTS = (TRANSPORT_CLI, TRANSPORT_SDK)
+
+# Instrucción de un lote: una decisión por contexto, en un array JSON
+BATCH_INSTRUCTIONS = (
+    "Este mensaje contiene {n} contextos independientes (CONTEXTO_1..CONTEXTO_{n}). "
+    "Responde SOLO con un array JSON de {n} objetos de decisión, con el mismo "
+    "formato que una decisión individual: el elemento i corresponde a CONTEXTO_i."
+)
+
+# Búsqueda web del lado del servidor para el transporte por API (el prompt
+# de competición pide usar herramientas, como haría el CLI)
+SDK_WEB_SEARCH_TOOL = {"type": "web_search_20250305", "name": "web_search", "max_uses": 5}
+
+# Lookups valor -> miembro de los enums (sin Enum.__call__ ni try/except por señal)
+_DIR_MAP = {d.value: d for d in SignalDirection}
+_MV_MAP = {v.value: v for v in MarketView}
+_REGIME_MAP = {r.value: r for r in MarketRegime}
+
+# Bloque ```json ... ``` en la respuesta del modelo
+_RE_JSON_FENCE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+
+# Caracteres de control que rompen el parseo del JSON
+_RE_CTRL = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+# Límite del buffer de stdout: una línea JSONL completa (los mensajes
+# 'assistant' y los resultados de tools pueden ser grandes)
+STDOUT_LIMIT_BYTES = 8 * 1024 * 1024
+
+# Estrategias de sesión del proceso CLI
+SESSION_ISOLATED = "isolated"  # un proceso nuevo por decisión
+SESSION_REUSED = "reused"      # un proceso vivo para varias decisiones
+SESSION_STRATEGIES = (SESSION_ISOLATED, SESSION_REUSED)
+
+# Mensaje de control que limpia el contexto de una sesión reutilizada (igual
+# que en ClaudeCliAgent v1): las decisiones anteriores no se arrastran
+_CLEAR_MESSAGE = dumps({"type": "user", "message": {"role": "user", "content": "/clear"}}) + b"\n"
+
+# Fin de turno en la salida stream-json
+_RESULT_EVENT_PREFIX = b'{"type":"result"'
+
+# Tiempo máximo para que el CLI confirme un /clear
+RESET_TIMEOUT_SECONDS = 10.0
+
 
 class ClaudeCliAgent(LLMAgent):
     """
@@ -53,6 +111,11 @@ class ClaudeCliAgent(LLMAgent):
         timeout_seconds: float = 180.0,  # Aumentado para permitir búsquedas web
         cwd: str = None,
         use_competition_prompt: bool = True,
+        session_strategy: str = SESSION_ISOLATED,
+        max_session_turns: int = 20,
+        transport: str = TRANSPORT_CLI,
+        api_key: Optional[str] = None,
+        max_tokens: int = 16000,
     ):
         """
         Inicializa el agente CLI.
@@ -62,13 +125,50 @@ class ClaudeCliAgent(LLMAgent):
             timeout_seconds: Timeout máximo para cada decisión
             cwd: Directorio de trabajo para el proceso
             use_competition_prompt: Si usar el prompt de competición (recomendado)
+            session_strategy: "isolated" (proceso efímero por decisión) o
+                "reused" (el proceso sigue vivo entre decisiones y se evita
+                el arranque del CLI en cada llamada)
+            max_session_turns: Decisiones por proceso en modo "reused" antes
+                de reiniciarlo
+            transport: "cli" (proceso claude local) o "sdk" (API de Anthropic
+                con un cliente HTTP keep-alive; requiere ANTHROPIC_API_KEY)
+            api_key: API Key de Anthropic para transport="sdk" (opcional si
+                está en env)
+            max_tokens: Límite de tokens de salida con transport="sdk"
         """
+        if session_strategy not in SESSION_STRATEGIES:
+            raise ValueError(
+                f"session_strategy must be one of {SESSION_STRATEGIES}, got {session_strategy!r}"
+            )
+        if transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {TRANSPORTS}, got {transport!r}")
+        
+        self._client = None
+        if transport == TRANSPORT_SDK:
+            if not anthropic:
+                raise ImportError("anthropic package not installed. Run 'pip install anthropic'")
+            api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+            if not api_key:
+                raise ValueError("ANTHROPIC_API_KEY not found")
+            # Cliente creado una vez: las decisiones reutilizan la conexión TLS
+            http_client = anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(keepalive_expiry=300.0),
+                http2=HTTP2_AVAILABLE,
+            )
+            self._client = anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client)
+        self._max_tokens = max_tokens
         self._model = model
         self._timeout = timeout_seconds
         self._cwd = cwd or os.getcwd()
         self._use_competition_prompt = use_competition_prompt
+        self._reuse_session = session_strategy == SESSION_REUSED
+        self._max_session_turns = max(1, max_session_turns)
+        self._session_turns = 0
         self._proc = None
         self._running = False
+        self._stderr_task = None
+        # Un solo proceso por agente: los turnos se serializan
+        self._lock = asyncio.Lock()
         
     @property
     def agent_id(self) -> str:
@@ -76,14 +176,17 @@ class ClaudeCliAgent(LLMAgent):
     
     @property
     def provider(self) -> str:
-        return "claude_cli"
+        return "claude_cli" if self._client is None else "claude_api"
 
     async def decide(self, context: AgentContext) -> AgentDecision:
         """
-        Toma una decisión lanzando una sesión de Claude CLI.
+        Toma una decisión con una sesión de Claude CLI.
         
-        El proceso es efímero (se crea y destruye por cada decisión)
-        para evitar contaminación de contexto entre sesiones.
+        En modo "isolated" el proceso es efímero (se crea y destruye por cada
+        decisión) para evitar contaminación de contexto entre sesiones. En
+        modo "reused" se mantiene vivo y su contexto se limpia con /clear
+        antes de cada decisión. Con transport="sdk" no hay proceso: la
+        petición va directa a la API.
         """
         start_time = time.time()
         response_text = ""
@@ -92,33 +195,22 @@ class ClaudeCliAgent(LLMAgent):
         try:
             # 1. Construir prompt
             if self._use_competition_prompt:
-                full_message = build_competition_prompt(
+                system = COMPETITION_SYSTEM_PROMPT
+                user_message = build_competition_prompt(
                     context_data=context.to_prompt_text(),
                     current_datetime=context.timestamp,
-                    additional_instructions=context.notes
+                    additional_instructions=context.notes,
+                    include_system_prompt=False
                 )
             else:
                 # Fallback al prompt básico
-                full_message = self._build_basic_prompt(context)
+                system, user_message = self._build_basic_prompt(context)
             
-            tokens_est = len(full_message) // 4
+            tokens_est = (len(system) + len(user_message)) // 4
             logger.info(f"Prompt size: ~{tokens_est} tokens")
             
-            # 2. Iniciar proceso
-            await self._start_process()
-            
-            # 3. Enviar mensaje con timeout
-            try:
-                response_text = await asyncio.wait_for(
-                    self._send_and_wait(full_message),
-                    timeout=self._timeout
-                )
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout after {self._timeout}s waiting for Claude CLI response")
-                raise TimeoutError(f"Claude CLI did not respond within {self._timeout} seconds")
-            
-            # 4. Limpiar proceso
-            await self._stop_process()
+            # 2-4. Enviar y esperar la respuesta con timeout
+            response_text, tokens_est = await self._request(system, user_message, tokens_est)
             
             # 5. Parsear respuesta
             logger.debug(f"Raw response length: {len(response_text)} chars")
@@ -138,19 +230,216 @@ class ClaudeCliAgent(LLMAgent):
 
         except Exception as e:
             logger.error(f"Error in ClaudeCliAgent.decide: {e}", exc_info=True)
-            await self._stop_process()
+            # Estado del proceso desconocido: no se reutiliza
+            async with self._lock:
+                await self._stop_process()
+            
+            return self._create_error_decision(
+                e, response_text, tokens_est, int((time.time() - start_time) * 1000)
+            )
+
+    async def decide_batch(
+        self,
+        contexts: Sequence[AgentContext],
+        max_concurrency: Optional[int] = None
+    ) -> List[AgentDecision]:
+        """
+        Toma varias decisiones agrupando los contextos en pocos turnos.
+        
+        Los contextos se agrupan por nivel de autonomía y régimen (prompts
+        homogéneos) y cada grupo va en un solo mensaje que pide un array JSON
+        con una decisión por contexto: el arranque del CLI y la latencia del
+        turno se pagan una vez por grupo, no por contexto. Como mucho
+        max_concurrency grupos en vuelo. Las decisiones se devuelven en el
+        orden de entrada.
+        """
+        groups: Dict[Tuple, List[int]] = {}
+        for i, context in enumerate(contexts):
+            key = (context.autonomy_level, context.regime.regime if context.regime else None)
+            groups.setdefault(key, []).append(i)
+        
+        decisions: List[Optional[AgentDecision]] = [None] * len(contexts)
+        
+        semaphore = asyncio.Semaphore(max_concurrency or self.default_batch_concurrency)
+        
+        async def run_group(indices: List[int]):
+            group = [contexts[i] for i in indices]
+            async with semaphore:
+                if len(group) == 1:
+                    group_decisions = [await self.decide(group[0])]
+                else:
+                    group_decisions = await self._decide_group(group)
+            for i, decision in zip(indices, group_decisions):
+                decisions[i] = decision
+        
+        # Con el CLI los turnos se serializan en self._lock; por API van en paralelo
+        await asyncio.gather(*(run_group(indices) for indices in groups.values()))
+        return decisions
+
+    async def _decide_group(self, group: List[AgentContext]) -> List[AgentDecision]:
+        """Un turno para un grupo homogéneo de contextos (ver decide_batch)."""
+        start_time = time.time()
+        response_text = ""
+        tokens_est = 0
+        n = len(group)
+        
+        try:
+            context_data = "\n\n".join(
+                f"### CONTEXTO_{i}\n{context.to_prompt_text()}"
+                for i, context in enumerate(group, 1)
+            )
+            instructions = BATCH_INSTRUCTIONS.format(n=n)
+            if self._use_competition_prompt:
+                system = COMPETITION_SYSTEM_PROMPT
+                user_message = build_competition_prompt(
+                    context_data=context_data,
+                    current_datetime=group[0].timestamp,
+                    additional_instructions=instructions,
+                    include_system_prompt=False
+                )
+            else:
+                system, _ = self._build_basic_prompt(group[0])
+                user_message = f"\nCONTEXTOS ACTUALES:\n{context_data}\n\n{instructions}"
+            
+            tokens_est = (len(system) + len(user_message)) // 4
+            logger.info(f"Batch prompt size: ~{tokens_est} tokens for {n} contexts")
+            
+            response_text, tokens_est = await self._request(system, user_message, tokens_est)
+            
+            items = self._extract_json_array(response_text)
+            if items is None:
+                logger.warning("No valid JSON array in batch response, deciding one by one")
+                return [await self.decide(context) for context in group]
+            
+            # Decisiones alineadas por posición: item i -> CONTEXTO_i
+            execution_time = int((time.time() - start_time) * 1000)
+            decisions: List[Optional[AgentDecision]] = [None] * n
+            for i, (item, context) in enumerate(zip(items, group)):
+                if isinstance(item, dict):
+                    decisions[i] = self._create_decision(item, context, execution_time, tokens_est // n)
+            
+            missing = [i for i, decision in enumerate(decisions) if decision is None]
+            if missing:
+                # Respuesta incompleta o items inválidos: esos contextos, por separado
+                logger.warning(f"Batch response covered {n - len(missing)}/{n} contexts")
+                for i in missing:
+                    decisions[i] = await self.decide(group[i])
+            return decisions
+        
+        except Exception as e:
+            logger.error(f"Error in ClaudeCliAgent.decide_batch: {e}", exc_info=True)
+            async with self._lock:
+                await self._stop_process()
+            
+            execution_time = int((time.time() - start_time) * 1000)
+            return [
+                self._create_error_decision(e, response_text, tokens_est // n, execution_time)
+                for _ in group
+            ]
+
+    async def _request(self, system: str, user_message: str, tokens_est: int) -> tuple:
+        """
+        Envía el prompt por el transporte configurado, con timeout.
+        
+        Returns:
+            (texto de la respuesta, tokens usados o estimados)
+        """
+        try:
+            if self._client is not None:
+                return await asyncio.wait_for(
+                    self._request_sdk(system, user_message),
+                    timeout=self._timeout
+                )
+            return await self._request_cli(f"{system}\n{user_message}"), tokens_est
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout after {self._timeout}s waiting for Claude CLI response")
+            raise TimeoutError(f"Claude CLI did not respond within {self._timeout} seconds")
+
+    async def _request_cli(self, full_message: str) -> str:
+        """Un turno por el CLI: arranca/reutiliza el proceso y envía el mensaje."""
+        async with self._lock:
+            # Iniciar proceso (o reutilizar el de la sesión)
+            await self._ensure_process()
             
-            return AgentDecision(
-                decision_id=f"err_{int(time.time())}",
-                timestamp=datetime.now(timezone.utc),
-                market_view=MarketView.UNCERTAIN,
-                confidence=0.0,
-                reasoning=f"Error executing Claude CLI: {str(e)}\n\nPartial response: {response_text[:500] if response_text else 'None'}",
-                signals=[],
-                model_used=self._model,
-                tokens_used=tokens_est,
-                execution_time_ms=int((time.time() - start_time) * 1000)
+            response_text = await asyncio.wait_for(
+                self._send_and_wait(full_message),
+                timeout=self._timeout
             )
+            
+            # Limpiar proceso (o dejarlo listo para el siguiente turno)
+            self._session_turns += 1
+            if not self._reuse_session or self._session_turns >= self._max_session_turns:
+                await self._stop_process()
+        return response_text
+
+    async def _request_sdk(self, system: str, user_message: str) -> tuple:
+        """
+        Un turno por la API de Anthropic.
+        
+        Returns:
+            (texto final de la respuesta, tokens usados)
+        """
+        # Streaming: la API rechaza peticiones no streaming con max_tokens alto
+        async with self._client.messages.stream(
+            model=self._model,
+            max_tokens=self._max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": user_message}],
+            tools=[SDK_WEB_SEARCH_TOOL],
+        ) as stream:
+            message = await stream.get_final_message()
+        
+        # Igual que con el CLI: el último bloque de texto es la respuesta final
+        response_text = ""
+        for block in message.content:
+            if block.type == "text" and block.text:
+                response_text = block.text
+        tool_uses = [b.name for b in message.content if b.type == "server_tool_use"]
+        if tool_uses:
+            logger.info(f"Tools used: {tool_uses}")
+        
+        return response_text, message.usage.input_tokens + message.usage.output_tokens
+
+    async def close(self):
+        """Detiene el proceso de la sesión y/o cierra el cliente de la API."""
+        async with self._lock:
+            await self._stop_process()
+        if self._client is not None:
+            await self._client.close()
+
+    async def _ensure_process(self):
+        """
+        Deja listo un proceso con la sesión limpia (llamar con self._lock tomado).
+        
+        Un proceso vivo que ya ha atendido algún turno (modo "reused") se
+        limpia con /clear; si el reset falla se reinicia.
+        """
+        if self._proc and self._running and self._proc.returncode is None:
+            if not self._session_turns or await self._reset_session():
+                return
+            logger.warning("Claude CLI session reset failed, restarting process")
+            await self._stop_process()
+        await self._start_process()
+
+    async def _reset_session(self) -> bool:
+        """Envía /clear y consume su 'result'. False si el CLI no lo confirma."""
+        stdout = self._proc.stdout
+        
+        async def wait_result() -> bool:
+            while True:
+                try:
+                    line = await stdout.readuntil(b"\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    return False
+                if line.startswith(_RESULT_EVENT_PREFIX):
+                    return True
+        
+        try:
+            self._proc.stdin.write(_CLEAR_MESSAGE)
+            await self._proc.stdin.drain()
+            return await asyncio.wait_for(wait_result(), RESET_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, ConnectionError):
+            return False
 
     async def _start_process(self):
         """Inicia el proceso claude CLI."""
@@ -182,11 +471,29 @@ class ClaudeCliAgent(LLMAgent):
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=self._cwd,
-            env=env
+            env=env,
+            limit=STDOUT_LIMIT_BYTES
         )
         self._running = True
+        self._session_turns = 0
+        # stderr se lee en segundo plano: en una sesión larga el pipe lleno
+        # bloquearía al CLI
+        self._stderr_task = asyncio.create_task(self._drain_stderr(self._proc))
         logger.info(f"Claude CLI process started (PID: {self._proc.pid})")
 
+    @staticmethod
+    async def _drain_stderr(proc):
+        """Lee stderr de forma continua mientras vive el proceso y lo loguea."""
+        while True:
+            line = await proc.stderr.readline()
+            if not line:
+                break
+            stderr_str = line.decode(errors='replace').rstrip()
+            if 'error' in stderr_str.lower():
+                logger.error(f"CLI STDERR: {stderr_str[:1000]}")
+            else:
+                logger.debug(f"CLI STDERR: {stderr_str[:500]}")
+
     async def _stop_process(self):
         """Detiene el proceso de forma segura."""
         if not self._proc:
@@ -206,19 +513,10 @@ class ClaudeCliAgent(LLMAgent):
                 self._proc.kill()
                 await self._proc.wait()
             
-            # Leer stderr si hay errores
-            if self._proc.stderr:
+            # Terminar de leer stderr
+            if self._stderr_task:
                 try:
-                    stderr_output = await asyncio.wait_for(
-                        self._proc.stderr.read(),
-                        timeout=1.0
-                    )
-                    if stderr_output:
-                        stderr_str = stderr_output.decode(errors='replace')
-                        if 'error' in stderr_str.lower():
-                            logger.error(f"CLI STDERR: {stderr_str[:1000]}")
-                        else:
-                            logger.debug(f"CLI STDERR: {stderr_str[:500]}")
+                    await asyncio.wait_for(self._stderr_task, timeout=1.0)
                 except asyncio.TimeoutError:
                     pass
                     
@@ -227,6 +525,7 @@ class ClaudeCliAgent(LLMAgent):
         finally:
             self._proc = None
             self._running = False
+            self._stderr_task = None
 
     async def _send_and_wait(self, text: str) -> str:
         """
@@ -247,46 +546,51 @@ class ClaudeCliAgent(LLMAgent):
             }
         }
         
-        line_to_send = json.dumps(msg_json) + "\n"
-        self._proc.stdin.write(line_to_send.encode('utf-8'))
+        self._proc.stdin.write(dumps(msg_json) + b"\n")
         await self._proc.stdin.drain()
         logger.debug("Message sent to Claude CLI")
         
-        # Leer respuesta
-        accumulated_text = ""
+        # Leer respuesta: los deltas se acumulan en una lista y se unen al
+        # final (concatenar str en cada delta es cuadrático)
+        deltas: List[str] = []
         tool_uses = []
         
+        # Sin timeout por línea: el único temporizador es el wait_for externo
+        # sobre todo el turno
+        stdout = self._proc.stdout
+        # El trabajo solo para logs (decode, recortes) se omite sin DEBUG
+        debug = logger.isEnabledFor(logging.DEBUG)
         while True:
             try:
-                line = await asyncio.wait_for(
-                    self._proc.stdout.readline(),
-                    timeout=30.0  # Timeout por línea
-                )
-            except asyncio.TimeoutError:
-                logger.warning("Timeout reading line, continuing...")
-                continue
+                line = await stdout.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                # EOF: último fragmento sin salto de línea
+                line = e.partial
+            except asyncio.LimitOverrunError:
+                raise RuntimeError(f"CLI output line exceeds {STDOUT_LIMIT_BYTES} bytes")
                 
             if not line:
                 logger.debug("EOF reached")
                 break
             
-            line_str = line.decode().strip()
-            if not line_str:
+            if line.isspace():
                 continue
             
             # Log truncado para debug
-            if len(line_str) > 200:
-                logger.debug(f"CLI OUT: {line_str[:100]}...{line_str[-50:]}")
-            else:
-                logger.debug(f"CLI OUT: {line_str}")
+            if debug:
+                line_str = line.decode(errors='replace').strip()
+                if len(line_str) > 200:
+                    logger.debug(f"CLI OUT: {line_str[:100]}...{line_str[-50:]}")
+                else:
+                    logger.debug(f"CLI OUT: {line_str}")
             
             try:
-                data = json.loads(line_str)
+                # orjson (vía json_utils) parsea los bytes de la línea directamente
+                data = loads(line)
                 event_type = data.get("type")
                 
                 if event_type == "content_block_delta":
-                    delta = data.get("delta", {}).get("text", "")
-                    accumulated_text += delta
+                    deltas.append(data.get("delta", {}).get("text", ""))
                     
                 elif event_type == "assistant":
                     # Mensaje completo
@@ -296,33 +600,41 @@ class ClaudeCliAgent(LLMAgent):
                             if block.get("type") == "text":
                                 # Puede ser el mensaje final
                                 if block.get("text"):
-                                    accumulated_text = block.get("text")
+                                    deltas.clear()
+                                    deltas.append(block["text"])
                             elif block.get("type") == "tool_use":
                                 tool_uses.append(block)
                     elif isinstance(content, str):
-                        accumulated_text = content
+                        deltas.clear()
+                        deltas.append(content)
                         
                 elif event_type == "message_stop":
                     logger.debug("Message stop received")
-                    break
+                    # En una sesión reutilizada el turno termina con 'result':
+                    # si no se consume, el siguiente turno lo leería como suyo
+                    if not self._reuse_session:
+                        break
                     
                 elif event_type == "result":
+                    # Cualquier 'result' cierra el turno (también error_max_turns
+                    # y similares): en una sesión reutilizada no debe quedar
+                    # pendiente
                     subtype = data.get("subtype", "")
                     if subtype == "success":
                         logger.debug("CLI interaction completed successfully")
-                        break
-                    elif subtype == "error":
-                        logger.error(f"CLI error: {data.get('error', 'Unknown')}")
-                        break
+                    else:
+                        logger.error(f"CLI error ({subtype}): {data.get('error', 'Unknown')}")
+                    break
                         
-            except json.JSONDecodeError:
+            except JSONDecodeError:
                 # Líneas que no son JSON (posible output de herramientas)
-                logger.debug(f"Non-JSON line: {line_str[:100]}")
+                if debug:
+                    logger.debug(f"Non-JSON line: {line_str[:100]}")
         
         if tool_uses:
             logger.info(f"Tools used: {[t.get('name') for t in tool_uses]}")
         
-        return accumulated_text
+        return "".join(deltas)
 
     def _extract_json(self, text: str) -> Optional[dict]:
         """
@@ -335,50 +647,92 @@ class ClaudeCliAgent(LLMAgent):
             
         text = text.strip()
         
-        # Estrategia 1: Parse directo
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-        
-        # Estrategia 2: Buscar bloque ```json
-        match = re.search(r"```json\s*(.*?)\s*```", text, re.DOTALL)
-        if match:
+        # Estrategia 1: Parse directo. Solo si ya parece un objeto (el caso
+        # habitual, el prompt pide solo JSON): es el camino rápido
+        is_object = text[:1] == "{" and text[-1:] == "}"
+        if is_object:
             try:
-                return json.loads(match.group(1))
-            except json.JSONDecodeError:
+                return loads(text)
+            except JSONDecodeError:
                 pass
         
+        # Estrategia 2: Buscar bloque ```json
+        if "```json" in text:
+            match = _RE_JSON_FENCE.search(text)
+            if match:
+                try:
+                    return loads(match.group(1))
+                except JSONDecodeError:
+                    pass
+        
         # Estrategia 3: Buscar primer { hasta último }
         start = text.find("{")
         end = text.rfind("}")
         if start != -1 and end != -1 and end > start:
-            try:
-                return json.loads(text[start:end+1])
-            except json.JSONDecodeError:
-                # Intentar limpiar caracteres problemáticos
-                candidate = text[start:end+1]
-                candidate = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', candidate)
+            candidate = text[start:end+1]
+            # Si es todo el texto, la estrategia 1 ya lo intentó tal cual
+            if not is_object:
                 try:
-                    return json.loads(candidate)
-                except json.JSONDecodeError:
+                    return loads(candidate)
+                except JSONDecodeError:
                     pass
+            # Intentar limpiar caracteres problemáticos
+            candidate = _RE_CTRL.sub('', candidate)
+            try:
+                return loads(candidate)
+            except JSONDecodeError:
+                pass
+        
+        # Estrategia 4: Buscar objeto JSON más grande. Una sola pasada
+        # lineal por las llaves (respetando strings) en lugar de una regex
+        # con llaves anidadas, que puede hacer backtracking catastrófico
+        spans = find_json_spans(text)
         
-        # Estrategia 4: Buscar objeto JSON más grande
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        for candidate in sorted(matches, key=len, reverse=True):
+        for begin, end in sorted(spans, key=lambda sp: sp[1] - sp[0], reverse=True):
             try:
-                result = json.loads(candidate)
+                result = loads(text[begin:end+1])
                 if isinstance(result, dict) and 'market_view' in result:
                     return result
-            except json.JSONDecodeError:
+            except JSONDecodeError:
+                continue
+        
+        return None
+
+    def _extract_json_array(self, text: str) -> Optional[list]:
+        """
+        Extrae el array JSON de decisiones de una respuesta de lote.
+        
+        Acepta también un objeto con la lista en "decisions".
+        """
+        if not text:
+            return None
+        
+        text = text.strip()
+        candidates = [text]
+        
+        match = _RE_JSON_FENCE.search(text)
+        if match:
+            candidates.append(match.group(1))
+        
+        start = text.find("[")
+        end = text.rfind("]")
+        if start != -1 and end > start:
+            candidates.append(text[start:end+1])
+        
+        for candidate in candidates:
+            try:
+                result = loads(candidate)
+            except JSONDecodeError:
                 continue
+            if isinstance(result, dict):
+                result = result.get("decisions")
+            if isinstance(result, list):
+                return result
         
         return None
 
-    def _build_basic_prompt(self, context: AgentContext) -> str:
-        """Construye prompt básico si no se usa competición."""
+    def _build_basic_prompt(self, context: AgentContext) -> tuple:
+        """Construye prompt básico (system, mensaje) si no se usa competición."""
         from src.agents.llm.prompts import CONSERVATIVE_PROMPT, MODERATE_PROMPT
         
         if context.autonomy_level == AutonomyLevel.CONSERVATIVE:
@@ -386,7 +740,7 @@ class ClaudeCliAgent(LLMAgent):
         else:
             system = MODERATE_PROMPT
             
-        return f"{system}\n\nCONTEXTO ACTUAL:\n{context.to_prompt_text()}"
+        return system, f"\nCONTEXTO ACTUAL:\n{context.to_prompt_text()}"
 
     def _create_decision(
         self, 
@@ -401,19 +755,31 @@ class ClaudeCliAgent(LLMAgent):
         # Soportar tanto "signals" como "actions" (del prompt experimental)
         signal_list = data.get("signals", data.get("actions", []))
         
+        # El régimen solo depende del contexto: un lookup por decisión
+        if context.regime:
+            regime_at_signal = _REGIME_MAP.get(context.regime.regime)
+            regime_confidence = context.regime.confidence
+        else:
+            regime_at_signal = None
+            regime_confidence = 0.0
+        
         for sig_data in signal_list:
+            direction = _DIR_MAP.get(str(sig_data.get("direction", "")).upper())
+            if direction is None:
+                logger.warning(f"Skipping invalid signal: {sig_data} - unknown direction")
+                continue
             try:
                 signal = Signal(
                     strategy_id=self.agent_id,
                     symbol=sig_data.get("symbol"),
-                    direction=SignalDirection(sig_data.get("direction", "").upper()),
+                    direction=direction,
                     confidence=sig_data.get("confidence", 0.0),
                     entry_price=sig_data.get("entry_price"),
                     stop_loss=sig_data.get("stop_loss"),
                     take_profit=sig_data.get("take_profit"),
                     size_suggestion=sig_data.get("size_suggestion"),
-                    regime_at_signal=MarketRegime(context.regime.regime) if context.regime else None,
-                    regime_confidence=context.regime.confidence if context.regime else 0.0,
+                    regime_at_signal=regime_at_signal,
+                    regime_confidence=regime_confidence,
                     reasoning=sig_data.get("reasoning", ""),
                     metadata={
                         "autonomy": context.autonomy_level.value,
@@ -428,11 +794,8 @@ class ClaudeCliAgent(LLMAgent):
                 logger.warning(f"Skipping invalid signal: {sig_data} - {e}")
         
         # Extraer market_view
-        mv_str = data.get("market_view", "uncertain").lower()
-        try:
-            market_view = MarketView(mv_str)
-        except ValueError:
-            market_view = MarketView.UNCERTAIN
+        mv_str = str(data.get("market_view", "uncertain")).lower()
+        market_view = _MV_MAP.get(mv_str, MarketView.UNCERTAIN)
         
         # Construir reasoning completo
         reasoning_parts = []
@@ -461,6 +824,26 @@ class ClaudeCliAgent(LLMAgent):
             execution_time_ms=exec_time
         )
 
+    def _create_error_decision(
+        self,
+        error: Exception,
+        response_text: str,
+        tokens: int,
+        exec_time: int
+    ) -> AgentDecision:
+        """Decisión neutral (sin señales) cuando falla la llamada."""
+        return AgentDecision(
+            decision_id=f"err_{int(time.time())}",
+            timestamp=datetime.now(timezone.utc),
+            market_view=MarketView.UNCERTAIN,
+            confidence=0.0,
+            reasoning=f"Error executing Claude CLI: {str(error)}\n\nPartial response: {response_text[:500] if response_text else 'None'}",
+            signals=[],
+            model_used=self._model,
+            tokens_used=tokens,
+            execution_time_ms=exec_time
+        )
+
     def _create_fallback_decision(
         self,
         response_text: str,
@@ -6,13 +6,14 @@ and search queries.
 """
 
 import logging
-import json
 from dataclasses import dataclass, asdict, field
 from datetime import datetime, date, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 import os
 
+from src.shared.json_utils import JSONDecodeError, read_json, write_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,11 +134,10 @@ class CostTracker:
             # Load existing
             data = {"records": [], "summary": {}}
             if file_path.exists():
-                with open(file_path, 'r') as f:
-                    try:
-                        data = json.load(f)
-                    except json.JSONDecodeError:
-                        pass
+                try:
+                    data = read_json(file_path)
+                except JSONDecodeError:
+                    pass
             
             # Append new record
             # Convert TokenUsage to dict for JSON serialization
@@ -157,8 +157,7 @@ class CostTracker:
             data["summary"] = summary
             
             # Write back
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            write_json(file_path, data, indent=True)
                 
         except Exception as e:
             logger.error(f"Failed to save cost record: {e}")
@@ -192,9 +191,8 @@ class CostTracker:
             return {"total_cost_usd": 0.0, "total_tokens": 0, "total_searches": 0}
             
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                return data.get("summary", {})
+            data = read_json(file_path)
+            return data.get("summary", {})
         except Exception:
             return {}
 
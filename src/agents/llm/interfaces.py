@@ -8,7 +8,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Sequence
+import asyncio
 import json
 
 from src.strategies.interfaces import Signal, SignalDirection
@@ -356,11 +357,16 @@ class LLMAgent(ABC):
     Clase base abstracta para agentes basados en LLM.
     """
     
+    # Decisiones en vuelo por defecto en decide_batch()
+    default_batch_concurrency: int = 8
+    
     @abstractmethod
     async def decide(self, context: AgentContext) -> AgentDecision:
         """
         Toma una decisión de trading basada en el contexto.
         
+        Los errores no se propagan: llegan como AgentDecision de error.
+        
         Args:
             context: Contexto completo del mercado y portfolio
             
@@ -369,6 +375,32 @@ class LLMAgent(ABC):
         """
         pass
     
+    async def decide_batch(
+        self,
+        contexts: Sequence[AgentContext],
+        max_concurrency: Optional[int] = None
+    ) -> List[AgentDecision]:
+        """
+        Toma varias decisiones a la vez.
+        
+        Por defecto lanza decide() concurrentemente, como mucho
+        max_concurrency en vuelo (default_batch_concurrency si no se indica).
+        
+        Args:
+            contexts: Contextos a decidir
+            max_concurrency: Máximo de decisiones en vuelo
+            
+        Returns:
+            Una AgentDecision por contexto, en el mismo orden que ``contexts``
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.default_batch_concurrency)
+        
+        async def bounded(context: AgentContext) -> AgentDecision:
+            async with semaphore:
+                return await self.decide(context)
+        
+        return list(await asyncio.gather(*(bounded(c) for c in contexts)))
+    
     @property
     @abstractmethod
     def agent_id(self) -> str:
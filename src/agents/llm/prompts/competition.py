@@ -266,7 +266,8 @@ Responde con JSON:
 def build_competition_prompt(
     context_data: str,
     current_datetime: Optional[datetime] = None,
-    additional_instructions: Optional[str] = None
+    additional_instructions: Optional[str] = None,
+    include_system_prompt: bool = True
 ) -> str:
     """
     Construye el prompt completo para una sesión de trading.
@@ -275,11 +276,13 @@ def build_competition_prompt(
         context_data: Datos del contexto (portfolio, mercado, etc.)
         current_datetime: Fecha/hora actual (para calcular ventana de trading)
         additional_instructions: Instrucciones adicionales opcionales
+        include_system_prompt: Si anteponer COMPETITION_SYSTEM_PROMPT (False
+            cuando se envía aparte como system, p.ej. vía API)
         
     Returns:
         Prompt completo listo para enviar a Claude Code
     """
-    parts = [COMPETITION_SYSTEM_PROMPT]
+    parts = [COMPETITION_SYSTEM_PROMPT] if include_system_prompt else []
     
     # Añadir contexto de datos
     parts.append("\n" + "="*79)
@@ -6,7 +6,6 @@ automatic Pydantic model serialization/deserialization.
 """
 
 import redis
-import json
 import logging
 import asyncio
 from typing import Callable, Dict, Any, Optional
@@ -21,6 +20,12 @@ from .schemas import (
     AgentStatus
 )
 
+# Import JSON helpers - try relative first, then absolute
+try:
+    from ..shared.json_utils import loads
+except ImportError:
+    from shared.json_utils import loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -178,15 +183,13 @@ class MessageBus:
                 logger.warning(f"No handler for channel '{channel}'")
                 return
             
-            # Deserialize JSON
-            json_data = json.loads(data)
-            
             # Get appropriate Pydantic model for this channel
             model_class = CHANNEL_MODELS.get(channel)
             
             if model_class:
-                # Deserialize to Pydantic model
-                model_instance = model_class(**json_data)
+                # Deserialize straight to Pydantic model (single pass in
+                # pydantic-core, no intermediate dict)
+                model_instance = model_class.model_validate_json(data)
                 
                 # Call handler with model
                 handler = self._handlers[channel]
@@ -197,6 +200,7 @@ class MessageBus:
             else:
                 # No model defined, pass raw dict
                 logger.warning(f"No Pydantic model for channel '{channel}', passing raw dict")
+                json_data = loads(data)
                 handler = self._handlers[channel]
                 if asyncio.iscoroutinefunction(handler):
                     await handler(json_data)
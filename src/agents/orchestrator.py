@@ -12,7 +12,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
-from .base import BaseAgent
+from .base import BaseAgent, prune_stale_agents
 from .messaging import MessageBus
 from .schemas import TradingSignal, RiskRequest, RiskResponse, Decision
 
@@ -122,9 +122,11 @@ class OrchestratorAgent(BaseAgent):
         """
         Background maintenance loop.
         
-        Cleans up expired pending validations.
+        Cleans up expired pending validations and the heartbeats of agents
+        that died without stopping cleanly.
         """
         await self._cleanup_expired()
+        self._prune_dead_agents()
         await asyncio.sleep(10)
     
     async def _handle_signal(self, signal: TradingSignal):
@@ -353,6 +355,16 @@ class OrchestratorAgent(BaseAgent):
                 f"(age: {pending_age:.0f}s)"
             )
     
+    def _prune_dead_agents(self):
+        """Remove agents with stale heartbeats from the monitoring keys."""
+        try:
+            stale = prune_stale_agents(self.redis)
+        except Exception as e:
+            self.logger.warning(f"Failed to prune stale agents: {e}")
+            return
+        for name in stale:
+            self.logger.warning(f"Agent '{name}' stopped sending heartbeats, removed from monitoring")
+    
     async def _load_state(self):
         """Load previous state from Redis (if exists)."""
         try:
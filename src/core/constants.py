@@ -71,7 +71,8 @@ SECTOR_WARNING_THRESHOLD_PCT = 0.30  # Warn when sector exposure > 30%
 
 # ===== Redis Key Patterns =====
 
-REDIS_KEY_PREFIX_HEARTBEAT = "agent:heartbeat:"  # Heartbeat key pattern
+REDIS_KEY_HEARTBEATS = "agent:heartbeats"  # Heartbeat payloads hash (field = agent name)
+REDIS_KEY_HEARTBEATS_TS = "agent:heartbeats:ts"  # Last heartbeat time sorted set (score = epoch)
 REDIS_KEY_PREFIX_POSITIONS = "positions"  # Current positions hash
 REDIS_KEY_PORTFOLIO_CAPITAL = "portfolio:capital"  # Current capital
 REDIS_KEY_PORTFOLIO_VALUE_HISTORY = "portfolio:value_history"  # Value history list
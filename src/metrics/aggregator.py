@@ -70,7 +70,7 @@ class MetricsAggregator:
         # TODO: Implementar ventanas de tiempo (daily, weekly, etc.)
         
         trades = await conn.fetch("""
-            SELECT pnl_eur, pnl_pct, exit_time, entry_time
+            SELECT pnl_eur, pnl_pct
             FROM metrics.trades
             WHERE strategy_id = $1 AND status = 'CLOSED'
             ORDER BY exit_time ASC
@@ -79,9 +79,15 @@ class MetricsAggregator:
         if not trades:
             return
             
-        # Extraer datos para calculadoras
-        pnl_eur = [float(t['pnl_eur']) for t in trades if t['pnl_eur'] is not None]
-        pnl_pct = [float(t['pnl_pct']) for t in trades if t['pnl_pct'] is not None]
+        # Extraer datos para calculadoras (una sola pasada sobre las filas)
+        pnl_eur: List[float] = []
+        pnl_pct: List[float] = []
+        for t in trades:
+            eur, pct = t['pnl_eur'], t['pnl_pct']
+            if eur is not None:
+                pnl_eur.append(float(eur))
+            if pct is not None:
+                pnl_pct.append(float(pct))
         
         # Calcular métricas
         metrics = {
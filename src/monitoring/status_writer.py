@@ -6,13 +6,13 @@ Dashboard process to monitor the Strategy Lab status in real-time.
 """
 
 
-import json
 import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Optional, Dict
 
 from src.shared.infrastructure.redis_client import get_redis_client
+from src.shared.json_utils import dumps
 
 logger = logging.getLogger(__name__)
 
@@ -118,7 +118,7 @@ class StatusWriter:
             self.redis.setex(
                 self.redis_key,
                 60, 
-                json.dumps(status)
+                dumps(status)
             )
         except Exception as e:
             logger.error(f"Failed to write system status to Redis: {e}")
@@ -8,10 +8,15 @@ Reads configuration from environment variables.
 import os
 import redis
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+
+# Timeouts of the health probe: fail fast when Redis is down
+HEALTH_CHECK_TIMEOUT_SECONDS = 1
+
 class RedisClient:
     _instance: Optional['RedisClient'] = None
     _client: Optional[redis.Redis] = None
@@ -26,7 +31,7 @@ class RedisClient:
         if self._client is not None:
             return
 
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        redis_url = os.getenv("REDIS_URL", DEFAULT_REDIS_URL)
         try:
             self._client = redis.from_url(
                 redis_url, 
@@ -54,6 +59,45 @@ class RedisClient:
         except Exception:
             return False
 
+    def health_check(self) -> Dict[str, Any]:
+        """
+        Check connection and fetch server info in a single round trip.
+
+        Uses a short-lived probe connection with 1s connect/read timeouts
+        (the shared client waits longer), so a down Redis is reported
+        quickly. PING and INFO are queued on one pipeline so the server
+        answers both with one network RTT.
+        """
+        probe = None
+        try:
+            probe = redis.from_url(
+                os.getenv("REDIS_URL", DEFAULT_REDIS_URL),
+                decode_responses=True,
+                socket_connect_timeout=HEALTH_CHECK_TIMEOUT_SECONDS,
+                socket_timeout=HEALTH_CHECK_TIMEOUT_SECONDS
+            )
+            pipe = probe.pipeline(transaction=False)
+            pipe.ping()
+            pipe.info("server")
+            pong, info = pipe.execute()
+            if not pong:
+                return {"status": "unhealthy", "redis_connected": False}
+            return {
+                "status": "healthy",
+                "redis_connected": True,
+                "redis_version": info.get("redis_version"),
+                "uptime_seconds": info.get("uptime_in_seconds"),
+            }
+        except Exception as e:
+            return {
+                "status": "unhealthy",
+                "redis_connected": False,
+                "error": str(e)
+            }
+        finally:
+            if probe is not None:
+                probe.close()
+
 # Global accessor
 def get_redis_client() -> redis.Redis:
     return RedisClient().get_client()
@@ -0,0 +1,189 @@
+"""
+JSON helpers.
+
+Uses orjson when it is installed (faster parsing/serialization, bytes in
+and out, no intermediate str) and falls back to the stdlib json module.
+Both backends serialize the same way: compact UTF-8, numpy scalars and
+arrays as plain numbers/lists, non-str scalar dict keys as strings,
+datetimes as ISO-8601 and Enums as their value.
+"""
+
+import datetime
+import mmap
+import os
+import tempfile
+from enum import Enum
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+JSONDecodeError = ValueError
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """
+    Fallback for types neither backend handles natively.
+
+    orjson already covers datetimes, Enums and C-contiguous numpy arrays;
+    this hook gives the stdlib backend the same coverage and handles the
+    leftovers (e.g. non-contiguous arrays) for orjson.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if np is not None:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes (2-space indent if requested)."""
+    if orjson is not None:
+        option = (_ORJSON_OPTIONS | orjson.OPT_INDENT_2) if indent else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj,
+        default=_default,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+    ).encode("utf-8")
+
+
+def find_json_span(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced ``{...}`` object at or after ``start``.
+
+    Single left-to-right pass that tracks brace depth and string/escape
+    state, so braces inside strings are ignored. Returns the inclusive
+    ``(begin, end)`` indices, or None if no complete object is found.
+    """
+    begin = text.find("{", start)
+    if begin == -1:
+        return None
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(begin, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, i
+    return None
+
+
+def find_json_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Locate every balanced ``{...}`` object in ``text``, nested ones included.
+
+    Single left-to-right pass with a stack of open-brace positions and the
+    same string/escape tracking as find_json_span, so unbalanced braces do
+    not trigger rescans. Returns inclusive ``(begin, end)`` indices in the
+    order the objects close (inner objects before the ones enclosing them).
+    """
+    spans = []
+    stack = []
+    in_string = False
+    escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == "{":
+            stack.append(i)
+        elif ch == "}":
+            if stack:
+                spans.append((stack.pop(), i))
+        elif ch == '"' and stack:
+            in_string = True
+    return spans
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file."""
+    return loads(Path(path).read_bytes())
+
+
+def read_json_mmap(path: Union[str, Path]) -> Any:
+    """
+    Read and parse a JSON file through a read-only memory map.
+
+    The parser reads straight from the mapped pages, skipping the copy into
+    an intermediate bytes buffer. Empty files cannot be mapped (Windows), so
+    they are parsed as-is to raise the usual decode error.
+    """
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is None:
+                return json.loads(mm[:])
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def write_json(path: Union[str, Path], obj: Any, indent: bool = False):
+    """Serialize ``obj`` and write it to ``path``."""
+    Path(path).write_bytes(dumps(obj, indent=indent))
+
+
+def atomic_write_json(path: Union[str, Path], obj: Any, indent: bool = False):
+    """
+    Serialize ``obj`` and replace ``path`` atomically.
+
+    The bytes go to a uniquely named ``.tmp`` file in the same directory
+    that is then renamed over the target with os.replace, so concurrent
+    readers (e.g. the Dashboard) see either the old or the new document,
+    never a partial write, and concurrent writers do not clobber each
+    other's temp file. The temp file is removed if the write fails.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dumps(obj, indent=indent))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
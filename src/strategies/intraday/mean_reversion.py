@@ -38,26 +38,30 @@ class MeanReversionIntraday(IntraDayStrategy):
         std_dev = 2.0
         rsi_period = 14
         
-        # Calcular indicadores
-        closes = market_data['close']
-        sma = closes.rolling(window=period).mean()
-        std = closes.rolling(window=period).std()
+        # Solo la última ventana determina la señal de entrada: en lugar de
+        # calcular las series rolling completas, se evalúa la cola del array.
+        closes = market_data['close'].to_numpy(dtype=float)
+        if len(closes) < max(period, rsi_period + 1):
+            return signals
         
-        upper_band = sma + (std * std_dev)
-        lower_band = sma - (std * std_dev)
+        tail = closes[-period:]
+        current_sma = tail.mean()
+        current_std = tail.std(ddof=1)  # Igual que rolling().std()
         
-        # RSI
-        delta = closes.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
+        current_upper = current_sma + (current_std * std_dev)
+        current_lower = current_sma - (current_std * std_dev)
+        
+        # RSI (media simple de las últimas `rsi_period` variaciones)
+        delta = np.diff(closes[-(rsi_period + 1):])
+        gain = np.where(delta > 0, delta, 0.0).mean()
+        loss = np.where(delta < 0, -delta, 0.0).mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = gain / loss
+            current_rsi = 100 - (100 / (1 + rs))
         
         # Últimos valores
-        current_price = closes.iloc[-1]
-        current_rsi = rsi.iloc[-1]
-        current_lower = lower_band.iloc[-1]
-        current_upper = upper_band.iloc[-1]
+        current_price = closes[-1]
+        zscore = (current_price - current_sma) / current_std if current_std else np.nan
         
         # Lógica de entrada LONG
         # Precio < Banda Inferior AND RSI < 30 (sobreventa)
@@ -69,10 +73,10 @@ class MeanReversionIntraday(IntraDayStrategy):
                 confidence=0.7,
                 entry_price=current_price,
                 stop_loss=current_price * 0.99, # Stop ajustado 1%
-                take_profit=sma.iloc[-1],       # Target a la media
+                take_profit=current_sma,        # Target a la media
                 reasoning=f"Price below lower BB ({current_lower:.2f}) and RSI oversold ({current_rsi:.1f})",
                 regime_at_signal=regime,
-                metadata={"rsi": current_rsi, "zscore": (current_price - sma.iloc[-1]) / std.iloc[-1]}
+                metadata={"rsi": current_rsi, "zscore": zscore}
             ))
             
         # Lógica de entrada SHORT
@@ -85,10 +89,10 @@ class MeanReversionIntraday(IntraDayStrategy):
                 confidence=0.7,
                 entry_price=current_price,
                 stop_loss=current_price * 1.01, # Stop ajustado 1%
-                take_profit=sma.iloc[-1],       # Target a la media
+                take_profit=current_sma,        # Target a la media
                 reasoning=f"Price above upper BB ({current_upper:.2f}) and RSI overbought ({current_rsi:.1f})",
                 regime_at_signal=regime,
-                metadata={"rsi": current_rsi, "zscore": (current_price - sma.iloc[-1]) / std.iloc[-1]}
+                metadata={"rsi": current_rsi, "zscore": zscore}
             ))
             
         return signals
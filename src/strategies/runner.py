@@ -14,7 +14,6 @@ import asyncio
 from datetime import datetime, date, timezone
 from typing import Optional
 import logging
-import json
 from pathlib import Path
 
 from .interfaces import (
@@ -26,6 +25,7 @@ from .interfaces import (
 )
 from .registry import StrategyRegistry
 from .config import get_strategy_config
+from src.shared.json_utils import atomic_write_json
 
 # Import strategies to ensure registration
 import src.strategies.swing.hmm_rules_strategy
@@ -299,8 +299,7 @@ class StrategyRunner:
             }
             
             self.signals_cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.signals_cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            atomic_write_json(self.signals_cache_file, data, indent=True)
                 
         except Exception as e:
             logger.error(f"Error persisting signals cache: {e}")
@@ -24,6 +24,7 @@ from pathlib import Path
 from ..data.symbols import SymbolRegistry, Symbol
 from ..strategies.interfaces import MarketRegime
 from src.shared.infrastructure.redis_client import get_redis_client
+from src.shared.json_utils import atomic_write_json
 
 logger = logging.getLogger(__name__)
 
@@ -293,8 +294,7 @@ class UniverseManager:
         # Write to File (Legacy/Backup)
         try:
             self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            atomic_write_json(self.state_file, state, indent=True)
             logger.info(f"Universe state saved to {self.state_file}")
         except Exception as e:
             logger.error(f"Error saving universe state: {e}")
@@ -0,0 +1,68 @@
+"""Utilidades compartidas por los tests de los agentes CLI (v1 y v2)."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timezone
+
+from src.agents.llm.interfaces import (
+    AgentContext,
+    AutonomyLevel,
+    RegimeInfo,
+    RiskLimits,
+    PortfolioSummary,
+)
+
+
+def make_context(context_id: str = "ctx_1", autonomy: AutonomyLevel = AutonomyLevel.MODERATE) -> AgentContext:
+    market_mock = MagicMock()
+    market_mock.to_summary.return_value = "Market Summary"
+
+    watchlist_item = MagicMock()
+    watchlist_item.to_summary.return_value = "Symbol Summary"
+
+    return AgentContext(
+        context_id=context_id,
+        timestamp=datetime.now(timezone.utc),
+        regime=RegimeInfo("BULL", 0.8, {}, "hmm"),
+        market=market_mock,
+        portfolio=PortfolioSummary(10000, 10000, 0, (), 0, 0, 0, 0),
+        watchlist=(watchlist_item,),
+        risk_limits=RiskLimits(5.0, 2.0, 5, 3.0, 0, 0),
+        autonomy_level=autonomy
+    )
+
+
+def event_line(event: dict) -> bytes:
+    """Línea stream-json compacta, como la emite el CLI."""
+    return json.dumps(event, separators=(",", ":")).encode() + b"\n"
+
+
+class FakeProcess:
+    """Proceso CLI simulado: stdout es un StreamReader que alimenta el test."""
+
+    def __init__(self, output: bytes = b"", eof: bool = False):
+        self.pid = 1234
+        self.returncode = None
+        self.stdout = asyncio.StreamReader()
+        if output:
+            self.stdout.feed_data(output)
+        if eof:
+            self.stdout.feed_eof()
+        self.stdin = MagicMock()
+        self.stdin.is_closing.return_value = False
+        self.stdin.drain = AsyncMock()
+        self.stdin.wait_closed = AsyncMock()
+        self.written = self.stdin.write.call_args_list
+        self.kill = MagicMock(side_effect=self._killed)
+
+    def _killed(self):
+        self.returncode = -9
+
+    async def wait(self):
+        if self.returncode is None:
+            self.returncode = 0
+        return self.returncode
+
+    def sent_contents(self) -> list:
+        return [json.loads(call.args[0])["message"]["content"] for call in self.written]
@@ -1,8 +1,11 @@
 """Tests para ClaudeAgent."""
 
+import asyncio
+import dataclasses
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
 from src.agents.llm.agents.claude_agent import ClaudeAgent
 from src.agents.llm.interfaces import (
@@ -16,11 +19,37 @@ from src.agents.llm.interfaces import (
 from src.strategies.interfaces import SignalDirection
 
 
+class FakeStream:
+    """Simula client.messages.stream() emitiendo los bloques de una respuesta."""
+    
+    def __init__(self, response):
+        self.response = response
+        self.current_message_snapshot = response
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    async def __aiter__(self):
+        for block in self.response.content:
+            yield SimpleNamespace(type="content_block_start", content_block=block)
+            if block.type == "text":
+                # Emitir en dos fragmentos para ejercitar el scanner
+                half = len(block.text) // 2
+                yield SimpleNamespace(type="text", text=block.text[:half])
+                yield SimpleNamespace(type="text", text=block.text[half:])
+    
+    async def get_final_message(self):
+        return self.response
+
+
 @pytest.fixture
 def mock_anthropic():
     with patch("src.agents.llm.agents.claude_agent.anthropic.AsyncAnthropic") as mock:
         client = MagicMock()
-        client.messages.create = AsyncMock()
+        client.messages.stream = MagicMock()
         mock.return_value = client
         yield client
 
@@ -74,7 +103,7 @@ async def test_decide_success(mock_anthropic, sample_context):
     mock_response.usage.input_tokens = 100
     mock_response.usage.output_tokens = 50
     
-    mock_anthropic.messages.create.return_value = mock_response
+    mock_anthropic.messages.stream.return_value = FakeStream(mock_response)
     
     agent = ClaudeAgent(api_key="test_key")
     decision = await agent.decide(sample_context)
@@ -88,6 +117,160 @@ async def test_decide_success(mock_anthropic, sample_context):
     assert decision.signals[0].direction == SignalDirection.LONG
 
 
+@pytest.mark.asyncio
+async def test_decide_ignores_non_decision_json_in_stream(mock_anthropic, sample_context):
+    text_block = MagicMock()
+    text_block.type = "text"
+    text_block.text = (
+        'Considering {"symbol": "AAPL", "note": "earnings"} first.\n'
+        '{"market_view": "bullish", "confidence": 0.7, "reasoning": "Decision", "signals": []}'
+    )
+    mock_response = MagicMock()
+    mock_response.content = [text_block]
+    mock_response.usage.input_tokens = 100
+    mock_response.usage.output_tokens = 50
+    mock_anthropic.messages.stream.return_value = FakeStream(mock_response)
+    
+    agent = ClaudeAgent(api_key="test_key")
+    decision = await agent.decide(sample_context)
+    
+    assert decision.market_view == MarketView.BULLISH
+    assert decision.reasoning == "Decision"
+
+
+@pytest.mark.asyncio
+async def test_decide_submit_decision_tool(mock_anthropic, sample_context):
+    tool_block = MagicMock()
+    tool_block.type = "tool_use"
+    tool_block.name = "submit_decision"
+    tool_block.input = {
+        "market_view": "bearish",
+        "confidence": 0.6,
+        "reasoning": "Tool reasoning",
+        "signals": [{"symbol": "MSFT", "direction": "SHORT", "confidence": 0.6,
+                     "entry_price": 300.0, "stop_loss": 310.0, "take_profit": 280.0}]
+    }
+    mock_response = MagicMock()
+    mock_response.content = [tool_block]
+    mock_response.usage.input_tokens = 100
+    mock_response.usage.output_tokens = 50
+    
+    mock_anthropic.messages.stream.return_value = FakeStream(mock_response)
+    
+    agent = ClaudeAgent(api_key="test_key")
+    decision = await agent.decide(sample_context)
+    
+    assert decision.market_view == MarketView.BEARISH
+    assert decision.reasoning == "Tool reasoning"
+    assert decision.signals[0].direction == SignalDirection.SHORT
+    assert decision.tokens_used == 150
+    # La tool de decisión se ofrece junto a la de búsqueda
+    tools = mock_anthropic.messages.stream.call_args.kwargs["tools"]
+    assert [t["name"] for t in tools] == ["web_search", "submit_decision"]
+
+
+@pytest.mark.asyncio
+async def test_decide_reuses_cached_decision(mock_anthropic, sample_context):
+    text_block = MagicMock()
+    text_block.type = "text"
+    text_block.text = '{"market_view": "neutral", "confidence": 0.5, "reasoning": "Cached", "signals": []}'
+    mock_response = MagicMock()
+    mock_response.content = [text_block]
+    mock_response.usage.input_tokens = 100
+    mock_response.usage.output_tokens = 50
+    mock_anthropic.messages.stream.side_effect = lambda **kwargs: FakeStream(mock_response)
+    
+    agent = ClaudeAgent(api_key="test_key")
+    first = await agent.decide(sample_context)
+    second = await agent.decide(sample_context)
+    
+    assert mock_anthropic.messages.stream.call_count == 1
+    assert second.reasoning == first.reasoning == "Cached"
+    assert second is not first
+    assert second.tokens_used == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_decision_reemits_fresh_signals(mock_anthropic, sample_context):
+    text_block = MagicMock()
+    text_block.type = "text"
+    text_block.text = (
+        '{"market_view": "bullish", "confidence": 0.7, "reasoning": "Cached", "signals": ['
+        '{"symbol": "AAPL", "direction": "LONG", "confidence": 0.7,'
+        ' "entry_price": 150.0, "stop_loss": 145.0, "take_profit": 160.0}]}'
+    )
+    mock_response = MagicMock()
+    mock_response.content = [text_block]
+    mock_response.usage.input_tokens = 100
+    mock_response.usage.output_tokens = 50
+    mock_anthropic.messages.stream.side_effect = lambda **kwargs: FakeStream(mock_response)
+    
+    agent = ClaudeAgent(api_key="test_key")
+    first = await agent.decide(sample_context)
+    second = await agent.decide(sample_context)
+    
+    assert mock_anthropic.messages.stream.call_count == 1
+    original, cloned = first.signals[0], second.signals[0]
+    assert cloned.symbol == original.symbol and cloned.entry_price == original.entry_price
+    assert cloned.signal_id != original.signal_id
+    assert cloned.created_at >= original.created_at
+    
+    # Una señal con caducidad conserva su vigencia desde el nuevo created_at
+    expiring = dataclasses.replace(original, expires_at=original.created_at + timedelta(minutes=5))
+    agent._store_decision("key", dataclasses.replace(first, signals=[expiring]))
+    cloned = agent._get_cached_decision("key").signals[0]
+    assert cloned.signal_id != expiring.signal_id
+    assert cloned.expires_at - cloned.created_at == timedelta(minutes=5)
+
+
+@pytest.mark.asyncio
+async def test_decide_single_flight(mock_anthropic, sample_context):
+    agent = ClaudeAgent(api_key="test_key")
+    calls = 0
+    
+    async def slow_decide(context, user_text):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return agent._create_decision({
+            "market_view": "bullish", "confidence": 0.7, "reasoning": "Shared",
+            "signals": [{"symbol": "AAPL", "direction": "LONG", "confidence": 0.7,
+                         "entry_price": 150.0, "stop_loss": 145.0, "take_profit": 160.0}]
+        }, context, 10, 150)
+    agent._decide_uncached = slow_decide
+    
+    first, second = await asyncio.gather(agent.decide(sample_context), agent.decide(sample_context))
+    
+    assert calls == 1
+    assert agent._inflight == {}
+    # Quien se une a la petición en curso recibe una copia con ids nuevos
+    assert second.reasoning == first.reasoning == "Shared"
+    assert second.decision_id != first.decision_id
+    assert second.signals[0].signal_id != first.signals[0].signal_id
+    assert second.signals[0].symbol == first.signals[0].symbol
+
+
+@pytest.mark.asyncio
+async def test_decide_bounded_loop_returns_error(mock_anthropic, sample_context):
+    text_block = MagicMock()
+    text_block.type = "text"
+    text_block.text = "Still thinking about the market..."
+    mock_response = MagicMock()
+    mock_response.content = [text_block]
+    mock_response.stop_reason = "max_tokens"
+    mock_response.usage.input_tokens = 10
+    mock_response.usage.output_tokens = 10
+    mock_anthropic.messages.stream.side_effect = lambda **kwargs: FakeStream(mock_response)
+    
+    agent = ClaudeAgent(api_key="test_key")
+    decision = await agent.decide(sample_context)
+    
+    assert decision is not None
+    assert decision.reasoning.startswith("ERROR")
+    assert mock_anthropic.messages.stream.call_count == 5
+    assert decision.tokens_used == 100
+
+
 @pytest.mark.asyncio
 async def test_decide_skip_volatile(mock_anthropic, sample_context):
     # Modificar contexto para VOLATILE
@@ -109,7 +292,18 @@ async def test_decide_skip_volatile(mock_anthropic, sample_context):
     assert len(decision.signals) == 0
     assert "VOLATILE" in decision.reasoning
     # No debe haber llamado a la API
-    mock_anthropic.messages.create.assert_not_called()
-
+    mock_anthropic.messages.stream.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_decide_batch_preserves_order(mock_anthropic, sample_context):
+    agent = ClaudeAgent(api_key="test_key")
+    
+    async def fake_decide(context):
+        return context.context_id
+    agent.decide = fake_decide
+    
+    contexts = [MagicMock(context_id=f"ctx_{i}") for i in range(5)]
+    results = await agent.decide_batch(contexts, max_concurrency=2)
+    
+    assert results == [f"ctx_{i}" for i in range(5)]
@@ -0,0 +1,314 @@
+"""Tests para ClaudeCliAgent (v1) y su pool de procesos."""
+
+import asyncio
+import json
+import pytest
+from collections import deque
+from unittest.mock import AsyncMock, MagicMock
+
+from src.agents.llm.agents.claude_cli_agent import (
+    ClaudeCliAgent,
+    ClaudeCliProcessPool,
+    _CLEAR_MESSAGE,
+)
+from src.agents.llm.interfaces import MarketView
+from cli_fakes import make_context, event_line, FakeProcess
+
+
+class TrackingDeque(deque):
+    """deque que recuerda su tamaño máximo (procesos en reposo del pool)."""
+
+    max_len = 0
+
+    def append(self, item):
+        super().append(item)
+        self.max_len = max(self.max_len, len(self))
+
+
+class FakeSpawner:
+    """spawn/stop simulados para el pool: registran los procesos arrancados y parados."""
+
+    def __init__(self, factory=FakeProcess):
+        self.factory = factory
+        self.started = []
+        self.stopped = []
+        self.gate = None
+
+    async def spawn(self):
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(0)
+        proc = self.factory()
+        self.started.append(proc)
+        return proc
+
+    async def stop(self, proc):
+        await asyncio.sleep(0)
+        self.stopped.append(proc)
+
+
+async def settle(rounds: int = 20):
+    """Deja correr las tareas de fondo del pool."""
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+def make_pool(spawner: FakeSpawner, size: int = 2, reuse: bool = False) -> ClaudeCliProcessPool:
+    pool = ClaudeCliProcessPool(spawner.spawn, spawner.stop, size=size, reuse=reuse)
+    pool._idle = TrackingDeque()
+    return pool
+
+
+async def reset_ok(proc):
+    return True
+
+
+async def reset_failed(proc):
+    return False
+
+
+async def reset_error(proc):
+    raise RuntimeError("boom")
+
+
+# ---------------------------------------------------------------------------
+# ClaudeCliProcessPool
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reuse", [False, True])
+async def test_pool_never_exceeds_size_idle_processes(reuse):
+    spawner = FakeSpawner()
+    pool = make_pool(spawner, size=2, reuse=reuse)
+    await pool.warmup()
+    assert len(pool._idle) == 2
+
+    for _ in range(5):
+        procs = await asyncio.gather(*(pool.acquire() for _ in range(3)))
+        await settle()
+        pool.recycle(procs[0], reset_ok)
+        pool.recycle(procs[1], reset_ok)
+        pool.release(procs[2])
+        await settle()
+        assert len(pool._idle) <= pool.size
+
+    assert pool._idle.max_len <= pool.size
+    assert len(pool._idle) == pool.size
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_recycle_with_full_pool_stops_process():
+    spawner = FakeSpawner()
+    pool = make_pool(spawner, size=1)
+    await pool.warmup()
+
+    proc = await pool.acquire()
+    # Sin reutilización se arranca un reemplazo al tomar el proceso
+    await settle()
+    assert len(pool._idle) == 1
+
+    pool.recycle(proc, reset_ok)
+    await settle()
+
+    assert proc in spawner.stopped
+    assert list(pool._idle) != [proc]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reset", [reset_failed, reset_error])
+async def test_pool_failed_reset_stops_and_refills(reset):
+    spawner = FakeSpawner()
+    pool = make_pool(spawner, size=1, reuse=True)
+    await pool.warmup()
+
+    proc = await pool.acquire()
+    await settle()
+    # Con reutilización el proceso en uso cuenta para el tamaño: no hay reemplazo
+    assert len(spawner.started) == 1
+
+    pool.recycle(proc, reset)
+    await settle()
+
+    assert spawner.stopped == [proc]
+    assert len(spawner.started) == 2
+    assert list(pool._idle) == [spawner.started[1]]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_acquire_skips_dead_idle_processes():
+    spawner = FakeSpawner()
+    pool = make_pool(spawner, size=2)
+    await pool.warmup()
+    dead, alive = spawner.started
+    dead.returncode = 1
+
+    assert await pool.acquire() is alive
+    await settle()
+    # El proceso muerto se para (libera pipes y estado), no solo se descarta
+    assert spawner.stopped == [dead]
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_health_loop_stops_and_replaces_dead_processes():
+    spawner = FakeSpawner()
+    pool = ClaudeCliProcessPool(spawner.spawn, spawner.stop, size=2, health_check_seconds=0.01)
+    await pool.warmup()
+    dead, alive = spawner.started
+    dead.returncode = 1
+
+    pool._ensure_health_task()
+    await asyncio.sleep(0.05)
+
+    assert spawner.stopped == [dead]
+    assert len(pool._idle) == 2
+    assert dead not in pool._idle and alive in pool._idle
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_close_stops_idle_and_cancels_pending_spawns():
+    spawner = FakeSpawner()
+    pool = make_pool(spawner, size=2)
+    await pool.warmup()
+    idle = list(pool._idle)
+
+    # Los arranques siguientes quedan bloqueados
+    spawner.gate = asyncio.Event()
+    proc = await pool.acquire()
+    await settle()
+    spawns = [t for t in pool._pending if t.get_name() == "cli_pool.spawn"]
+    assert len(spawns) == 1
+
+    await pool.close()
+    await settle()
+
+    assert spawner.stopped == [idle[1]]
+    assert not pool._idle
+    assert all(t.cancelled() for t in spawns)
+    assert pool._health_task.cancelled()
+
+    # Un proceso devuelto tras el cierre se para en lugar de volver al pool
+    pool.recycle(proc, reset_ok)
+    await settle()
+    assert proc in spawner.stopped
+    assert not pool._idle
+
+
+# ---------------------------------------------------------------------------
+# ClaudeCliAgent
+# ---------------------------------------------------------------------------
+
+def make_agent(processes: list, **kwargs) -> tuple:
+    """Agente cuyo pool entrega los procesos simulados en orden."""
+    agent = ClaudeCliAgent(pool_size=1, **kwargs)
+    spawner = FakeSpawner(factory=lambda: processes[len(spawner.started)])
+    agent._pool._spawn = spawner.spawn
+    agent._pool._stop = spawner.stop
+    return agent, spawner
+
+
+DECISION_TEXT = json.dumps({
+    "market_view": "bullish",
+    "confidence": 0.7,
+    "reasoning": "ok",
+    "signals": []
+})
+
+
+@pytest.mark.asyncio
+async def test_decide_kills_process_on_oversized_response():
+    output = b"".join(
+        event_line({"type": "content_block_delta", "delta": {"text": "x" * 60}})
+        for _ in range(3)
+    )
+    proc = FakeProcess(output)
+    agent, spawner = make_agent([proc], max_response_chars=100)
+
+    decision = await agent.decide(make_context())
+    await settle()
+
+    assert decision.market_view == MarketView.UNCERTAIN
+    assert decision.confidence == 0.0
+    assert "too large" in decision.reasoning
+    proc.kill.assert_called_once()
+    # Proceso muerto: se retira, no se recicla
+    assert proc in spawner.stopped
+    await agent.close()
+
+
+@pytest.mark.asyncio
+async def test_decide_recycles_process_when_reusing_sessions():
+    proc = FakeProcess(
+        event_line({"type": "assistant", "message": {"content": [{"type": "text", "text": DECISION_TEXT}]}})
+        + event_line({"type": "result", "subtype": "success"})
+    )
+    agent, spawner = make_agent([proc], max_uses_per_process=2)
+    agent._reset_session = AsyncMock(return_value=True)
+
+    decision = await agent.decide(make_context())
+    await settle()
+
+    assert decision.market_view == MarketView.BULLISH
+    # Turno terminado con 'result': el /clear no espera resultados pendientes
+    agent._reset_session.assert_awaited_once_with(proc, 0)
+    assert list(agent._pool._idle) == [proc]
+    assert not spawner.stopped
+    await agent.close()
+
+
+@pytest.mark.asyncio
+async def test_decide_discards_process_acquired_after_failure():
+    proc = FakeProcess()
+    agent, spawner = make_agent([proc])
+    spawner.gate = asyncio.Event()
+    context = make_context()
+    context.to_prompt_text = MagicMock(side_effect=ValueError("bad context"))
+
+    decision = await agent.decide(context)
+    assert "bad context" in decision.reasoning
+
+    # El proceso llega después del fallo: se retira sin usarse
+    spawner.gate.set()
+    await settle()
+    assert proc in spawner.stopped
+    assert not proc.stdin.writelines.called
+    await agent.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pending_results, results, expected", [
+    (0, 1, True),
+    (1, 2, True),
+    (1, 1, False),
+])
+async def test_reset_session_counts_pending_results(pending_results, results, expected):
+    output = b"".join(event_line({"type": "result", "subtype": "success"}) for _ in range(results))
+    proc = FakeProcess(output, eof=True)
+    agent = ClaudeCliAgent()
+
+    assert await agent._reset_session(proc, pending_results) is expected
+    proc.stdin.write.assert_called_once_with(_CLEAR_MESSAGE)
+
+
+@pytest.mark.asyncio
+async def test_decide_batch_defaults_to_pool_size_concurrency():
+    agent = ClaudeCliAgent(pool_size=2)
+    in_flight = peak = 0
+
+    async def fake_decide(context):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return context.context_id
+    agent.decide = fake_decide
+
+    results = await agent.decide_batch([make_context(f"c{i}") for i in range(5)])
+
+    assert results == [f"c{i}" for i in range(5)]
+    assert peak == 2
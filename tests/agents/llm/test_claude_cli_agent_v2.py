@@ -0,0 +1,202 @@
+"""Tests para ClaudeCliAgent (v2)."""
+
+import pytest
+from unittest.mock import AsyncMock
+from datetime import datetime, timezone
+
+from src.agents.llm.agents.claude_cli_agent_v2 import ClaudeCliAgent
+from src.agents.llm.interfaces import (
+    AgentContext,
+    AgentDecision,
+    AutonomyLevel,
+    MarketView
+)
+from cli_fakes import make_context, event_line, FakeProcess
+
+
+def turn_lines(text: str) -> bytes:
+    return (
+        event_line({"type": "assistant", "message": {"content": [{"type": "text", "text": text}]}})
+        + event_line({"type": "result", "subtype": "success"})
+    )
+
+
+def patch_processes(agent: ClaudeCliAgent, processes: list) -> list:
+    """_start_process entrega los procesos simulados en orden."""
+    started = []
+    
+    async def start():
+        agent._proc = processes[len(started)]
+        agent._running = True
+        agent._session_turns = 0
+        started.append(agent._proc)
+    
+    agent._start_process = start
+    return started
+
+
+def single_decision(context: AgentContext) -> AgentDecision:
+    """Decisión marcada con el contexto que la originó (para decide() individual)."""
+    return AgentDecision(
+        decision_id=f"single_{context.context_id}",
+        timestamp=datetime.now(timezone.utc),
+        market_view=MarketView.NEUTRAL,
+        confidence=0.5,
+        reasoning=f"single:{context.context_id}",
+        signals=[],
+        model_used="test",
+        tokens_used=0,
+        execution_time_ms=0
+    )
+
+
+@pytest.fixture
+def agent():
+    agent = ClaudeCliAgent()
+    agent.decide = AsyncMock(side_effect=single_decision)
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_decide_batch_packs_group_in_one_request(agent):
+    contexts = [make_context(f"c{i}") for i in range(3)]
+    agent._request = AsyncMock(return_value=(
+        '[{"market_view": "bullish", "confidence": 0.7, "reasoning": "r0"},'
+        ' {"market_view": "bearish", "confidence": 0.6, "reasoning": "r1"},'
+        ' {"market_view": "neutral", "confidence": 0.5, "reasoning": "r2"}]',
+        300
+    ))
+    
+    decisions = await agent.decide_batch(contexts)
+    
+    agent._request.assert_awaited_once()
+    user_message = agent._request.await_args.args[1]
+    assert "CONTEXTO_1" in user_message and "CONTEXTO_3" in user_message
+    assert [d.reasoning for d in decisions] == ["r0", "r1", "r2"]
+    assert [d.market_view for d in decisions] == [MarketView.BULLISH, MarketView.BEARISH, MarketView.NEUTRAL]
+    assert all(d.tokens_used == 100 for d in decisions)
+    agent.decide.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_decide_batch_keeps_decisions_aligned_with_invalid_items(agent):
+    contexts = [make_context(f"c{i}") for i in range(4)]
+    # Item 1 inválido y falta el item 3
+    agent._request = AsyncMock(return_value=(
+        '[{"market_view": "bullish", "reasoning": "r0"}, "x",'
+        ' {"market_view": "bearish", "reasoning": "r2"}]',
+        0
+    ))
+    
+    decisions = await agent.decide_batch(contexts)
+    
+    assert [d.reasoning for d in decisions] == ["r0", "single:c1", "r2", "single:c3"]
+    assert [call.args[0].context_id for call in agent.decide.await_args_list] == ["c1", "c3"]
+
+
+@pytest.mark.asyncio
+async def test_decide_batch_groups_by_autonomy(agent):
+    contexts = [
+        make_context("m0"),
+        make_context("k0", AutonomyLevel.CONSERVATIVE),
+        make_context("m1"),
+    ]
+    agent._request = AsyncMock(return_value=(
+        '[{"market_view": "bullish", "reasoning": "m0"}, {"market_view": "bullish", "reasoning": "m1"}]',
+        0
+    ))
+    
+    decisions = await agent.decide_batch(contexts)
+    
+    # El grupo de un solo contexto va por decide(); el resto en un turno
+    agent._request.assert_awaited_once()
+    assert [d.reasoning for d in decisions] == ["m0", "single:k0", "m1"]
+
+
+@pytest.mark.asyncio
+async def test_decide_batch_without_array_decides_one_by_one(agent):
+    contexts = [make_context(f"c{i}") for i in range(2)]
+    agent._request = AsyncMock(return_value=("no JSON here", 0))
+    
+    decisions = await agent.decide_batch(contexts)
+    
+    assert [d.reasoning for d in decisions] == ["single:c0", "single:c1"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('[{"a": 1}, {"b": 2}]', [{"a": 1}, {"b": 2}]),
+    ('Aquí tienes:\n```json\n[{"a": 1}]\n```', [{"a": 1}]),
+    ('Decisiones: [{"a": 1}] fin', [{"a": 1}]),
+    ('{"decisions": [{"a": 1}]}', [{"a": 1}]),
+    ('{"market_view": "bullish"}', None),
+    ('sin json', None),
+    ('', None),
+])
+def test_extract_json_array(text, expected):
+    assert ClaudeCliAgent()._extract_json_array(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    'Pienso {"symbol": "AAPL"} y decido {"market_view": "bullish", "signals": []}',
+    '{ sin cerrar ' * 20000 + '{"market_view": "bullish", "signals": [{"a": {}}]}',
+])
+def test_extract_json_finds_decision_object(text):
+    assert ClaudeCliAgent()._extract_json(text)["market_view"] == "bullish"
+
+
+@pytest.mark.asyncio
+async def test_reused_session_clears_context_between_turns():
+    agent = ClaudeCliAgent(session_strategy="reused")
+    proc = FakeProcess(
+        turn_lines("first")
+        + event_line({"type": "result", "subtype": "success", "result": ""})  # /clear
+        + turn_lines("second")
+    )
+    started = patch_processes(agent, [proc])
+    
+    assert await agent._request_cli("message 1") == "first"
+    assert await agent._request_cli("message 2") == "second"
+    
+    assert started == [proc]
+    assert proc.sent_contents() == ["message 1", "/clear", "message 2"]
+
+
+@pytest.mark.asyncio
+async def test_reused_session_restarts_process_when_reset_fails():
+    agent = ClaudeCliAgent(session_strategy="reused")
+    dying = FakeProcess(turn_lines("first"), eof=True)  # muere sin confirmar /clear
+    fresh = FakeProcess(turn_lines("second"))
+    started = patch_processes(agent, [dying, fresh])
+    
+    assert await agent._request_cli("message 1") == "first"
+    assert await agent._request_cli("message 2") == "second"
+    
+    assert started == [dying, fresh]
+    assert dying.sent_contents() == ["message 1", "/clear"]
+    assert fresh.sent_contents() == ["message 2"]
+
+
+@pytest.mark.asyncio
+async def test_isolated_session_never_sends_clear():
+    agent = ClaudeCliAgent()
+    first, second = FakeProcess(turn_lines("first")), FakeProcess(turn_lines("second"))
+    started = patch_processes(agent, [first, second])
+    
+    assert await agent._request_cli("message 1") == "first"
+    assert await agent._request_cli("message 2") == "second"
+    
+    assert started == [first, second]
+    assert first.sent_contents() == ["message 1"]
+    assert second.sent_contents() == ["message 2"]
+
+
+@pytest.mark.asyncio
+async def test_close_stops_process_and_client():
+    agent = ClaudeCliAgent()
+    agent._stop_process = AsyncMock()
+    agent._client = AsyncMock()
+    
+    await agent.close()
+    
+    agent._stop_process.assert_awaited_once()
+    agent._client.close.assert_awaited_once()
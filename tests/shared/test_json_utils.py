@@ -0,0 +1,133 @@
+"""Tests para src.shared.json_utils."""
+
+import json
+from datetime import datetime, timezone
+from enum import Enum
+
+import numpy as np
+import pytest
+
+from src.shared import json_utils
+from src.shared.json_utils import (
+    atomic_write_json,
+    dumps,
+    find_json_span,
+    find_json_spans,
+    loads,
+    read_json,
+    read_json_mmap,
+)
+
+
+class Color(Enum):
+    RED = "red"
+
+
+SAMPLE = {
+    "price": np.float64(101.25),
+    "qty": np.int64(3),
+    "flag": np.bool_(True),
+    "series": np.array([1.5, 2.5]),
+    "column": np.arange(6).reshape(2, 3)[:, 0],  # no contiguo
+    1: "int key",
+    "at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "color": Color.RED,
+    "text": "año",
+}
+
+EXPECTED = {
+    "price": 101.25,
+    "qty": 3,
+    "flag": True,
+    "series": [1.5, 2.5],
+    "column": [0, 3],
+    "1": "int key",
+    "at": "2025-01-02T03:04:05+00:00",
+    "color": "red",
+    "text": "año",
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Ejecuta el test con orjson y con el fallback de la stdlib."""
+    if request.param == "orjson":
+        if json_utils.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(json_utils, "orjson", None)
+        monkeypatch.setattr(json_utils, "json", json, raising=False)
+    return request.param
+
+
+def test_dumps_serializes_numpy_and_non_str_keys(backend):
+    data = dumps(SAMPLE)
+    assert isinstance(data, bytes)
+    assert json.loads(data) == EXPECTED
+
+
+def test_dumps_output_is_backend_independent(monkeypatch):
+    if json_utils.orjson is None:
+        pytest.skip("orjson not installed")
+    compact, indented = dumps(SAMPLE), dumps(SAMPLE, indent=True)
+    monkeypatch.setattr(json_utils, "orjson", None)
+    monkeypatch.setattr(json_utils, "json", json, raising=False)
+    assert dumps(SAMPLE) == compact
+    assert dumps(SAMPLE, indent=True) == indented
+
+
+def test_dumps_rejects_unknown_types(backend):
+    with pytest.raises(TypeError):
+        dumps({"obj": object()})
+
+
+def test_loads_accepts_bytes_and_str(backend):
+    assert loads(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+    assert loads('{"a": "ñ"}') == {"a": "ñ"}
+    with pytest.raises(json_utils.JSONDecodeError):
+        loads(b"{not json")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1}', (0, 7)),
+    ('prefix {"a": {"b": "}"}} suffix', (7, 23)),
+    ('{"s": "\\"{"}', (0, 11)),
+    ('no object here', None),
+    ('{"unclosed": 1', None),
+])
+def test_find_json_span(text, expected):
+    assert find_json_span(text) == expected
+
+
+def test_find_json_span_from_start():
+    text = '{"a": 1} {"b": 2}'
+    assert find_json_span(text, 1) == (9, 16)
+
+
+def test_find_json_spans_records_nested_and_skips_unbalanced():
+    text = 'x { open {"a": {"b": "}{"}} y {} }}'
+    assert find_json_spans(text) == [(15, 25), (9, 26), (30, 31), (2, 33)]
+    assert find_json_spans('{ never closed {"a": 1}') == [(15, 22)]
+    assert find_json_spans("no braces") == []
+
+
+def test_atomic_write_json_round_trip(tmp_path, backend):
+    path = tmp_path / "state.json"
+    path.write_text('{"old": true}')
+    
+    atomic_write_json(path, SAMPLE, indent=True)
+    
+    assert read_json(path) == EXPECTED
+    assert read_json_mmap(path) == EXPECTED
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_write_json_failure_keeps_target_and_removes_temp(tmp_path, backend):
+    path = tmp_path / "state.json"
+    path.write_text('{"old": true}')
+    
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"bad": object()})
+    
+    assert read_json(path) == {"old": True}
+    assert list(tmp_path.iterdir()) == [path]
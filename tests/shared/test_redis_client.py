@@ -0,0 +1,65 @@
+"""Tests para RedisClient.health_check."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from src.shared.infrastructure.redis_client import HEALTH_CHECK_TIMEOUT_SECONDS, RedisClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Instancia nueva del singleton, sin conexión real."""
+    monkeypatch.setattr(RedisClient, "_instance", None)
+    monkeypatch.setattr(RedisClient, "_client", None)
+    monkeypatch.setenv("REDIS_URL", "redis://redis-test:6379/0")
+    with patch("src.shared.infrastructure.redis_client.redis.from_url", return_value=MagicMock()):
+        yield RedisClient()
+
+
+def make_probe(result=None, error=None):
+    probe = MagicMock()
+    pipe = probe.pipeline.return_value
+    if error is not None:
+        pipe.execute.side_effect = error
+    else:
+        pipe.execute.return_value = result
+    return probe
+
+
+def test_health_check_pipelines_ping_and_info(client):
+    probe = make_probe([True, {"redis_version": "7.2.4", "uptime_in_seconds": 42}])
+    with patch("src.shared.infrastructure.redis_client.redis.from_url", return_value=probe) as from_url:
+        health = client.health_check()
+    
+    assert health == {
+        "status": "healthy",
+        "redis_connected": True,
+        "redis_version": "7.2.4",
+        "uptime_seconds": 42,
+    }
+    # Sonda con timeouts cortos, una sola ida y vuelta, y conexión cerrada
+    from_url.assert_called_once()
+    assert from_url.call_args.args[0] == "redis://redis-test:6379/0"
+    assert from_url.call_args.kwargs["socket_connect_timeout"] == HEALTH_CHECK_TIMEOUT_SECONDS == 1
+    probe.pipeline.assert_called_once_with(transaction=False)
+    probe.pipeline.return_value.execute.assert_called_once()
+    probe.close.assert_called_once()
+
+
+def test_health_check_reports_unreachable_redis(client):
+    probe = make_probe(error=redis.ConnectionError("Connection refused"))
+    with patch("src.shared.infrastructure.redis_client.redis.from_url", return_value=probe):
+        health = client.health_check()
+    
+    assert health["status"] == "unhealthy"
+    assert health["redis_connected"] is False
+    assert "Connection refused" in health["error"]
+    probe.close.assert_called_once()
+
+
+def test_health_check_without_pong_is_unhealthy(client):
+    probe = make_probe([False, {}])
+    with patch("src.shared.infrastructure.redis_client.redis.from_url", return_value=probe):
+        assert client.health_check() == {"status": "unhealthy", "redis_connected": False}
@@ -0,0 +1,40 @@
+"""Tests para StrategyRunner."""
+
+import json
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from src.strategies.interfaces import Signal, SignalDirection, MarketRegime
+from src.strategies.runner import StrategyRunner
+
+
+@pytest.mark.asyncio
+async def test_persist_signals_cache_with_numpy_values(tmp_path):
+    """Las señales con escalares numpy (SMA/RSI calculados con numpy) se persisten."""
+    runner = StrategyRunner(mcp_client=AsyncMock())
+    runner.signals_cache_file = tmp_path / "signals_cache.json"
+    
+    signal = Signal(
+        strategy_id="mean_reversion_intraday",
+        symbol="SPY",
+        direction=SignalDirection.LONG,
+        confidence=np.float64(0.7),
+        entry_price=np.float64(400.5),
+        stop_loss=np.float64(395.0),
+        take_profit=np.float64(410.0),
+        size_suggestion=np.int64(10),
+        regime_at_signal=MarketRegime.SIDEWAYS,
+        indicators={"sma": np.float64(402.1), "std": np.float32(3.5), "rsi": np.float64(28.4)},
+    )
+    
+    await runner._persist_signals_cache([signal])
+    
+    data = json.loads(runner.signals_cache_file.read_text())
+    assert data["count"] == 1
+    saved = data["signals"][0]
+    assert saved["entry_price"] == 400.5
+    assert saved["size_suggestion"] == 10
+    assert saved["indicators"] == {"sma": 402.1, "std": 3.5, "rsi": 28.4}
+    assert saved["risk_reward_ratio"] == pytest.approx(9.5 / 5.5)
@@ -15,7 +15,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
-from agents.base import BaseAgent
+from agents.base import BaseAgent, prune_stale_agents, run_agents
 from agents.messaging import MessageBus
 
 
@@ -92,7 +92,8 @@ class TestBaseAgentInitialization:
     
     def test_logger_name(self, test_agent):
         """Test logger is configured with agent name."""
-        assert test_agent.logger.name == "agents.test_agent"
+        assert test_agent.logger.logger.name == "agents"
+        assert test_agent.logger.extra["agent"] == "test_agent"
 
 
 class TestBaseAgentLifecycle:
@@ -143,6 +144,58 @@ class TestBaseAgentLifecycle:
         
         await test_agent.stop()
     
+    @pytest.mark.asyncio
+    async def test_start_in_task_group(self, test_agent):
+        """Test the run loop is bound to the given TaskGroup."""
+        async with asyncio.TaskGroup() as tg:
+            await test_agent.start(tg)
+            await asyncio.sleep(0.2)
+            
+            assert test_agent.process_count > 0
+            assert test_agent._task.get_name() == "agent.test_agent"
+            
+            await test_agent.stop()
+        
+        assert test_agent.running is False
+    
+    @pytest.mark.asyncio
+    async def test_run_agents_runs_and_cancels_together(self, mock_message_bus):
+        """Test run_agents runs every loop and cancelling it stops them all."""
+        agents = [ConcreteTestAgent(f"agent_{i}", {}, mock_message_bus) for i in range(2)]
+        runner = asyncio.create_task(run_agents(agents))
+        await asyncio.sleep(0.3)
+        
+        assert all(agent.setup_called for agent in agents)
+        assert all(agent.process_count > 0 for agent in agents)
+        assert not runner.done()
+        
+        runner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await runner
+        
+        assert all(agent._task.done() for agent in agents)
+        counts = [agent.process_count for agent in agents]
+        await asyncio.sleep(0.2)
+        assert [agent.process_count for agent in agents] == counts
+    
+    @pytest.mark.asyncio
+    async def test_run_agents_failed_start_cancels_the_rest(self, mock_message_bus):
+        """Test an agent failing setup() stops run_agents and the other agents."""
+        class FailingSetupAgent(ConcreteTestAgent):
+            async def setup(self):
+                raise ValueError("setup failed")
+        
+        good = ConcreteTestAgent("good_agent", {}, mock_message_bus)
+        bad = FailingSetupAgent("bad_agent", {}, mock_message_bus)
+        
+        with pytest.raises(ExceptionGroup) as exc_info:
+            await asyncio.wait_for(run_agents([good, bad]), timeout=2)
+        
+        assert exc_info.group_contains(ValueError, match="setup failed")
+        assert good._task is None or good._task.done()
+        await asyncio.sleep(0.2)
+        assert good.process_count == 0
+    
     @pytest.mark.asyncio
     async def test_last_activity_updated(self, test_agent):
         """Test that _last_activity is updated during processing."""
@@ -268,6 +321,94 @@ class TestBaseAgentErrorHandling:
         await test_agent.stop()
 
 
+class TestBaseAgentHeartbeat:
+    """Test Redis heartbeat publishing."""
+    
+    def test_heartbeat_throttled(self, mock_message_bus, mock_redis):
+        """Test heartbeats are written at most once per interval."""
+        agent = ConcreteTestAgent(
+            "hb_agent", {"heartbeat_interval_seconds": 60}, mock_message_bus, mock_redis
+        )
+        
+        agent._publish_heartbeat()
+        agent._publish_heartbeat()
+        
+        pipe = mock_redis.pipeline.return_value
+        assert pipe.execute.call_count == 1
+        key, field, _ = pipe.hset.call_args[0]
+        assert key == "agent:heartbeats"
+        assert field == "hb_agent"
+        assert "hb_agent" in pipe.zadd.call_args[0][1]
+
+
+class FakeHeartbeatRedis:
+    """In-memory stand-in for the heartbeat hash and sorted set."""
+    
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+    
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+    
+    def hdel(self, key, *fields):
+        for field in fields:
+            # Real Redis treats bytes and str field names alike
+            if isinstance(field, bytes):
+                field = field.decode()
+            self.hashes.get(key, {}).pop(field, None)
+    
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+    
+    def _below(self, key, max_score):
+        # Only the exclusive "(score" form is used by prune_stale_agents
+        limit = float(max_score.lstrip("("))
+        return [m for m, score in self.zsets.get(key, {}).items() if score < limit]
+    
+    def zrangebyscore(self, key, min_score, max_score):
+        return [m.encode() for m in self._below(key, max_score)]
+    
+    def zremrangebyscore(self, key, min_score, max_score):
+        for member in self._below(key, max_score):
+            del self.zsets[key][member]
+    
+    def pipeline(self, transaction=True):
+        redis_client = self
+        
+        class Pipeline:
+            def __init__(self):
+                self.calls = []
+            
+            def __getattr__(self, name):
+                return lambda *args: self.calls.append((name, args))
+            
+            def execute(self):
+                for name, args in self.calls:
+                    getattr(redis_client, name)(*args)
+        
+        return Pipeline()
+
+
+class TestPruneStaleAgents:
+    """Test removal of agents that stopped sending heartbeats."""
+    
+    def test_prunes_only_stale_agents(self, mock_message_bus):
+        """Test stale agents are removed from both keys and returned."""
+        fake_redis = FakeHeartbeatRedis()
+        for name in ("alive", "dead"):
+            agent = ConcreteTestAgent(name, {}, mock_message_bus, fake_redis)
+            agent._publish_heartbeat()
+        fake_redis.zsets["agent:heartbeats:ts"]["dead"] -= 120
+        
+        assert prune_stale_agents(fake_redis, max_age_seconds=60) == ["dead"]
+        assert set(fake_redis.hashes["agent:heartbeats"]) == {"alive"}
+        assert set(fake_redis.zsets["agent:heartbeats:ts"]) == {"alive"}
+        
+        # Nothing left to prune
+        assert prune_stale_agents(fake_redis, max_age_seconds=60) == []
+
+
 class TestBaseAgentAbstractMethods:
     """Test that abstract methods must be implemented."""
     
@@ -0,0 +1,39 @@
+"""
+Tests for agent configuration helpers.
+"""
+
+from agents.config import get_agent_config
+
+
+def test_get_agent_config_merges_defaults():
+    config = {"technical_analyst": {"interval_seconds": 60, "symbols": ["SPY"]}}
+    
+    result = get_agent_config(config, "technical_analyst", defaults={"interval_seconds": 300, "enabled": True})
+    
+    assert result == {"interval_seconds": 60, "symbols": ["SPY"], "enabled": True}
+
+
+def test_get_agent_config_missing_agent_returns_defaults():
+    assert get_agent_config({}, "risk_manager", defaults={"enabled": True}) == {"enabled": True}
+    assert get_agent_config({}, "risk_manager") == {}
+
+
+def test_get_agent_config_returns_fresh_mutable_dict():
+    config = {"technical_analyst": {"interval_seconds": 60}}
+    
+    result = get_agent_config(config, "technical_analyst")
+    result["interval_seconds"] = 5
+    result.setdefault("extra", 1)
+    
+    assert type(result) is dict
+    assert config == {"technical_analyst": {"interval_seconds": 60}}
+
+
+def test_get_agent_config_sees_in_place_config_changes():
+    config = {"technical_analyst": {"interval_seconds": 60}}
+    defaults = {"enabled": True}
+    get_agent_config(config, "technical_analyst", defaults)
+    
+    config["technical_analyst"]["interval_seconds"] = 120
+    
+    assert get_agent_config(config, "technical_analyst", defaults)["interval_seconds"] == 120